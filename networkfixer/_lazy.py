@@ -0,0 +1,35 @@
+"""PEP 562 helpers for lazily loaded package attributes."""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str,
+    namespace: Dict[str, Any],
+    exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build ``__getattr__``/``__dir__`` for a package.
+
+    Args:
+        package: The package's ``__name__``
+        namespace: The package's ``globals()``; loaded attributes are cached here
+        exports: Attribute name -> relative submodule (e.g. ``".executor"``)
+
+    Returns:
+        (__getattr__, __dir__) to assign at package level
+    """
+    def __getattr__(name: str) -> Any:
+        try:
+            submodule = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(submodule, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,274 @@
+"""
+Headless command line interface for NetworkFixer.
+
+Drives NetworkOperations directly and prints JSON, without importing any
+UI module (or tkinter), so it starts fast in remote shells and scheduled
+tasks. Running ``networkfixer`` without a command opens the GUI.
+
+Examples:
+    networkfixer test --fast
+    networkfixer fix --dns --winsock
+    networkfixer scan-proxy --fix
+    networkfixer diagnose --fix
+    networkfixer dns --rounds 5
+    networkfixer adapters
+    networkfixer watchdog
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from . import __version__
+from .models.result import StepResult, ConnectivityResult
+
+logger = logging.getLogger(__name__)
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+
+
+def _step_to_dict(name: str, result: StepResult) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "ok": result.ok,
+        "output": result.output,
+        "return_code": result.return_code,
+        "duration_ms": round(result.duration_ms, 1),
+        "error": str(result.error) if result.error else None,
+    }
+
+
+def _connectivity_to_dict(result: ConnectivityResult) -> Dict[str, Any]:
+    # Target names stay top-level keys, as with the former fixed fields
+    data: Dict[str, Any] = dict(result.results)
+    data["latency_ms"] = result.latency_ms
+    data["pending"] = result.pending
+    data["all_ok"] = result.all_ok
+    return data
+
+
+def _emit(data: Dict[str, Any], args: argparse.Namespace) -> None:
+    json.dump(data, sys.stdout, ensure_ascii=False, indent=None if args.compact else 2)
+    sys.stdout.write("\n")
+
+
+def _operations(args: argparse.Namespace):
+    from .core.operations import NetworkOperations
+    from .models.config import get_config
+
+    config = get_config()
+    if getattr(args, "mode", None):
+        config.connectivity_mode = args.mode
+    return NetworkOperations(config)
+
+
+def cmd_test(args: argparse.Namespace) -> int:
+    ops = _operations(args)
+    result = ops.test_connectivity(fast=args.fast)
+    _emit({"connectivity": _connectivity_to_dict(result)}, args)
+    return EXIT_OK if result.all_ok else EXIT_FAILED
+
+
+def cmd_fix(args: argparse.Namespace) -> int:
+    ops = _operations(args)
+
+    selected = [args.proxy, args.dns, args.winsock, args.ip, args.tcpip, bool(args.adapter)]
+    if args.all:
+        selected = [True, True, True, True, True, bool(args.adapter)]
+    elif not any(selected):
+        # Same defaults as the GUI checkboxes
+        selected = [True, True, True, True, False, False]
+
+    steps = ops.build_steps(*selected, adapter_name=args.adapter or "")
+    results = ops.execute_steps(steps)
+
+    data: Dict[str, Any] = {
+        "steps": [_step_to_dict(step.name, result) for step, result in zip(steps, results)],
+    }
+    ok = all(result.ok for result in results)
+
+    if not args.no_test:
+        connectivity = ops.test_connectivity(fast=args.fast)
+        data["connectivity"] = _connectivity_to_dict(connectivity)
+        ok = ok and connectivity.all_ok
+
+    _emit(data, args)
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_scan_proxy(args: argparse.Namespace) -> int:
+    ops = _operations(args)
+    healthy, dead = ops.scan_proxy_env()
+    data: Dict[str, Any] = {
+        "healthy": [asdict(p) for p in healthy],
+        "dead": [asdict(p) for p in dead],
+    }
+
+    ok = True
+    if args.fix and dead:
+        fixed = ops.fix_proxy_env()
+        data["fixed"] = {scope: _step_to_dict(scope, r) for scope, r in fixed.items()}
+        ok = all(r.ok for r in fixed.values())
+
+    _emit(data, args)
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_diagnose(args: argparse.Namespace) -> int:
+    from .core.diagnosis import DiagnosisEngine
+
+    ops = _operations(args)
+    diagnosis = DiagnosisEngine(ops).diagnose()
+    data: Dict[str, Any] = {
+        "checks": diagnosis.checks,
+        "findings": [asdict(f) for f in diagnosis.findings],
+        "steps": [step.name for step in diagnosis.steps],
+    }
+
+    ok = diagnosis.healthy
+    if args.fix and diagnosis.steps:
+        results = ops.execute_steps(diagnosis.steps)
+        data["fixed"] = [_step_to_dict(step.name, r) for step, r in zip(diagnosis.steps, results)]
+        ok = all(r.ok for r in results)
+
+    _emit(data, args)
+    return EXIT_OK if ok else EXIT_FAILED
+
+
+def cmd_dns(args: argparse.Namespace) -> int:
+    ops = _operations(args)
+    stats, recommended = ops.connectivity_tester.benchmark_dns(rounds=args.rounds)
+    data: Dict[str, Any] = {
+        "resolvers": [dict(asdict(s), failure_rate=s.failure_rate) for s in stats.values()],
+        "recommended": recommended,
+    }
+    _emit(data, args)
+    return EXIT_OK if recommended else EXIT_FAILED
+
+
+def cmd_adapters(args: argparse.Namespace) -> int:
+    ops = _operations(args)
+    adapters = ops.refresh_adapter_info(force=True)
+    _emit({"adapters": [asdict(a) for a in adapters]}, args)
+    return EXIT_OK
+
+
+def cmd_watchdog(args: argparse.Namespace) -> int:
+    from .core.watchdog import RepairWatchdog
+
+    ops = _operations(args)
+    watchdog = RepairWatchdog.from_config(ops)
+
+    def emit_attempt(attempt) -> None:
+        # One JSON document per line so the stream can be tailed
+        json.dump({
+            "plan": attempt.plan,
+            "recovered": attempt.recovered,
+            "duration_ms": round(attempt.duration_ms, 1),
+            "steps": [_step_to_dict(name, r) for name, r in zip(attempt.steps, attempt.results)],
+        }, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    watchdog.subscribe(emit_attempt)
+
+    if args.once:
+        # No second check is coming, so repair on the first failure
+        watchdog.failures_before_repair = 1
+        attempt = watchdog.check_once()
+        return EXIT_OK if attempt is None or attempt.recovered else EXIT_FAILED
+
+    watchdog.start()
+    try:
+        while watchdog.is_running:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watchdog.stop()
+    return EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="networkfixer",
+        description="Network repair tool for VPN/Proxy issues (run without a command for the GUI)"
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    sub = parser.add_subparsers(dest="command")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-v", "--verbose", action="store_true", help="log to stderr")
+    common.add_argument("--compact", action="store_true", help="single-line JSON output")
+
+    def add_connectivity_options(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--fast", action="store_true", help="return as soon as the verdict is known")
+        p.add_argument("--mode", choices=["subprocess", "socket"], help="probe implementation")
+
+    p_test = sub.add_parser("test", parents=[common], help="test connectivity")
+    add_connectivity_options(p_test)
+    p_test.set_defaults(func=cmd_test)
+
+    p_fix = sub.add_parser("fix", parents=[common], help="run repair steps (defaults match the GUI)")
+    p_fix.add_argument("--proxy", action="store_true", help="disable system proxy")
+    p_fix.add_argument("--dns", action="store_true", help="flush DNS cache")
+    p_fix.add_argument("--winsock", action="store_true", help="reset Winsock")
+    p_fix.add_argument("--ip", action="store_true", help="release and renew IP address")
+    p_fix.add_argument("--tcpip", action="store_true", help="reset TCP/IP stack")
+    p_fix.add_argument("--adapter", metavar="NAME", help="restart this adapter")
+    p_fix.add_argument("--all", action="store_true", help="run every repair step")
+    p_fix.add_argument("--no-test", action="store_true", help="skip the connectivity test afterwards")
+    add_connectivity_options(p_fix)
+    p_fix.set_defaults(func=cmd_fix)
+
+    p_scan = sub.add_parser("scan-proxy", parents=[common], help="find dead proxy environment variables")
+    p_scan.add_argument("--fix", action="store_true", help="remove the dead ones")
+    p_scan.set_defaults(func=cmd_scan_proxy)
+
+    p_diagnose = sub.add_parser("diagnose", parents=[common], help="find the cause and the minimal repair steps")
+    p_diagnose.add_argument("--fix", action="store_true", help="run the suggested steps")
+    p_diagnose.set_defaults(func=cmd_diagnose)
+
+    p_dns = sub.add_parser("dns", parents=[common], help="benchmark DNS resolvers and recommend the fastest")
+    p_dns.add_argument("--rounds", type=int, default=3, help="queries per test name and resolver")
+    p_dns.set_defaults(func=cmd_dns)
+
+    p_adapters = sub.add_parser("adapters", parents=[common], help="list network adapters")
+    p_adapters.set_defaults(func=cmd_adapters)
+
+    p_watchdog = sub.add_parser("watchdog", parents=[common], help="repair automatically whenever connectivity degrades")
+    p_watchdog.add_argument("--once", action="store_true", help="check once, repair if needed, then exit")
+    p_watchdog.add_argument("--mode", choices=["subprocess", "socket"], help="probe implementation")
+    p_watchdog.set_defaults(func=cmd_watchdog)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        from .ui.app import main as gui_main
+        gui_main()
+        return EXIT_OK
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        stream=sys.stderr
+    )
+
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
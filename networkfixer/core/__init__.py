@@ -1,22 +1,65 @@
-"""Core functionality for NetworkFixer"""
+"""Core functionality for NetworkFixer
 
-from .executor import CommandExecutor, get_executor
-from .registry import ProxyRegistry
-from .adapters import AdapterManager
-from .connectivity import ConnectivityTester
-from .operations import NetworkOperations, Step
-from .proxy_env import ProxyGhostKiller, ProxyEnvScanner, ProxyHealthChecker, ProxyEnvInfo
+Attributes are loaded on first access (PEP 562), so importing one component
+does not pull in winreg, asyncio, urllib or the other components.
+"""
 
-__all__ = [
-    "CommandExecutor",
-    "get_executor",
-    "ProxyRegistry",
-    "AdapterManager",
-    "ConnectivityTester",
-    "NetworkOperations",
-    "Step",
-    "ProxyGhostKiller",
-    "ProxyEnvScanner",
-    "ProxyHealthChecker",
-    "ProxyEnvInfo",
-]
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "CommandExecutor": ".executor",
+    "get_executor": ".executor",
+    "get_worker_pool": ".pool",
+    "get_task_pool": ".pool",
+    "submit_task": ".pool",
+    "shutdown_worker_pool": ".pool",
+    "ProxyRegistry": ".registry",
+    "RegistryBackend": ".registry",
+    "InMemoryRegistry": ".registry",
+    "get_registry": ".registry",
+    "AdapterManager": ".adapters",
+    "ConnectivityTester": ".connectivity",
+    "DnsProber": ".dns_probe",
+    "ConnectivityMonitor": ".monitor",
+    "LatencyStats": ".monitor",
+    "DiagnosisEngine": ".diagnosis",
+    "Diagnosis": ".diagnosis",
+    "RepairWatchdog": ".watchdog",
+    "RepairAttempt": ".watchdog",
+    "NetworkOperations": ".operations",
+    "Step": ".operations",
+    "ProxyWatcher": ".watcher",
+    "ProxyState": ".watcher",
+    "ProxyStateChange": ".watcher",
+    "ProxyGhostKiller": ".proxy_env",
+    "ProxyEnvScanner": ".proxy_env",
+    "ProxyHealthChecker": ".proxy_env",
+    "ProxyHealthCache": ".proxy_env",
+    "ProxyEnvInfo": ".proxy_env",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
+
+if TYPE_CHECKING:
+    from .executor import CommandExecutor, get_executor
+    from .pool import get_worker_pool, get_task_pool, submit_task, shutdown_worker_pool
+    from .registry import ProxyRegistry, RegistryBackend, InMemoryRegistry, get_registry
+    from .adapters import AdapterManager
+    from .connectivity import ConnectivityTester
+    from .dns_probe import DnsProber
+    from .monitor import ConnectivityMonitor, LatencyStats
+    from .diagnosis import DiagnosisEngine, Diagnosis
+    from .watchdog import RepairWatchdog, RepairAttempt
+    from .operations import NetworkOperations, Step
+    from .watcher import ProxyWatcher, ProxyState, ProxyStateChange
+    from .proxy_env import (
+        ProxyGhostKiller,
+        ProxyEnvScanner,
+        ProxyHealthChecker,
+        ProxyHealthCache,
+        ProxyEnvInfo,
+    )
+
+__all__ = list(_EXPORTS)
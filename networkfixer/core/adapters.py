@@ -1,55 +1,220 @@
+import os
+import sys
 import time
+import threading
 import logging
-from typing import List, Optional
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
 
 from .executor import get_executor
+from .pool import get_worker_pool, in_worker_pool
+from ..models.result import AdapterInfo
 
 logger = logging.getLogger(__name__)
 
 DANGEROUS_CHARS = set('"\'&|;()`$\n\r')
 
 
-class AdapterManager:
-    def __init__(self, cache_ttl: int = 5):
-        self.cache_ttl = cache_ttl
-        self._cache: Optional[List[str]] = None
-        self._cache_time: float = 0
-        self.executor = get_executor()
+class AdapterBackend(ABC):
+    """Source of adapter records. Raises OSError when unavailable on this host."""
 
-    def list_names(self) -> List[str]:
-        result = self.executor.run(["netsh", "interface", "show", "interface"])
+    name = "base"
 
-        if not result.ok:
-            logger.error(f"Failed to list adapters: {result.output}")
-            return []
+    @abstractmethod
+    def list_adapters(self) -> List[AdapterInfo]:
+        """Return the current adapter records."""
 
-        return self._parse_output(result.output)
 
-    def refresh(self, force: bool = False) -> List[str]:
-        current_time = time.time()
+class IpHelperAdapterBackend(AdapterBackend):
+    """Windows IP Helper API (GetAdaptersAddresses) via ctypes; no text parsing."""
 
-        if not force and self._cache:
-            if current_time - self._cache_time < self.cache_ttl:
-                return self._cache
+    name = "iphlpapi"
 
-        self._cache = self.list_names()
-        self._cache_time = current_time
+    AF_UNSPEC = 0
+    # Skip unicast/anycast/multicast/DNS lists; we only need interface data
+    GAA_FLAGS = 0x0001 | 0x0002 | 0x0004 | 0x0008
+    ERROR_BUFFER_OVERFLOW = 111
+    IF_TYPE_SOFTWARE_LOOPBACK = 24
+    IF_OPER_STATUS_UP = 1
 
-        return self._cache
+    IF_TYPES = {
+        6: "ethernet",
+        71: "wireless",
+        23: "ppp",
+        131: "tunnel",
+        24: "loopback",
+    }
 
-    def validate_name(self, name: str) -> bool:
-        if not name:
-            return False
+    def __init__(self):
+        if sys.platform != "win32":
+            raise OSError("IP Helper API is only available on Windows")
+        self._struct = self._define_struct()
 
-        if any(c in DANGEROUS_CHARS for c in name):
-            logger.warning(f"Invalid adapter name: {name}")
-            return False
+    def list_adapters(self) -> List[AdapterInfo]:
+        import ctypes
 
-        return True
+        iphlpapi = ctypes.windll.iphlpapi
+        size = ctypes.c_ulong(15 * 1024)
+        for _ in range(3):
+            buffer = ctypes.create_string_buffer(size.value)
+            ret = iphlpapi.GetAdaptersAddresses(
+                self.AF_UNSPEC, self.GAA_FLAGS, None, buffer, ctypes.byref(size)
+            )
+            if ret != self.ERROR_BUFFER_OVERFLOW:
+                break
+        if ret != 0:
+            raise OSError(f"GetAdaptersAddresses failed with code {ret}")
+
+        adapters = []
+        entry = ctypes.cast(buffer, ctypes.POINTER(self._struct))
+        while entry:
+            item = entry.contents
+            if item.IfType != self.IF_TYPE_SOFTWARE_LOOPBACK:
+                mac = bytes(item.PhysicalAddress[:item.PhysicalAddressLength])
+                adapters.append(AdapterInfo(
+                    name=item.FriendlyName,
+                    is_connected=item.OperStatus == self.IF_OPER_STATUS_UP,
+                    index=item.IfIndex or item.Ipv6IfIndex,
+                    type=self.IF_TYPES.get(item.IfType, str(item.IfType)),
+                    state="up" if item.OperStatus == self.IF_OPER_STATUS_UP else "down",
+                    mac=":".join(f"{b:02x}" for b in mac),
+                    mtu=item.Mtu,
+                    speed_bps=item.TransmitLinkSpeed or None,
+                    description=item.Description or "",
+                ))
+            entry = item.Next
+        return adapters
+
+    @staticmethod
+    def _define_struct():
+        import ctypes
+        from ctypes import wintypes
+
+        class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+            pass
+
+        # Only the leading fields we read are declared; entries are never
+        # allocated by us, only viewed inside the buffer the API fills.
+        IP_ADAPTER_ADDRESSES._fields_ = [
+            ("Length", wintypes.ULONG),
+            ("IfIndex", wintypes.DWORD),
+            ("Next", ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+            ("AdapterName", ctypes.c_char_p),
+            ("FirstUnicastAddress", ctypes.c_void_p),
+            ("FirstAnycastAddress", ctypes.c_void_p),
+            ("FirstMulticastAddress", ctypes.c_void_p),
+            ("FirstDnsServerAddress", ctypes.c_void_p),
+            ("DnsSuffix", ctypes.c_wchar_p),
+            ("Description", ctypes.c_wchar_p),
+            ("FriendlyName", ctypes.c_wchar_p),
+            ("PhysicalAddress", ctypes.c_ubyte * 8),
+            ("PhysicalAddressLength", wintypes.ULONG),
+            ("Flags", wintypes.ULONG),
+            ("Mtu", wintypes.DWORD),
+            ("IfType", wintypes.DWORD),
+            ("OperStatus", ctypes.c_int),
+            ("Ipv6IfIndex", wintypes.DWORD),
+            ("ZoneIndices", wintypes.DWORD * 16),
+            ("FirstPrefix", ctypes.c_void_p),
+            ("TransmitLinkSpeed", ctypes.c_uint64),
+            ("ReceiveLinkSpeed", ctypes.c_uint64),
+        ]
+        return IP_ADAPTER_ADDRESSES
+
+
+class SysfsAdapterBackend(AdapterBackend):
+    """Linux /sys/class/net; one small file read per attribute."""
+
+    name = "sysfs"
+
+    SYSFS_ROOT = "/sys/class/net"
+    ARPHRD_ETHER = 1
+    ARPHRD_LOOPBACK = 772
+
+    def __init__(self, root: str = SYSFS_ROOT):
+        if not os.path.isdir(root):
+            raise OSError(f"{root} not found")
+        self.root = root
+
+    def list_adapters(self) -> List[AdapterInfo]:
+        adapters = []
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if_type = self._read_int(path, "type")
+            if if_type == self.ARPHRD_LOOPBACK:
+                continue
+
+            state = self._read(path, "operstate") or "unknown"
+            speed = self._read_int(path, "speed")
+            adapters.append(AdapterInfo(
+                name=name,
+                is_connected=state == "up",
+                index=self._read_int(path, "ifindex"),
+                type=self._describe_type(path, if_type),
+                state=state,
+                mac=self._read(path, "address") or "",
+                mtu=self._read_int(path, "mtu"),
+                speed_bps=speed * 1_000_000 if speed and speed > 0 else None,
+            ))
+        return adapters
+
+    def _describe_type(self, path: str, if_type: Optional[int]) -> str:
+        if os.path.isdir(os.path.join(path, "wireless")):
+            return "wireless"
+        if if_type == self.ARPHRD_ETHER:
+            return "ethernet"
+        return str(if_type) if if_type is not None else ""
 
     @staticmethod
-    def _parse_output(output: str) -> List[str]:
-        names = []
+    def _read(path: str, attr: str) -> Optional[str]:
+        try:
+            with open(os.path.join(path, attr)) as f:
+                return f.read().strip()
+        except OSError:
+            # e.g. "speed" raises EINVAL while the link is down
+            return None
+
+    @classmethod
+    def _read_int(cls, path: str, attr: str) -> Optional[int]:
+        value = cls._read(path, attr)
+        try:
+            return int(value) if value is not None else None
+        except ValueError:
+            return None
+
+
+class NetshAdapterBackend(AdapterBackend):
+    """Fallback: parses localized `netsh interface show interface` text."""
+
+    name = "netsh"
+
+    CONNECTED_STATES = ("connected", "已连接")
+    ENABLED_STATES = ("enabled", "已启用")
+
+    LIST_COMMAND = ["netsh", "interface", "show", "interface"]
+    # Only used to fill in MTUs; a failure leaves them unset
+    MTU_COMMAND = ["netsh", "interface", "ipv4", "show", "subinterfaces"]
+
+    def __init__(self):
+        self.executor = get_executor()
+
+    def list_adapters(self) -> List[AdapterInfo]:
+        result, mtu_result = self.executor.run_many([self.LIST_COMMAND, self.MTU_COMMAND])
+
+        if not result.ok:
+            raise OSError(f"Failed to list adapters: {result.output}")
+
+        adapters = self._parse_output(result.output)
+        if mtu_result.ok:
+            mtus = self._parse_mtus(mtu_result.output)
+            for adapter in adapters:
+                adapter.mtu = mtus.get(adapter.name)
+        return adapters
+
+    @classmethod
+    def _parse_output(cls, output: str) -> List[AdapterInfo]:
+        adapters = []
 
         for line in output.splitlines():
             stripped = line.strip()
@@ -63,8 +228,194 @@ class AdapterManager:
 
             parts = stripped.split()
             if len(parts) >= 4:
-                name = ' '.join(parts[3:])
-                names.append(name)
+                admin_state, state, if_type = parts[0], parts[1], parts[2]
+                adapters.append(AdapterInfo(
+                    name=' '.join(parts[3:]),
+                    is_connected=state.lower() in cls.CONNECTED_STATES,
+                    type=if_type.lower(),
+                    state=state,
+                    admin_enabled=admin_state.lower() in cls.ENABLED_STATES,
+                ))
+
+        logger.debug(f"Parsed adapters: {[a.name for a in adapters]}")
+        return adapters
 
-        logger.debug(f"Parsed adapters: {names}")
-        return names
+    @staticmethod
+    def _parse_mtus(output: str) -> Dict[str, int]:
+        """Interface name -> MTU from `netsh interface ipv4 show subinterfaces`."""
+        mtus = {}
+        for line in output.splitlines():
+            # MTU, MediaSenseState, Bytes In, Bytes Out, Interface
+            parts = line.split()
+            if len(parts) >= 5 and parts[0].isdigit():
+                mtus[' '.join(parts[4:])] = int(parts[0])
+        return mtus
+
+
+def default_backends() -> List[AdapterBackend]:
+    """Structured backends for this platform first, netsh parsing last."""
+    backends: List[AdapterBackend] = []
+    for backend_cls in (IpHelperAdapterBackend, SysfsAdapterBackend):
+        try:
+            backends.append(backend_cls())
+        except OSError as e:
+            logger.debug(f"Adapter backend {backend_cls.name} unavailable: {e}")
+    backends.append(NetshAdapterBackend())
+    return backends
+
+
+class AdapterManager:
+    """Adapter list with a stale-while-revalidate cache.
+
+    Cached records are served immediately; when they are older than
+    cache_ttl a single background refresh runs on the shared worker pool,
+    and concurrent refresh requests join it instead of starting another.
+    Subscribers are called (on the worker thread) when the list changes.
+    """
+
+    def __init__(self, cache_ttl: int = 5, backends: Optional[List[AdapterBackend]] = None):
+        self.cache_ttl = cache_ttl
+        self._cache: Optional[List[AdapterInfo]] = None
+        self._cache_time: float = 0
+        self._lock = threading.Lock()
+        self._inflight: Optional[Future] = None
+        self._subscribers: List[Callable[[List[AdapterInfo]], None]] = []
+        self.backends = backends if backends is not None else default_backends()
+
+    def list_adapters(self) -> List[AdapterInfo]:
+        for backend in self.backends:
+            try:
+                adapters = backend.list_adapters()
+                logger.debug(f"Listed {len(adapters)} adapters via {backend.name}")
+                return adapters
+            except Exception as e:
+                logger.warning(f"Adapter backend {backend.name} failed: {e}")
+
+        logger.error("Failed to list adapters: no backend succeeded")
+        return []
+
+    def list_names(self) -> List[str]:
+        return [adapter.name for adapter in self.list_adapters()]
+
+    def subscribe(self, callback: Callable[[List[AdapterInfo]], None]) -> Callable[[], None]:
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def get_cached(self) -> List[AdapterInfo]:
+        """Return the last-known list without blocking, revalidating it if stale."""
+        with self._lock:
+            cache = self._cache
+            stale = cache is None or time.time() - self._cache_time >= self.cache_ttl
+
+        if stale:
+            self.revalidate()
+        return list(cache or [])
+
+    def revalidate(self, force: bool = False) -> Future:
+        """
+        Refresh in the background (single-flight).
+
+        Returns:
+            Future resolving to the refreshed list; an already fresh cache
+            resolves immediately unless force is set
+        """
+        with self._lock:
+            if self._inflight is not None:
+                return self._inflight
+
+            if not force and self._cache is not None and time.time() - self._cache_time < self.cache_ttl:
+                done: Future = Future()
+                done.set_result(list(self._cache))
+                return done
+
+            future: Future = Future()
+            self._inflight = future
+
+        job = get_worker_pool().submit(self._refresh_into, future)
+        job.add_done_callback(lambda job: self._forget_cancelled(job, future))
+        return future
+
+    def refresh_info(self, force: bool = False) -> List[AdapterInfo]:
+        """Blocking refresh; joins an in-flight refresh instead of starting another."""
+        if in_worker_pool():
+            # Waiting on a refresh still queued behind this very thread would
+            # deadlock a busy pool, so refresh inline unless one is already running
+            with self._lock:
+                running = self._inflight is not None and self._inflight.running()
+                fresh = self._cache is not None and time.time() - self._cache_time < self.cache_ttl
+                if not running and fresh and not force:
+                    return list(self._cache)
+            if not running:
+                return self._do_refresh()
+        return self.revalidate(force).result()
+
+    def refresh(self, force: bool = False) -> List[str]:
+        return [adapter.name for adapter in self.refresh_info(force)]
+
+    def _forget_cancelled(self, job: Future, future: Future) -> None:
+        # A pool shutdown cancels queued jobs; don't leave callers waiting on them
+        if job.cancelled():
+            future.cancel()
+            with self._lock:
+                if self._inflight is future:
+                    self._inflight = None
+
+    def _refresh_into(self, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            with self._lock:
+                if self._inflight is future:
+                    self._inflight = None
+            return
+        try:
+            future.set_result(self._do_refresh(future))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _do_refresh(self, owner: Optional[Future] = None) -> List[AdapterInfo]:
+        """
+        List adapters, update the cache and notify subscribers.
+
+        Args:
+            owner: The in-flight future this refresh resolves; None for an
+                inline refresh, which must leave a queued refresh registered
+        """
+        try:
+            adapters = self.list_adapters()
+        except Exception:
+            with self._lock:
+                if owner is not None and self._inflight is owner:
+                    self._inflight = None
+            raise
+
+        with self._lock:
+            changed = adapters != self._cache
+            self._cache = adapters
+            self._cache_time = time.time()
+            if owner is not None and self._inflight is owner:
+                self._inflight = None
+            subscribers = list(self._subscribers) if changed else []
+
+        for callback in subscribers:
+            try:
+                callback(list(adapters))
+            except Exception as e:
+                logger.error(f"Adapter subscriber failed: {e}")
+
+        return list(adapters)
+
+    def validate_name(self, name: str) -> bool:
+        if not name:
+            return False
+
+        if any(c in DANGEROUS_CHARS for c in name):
+            logger.warning(f"Invalid adapter name: {name}")
+            return False
+
+        return True
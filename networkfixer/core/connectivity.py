@@ -1,89 +1,267 @@
-import urllib.request
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, as_completed
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
-from ..models.result import ConnectivityResult
+from .dns_probe import DnsProber, DnsProbeResult, ResolverStats
+from .http_probe import HttpProbe, HttpTiming
+from .pool import get_fanout_executor
+from .probe import ProbeEngine
+from ..models.result import (
+    ConnectivityResult,
+    ProbeTarget,
+    DEFAULT_DNS_RESOLVERS,
+    DEFAULT_DNS_TEST_NAMES,
+    DEFAULT_PROBE_TARGETS,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class ConnectivityTester:
-    PING_TARGETS = [
-        ("ping_114", "114.114.114.114"),
-        ("ping_google", "8.8.8.8"),
-    ]
-    HTTP_TARGET = "http://www.msftconnecttest.com/redirect"
+    MODE_SUBPROCESS = "subprocess"  # ping.exe per target
+    MODE_SOCKET = "socket"  # in-process ICMP/TCP probes (see probe.py)
 
     def __init__(
         self,
         ping_timeout_ms: int = 2000,
-        http_timeout_sec: int = 3
+        http_timeout_sec: int = 3,
+        probe_tcp_ports: Sequence[int] = ProbeEngine.DEFAULT_TCP_PORTS,
+        dns_resolvers: Sequence[str] = DEFAULT_DNS_RESOLVERS,
+        dns_test_names: Sequence[str] = DEFAULT_DNS_TEST_NAMES,
+        dns_timeout_ms: int = 1500,
+        targets: Sequence[ProbeTarget] = DEFAULT_PROBE_TARGETS,
+        quorum: float = 0.5
     ):
         self.ping_timeout_ms = ping_timeout_ms
         self.http_timeout_sec = http_timeout_sec
+        self.probe_engine = ProbeEngine(
+            timeout_sec=ping_timeout_ms / 1000,
+            tcp_ports=probe_tcp_ports
+        )
+        self.dns_test_names = tuple(dns_test_names)
+        self.dns_prober = DnsProber(dns_resolvers, timeout_sec=dns_timeout_ms / 1000)
+        self.http_probe = HttpProbe(timeout_sec=http_timeout_sec)
+        self.targets = tuple(targets)
+        self.quorum = quorum
 
-    def test(self, parallel: bool = True) -> ConnectivityResult:
+        unknown = [t.name for t in self.targets if t.kind not in (ProbeTarget.KIND_PING, ProbeTarget.KIND_HTTP)]
+        if unknown:
+            raise ValueError(f"Unknown probe target kind for: {', '.join(unknown)}")
+
+    @property
+    def ping_targets(self) -> List[ProbeTarget]:
+        return [t for t in self.targets if t.kind == ProbeTarget.KIND_PING]
+
+    @property
+    def http_targets(self) -> List[ProbeTarget]:
+        return [t for t in self.targets if t.kind == ProbeTarget.KIND_HTTP]
+
+    def test(
+        self,
+        parallel: bool = True,
+        mode: str = MODE_SUBPROCESS,
+        fast: bool = False,
+        on_result: Optional[Callable[[str, bool], None]] = None
+    ) -> ConnectivityResult:
+        """
+        Run the connectivity probes.
+
+        Args:
+            parallel: Run probes concurrently (socket mode always does)
+            mode: MODE_SUBPROCESS or MODE_SOCKET
+            fast: Return as soon as all_ok is decided; probes still pending are
+                abandoned and listed in ConnectivityResult.pending. Queued ones
+                are cancelled, running ones finish within their own timeout
+            on_result: Called with (target name, ok) as each probe finishes
+        """
+        if mode == self.MODE_SOCKET:
+            return self._test_socket(fast, on_result)
         if parallel:
-            return self._test_parallel()
+            return self._test_parallel(fast, on_result)
         else:
-            return self._test_sequential()
+            return self._test_sequential(fast, on_result)
 
-    def _test_sequential(self) -> ConnectivityResult:
-        result = ConnectivityResult()
-        result.ping_114 = self._ping(self.PING_TARGETS[0][1])
-        result.ping_google = self._ping(self.PING_TARGETS[1][1])
-        result.http_test = self._http_test()
-        return result
+    def test_dns(self, name: Optional[str] = None) -> Dict[str, DnsProbeResult]:
+        """Query one name on every configured resolver in parallel."""
+        return self.dns_prober.query(name or self.dns_test_names[0])
+
+    def benchmark_dns(self, rounds: int = 3) -> Tuple[Dict[str, ResolverStats], Optional[str]]:
+        """
+        Measure latency and failure rate of each resolver.
 
-    def _test_parallel(self) -> ConnectivityResult:
-        result = ConnectivityResult()
+        Returns:
+            Tuple of (stats per resolver, recommended resolver or None)
+        """
+        stats = self.dns_prober.benchmark(self.dns_test_names, rounds)
+        return stats, DnsProber.recommend(stats)
 
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            futures = {}
+    def _new_result(self) -> ConnectivityResult:
+        return ConnectivityResult(targets=self.targets, quorum=self.quorum)
 
-            for key, target in self.PING_TARGETS:
-                future = executor.submit(self._ping, target)
-                futures[future] = key
+    def _probe_func(self, target: ProbeTarget) -> Callable[[], Tuple[bool, Optional[float]]]:
+        """Callable returning (ok, latency_ms) for one target."""
+        if target.kind == ProbeTarget.KIND_HTTP:
+            def probe():
+                timing = self._http_test(target.address)
+                return timing.ok, timing.ttfb_ms if timing.ok else None
+            return probe
+        return lambda: (self._ping(target.address), None)
 
-            future = executor.submit(self._http_test)
-            futures[future] = "http"
+    def _socket_probe_func(self, target: ProbeTarget) -> Callable[[], Tuple[bool, Optional[float]]]:
+        """Like _probe_func, but ping targets use the in-process probe engine."""
+        if target.kind == ProbeTarget.KIND_HTTP:
+            return self._probe_func(target)
 
-            for future in as_completed(futures):
-                key = futures[future]
-                try:
-                    value = future.result()
-                    if key == "ping_114":
-                        result.ping_114 = value
-                    elif key == "ping_google":
-                        result.ping_google = value
-                    elif key == "http":
-                        result.http_test = value
-                except Exception as e:
-                    logger.error(f"Test {key} failed: {e}")
+        def probe():
+            result = self.probe_engine.probe([target.address])[target.address]
+            return result.ok, result.rtt_ms
+        return probe
+
+    def _test_sequential(
+        self,
+        fast: bool = False,
+        on_result: Optional[Callable[[str, bool], None]] = None
+    ) -> ConnectivityResult:
+        result = self._new_result()
 
+        # Required and heavier targets go first so fast mode can stop early
+        targets = sorted(self.targets, key=lambda t: (not t.required, -t.weight))
+        done = set()
+        for target in targets:
+            if fast and result.is_decided(done):
+                result.pending.append(target.name)
+                continue
+            self._record(result, target.name, *self._probe_func(target)(), on_result)
+            done.add(target.name)
         return result
 
-    def _ping(self, target: str) -> bool:
-        from .executor import get_executor
-        executor = get_executor()
-        
-        cmd = [
+    def _test_parallel(
+        self,
+        fast: bool = False,
+        on_result: Optional[Callable[[str, bool], None]] = None
+    ) -> ConnectivityResult:
+        result = self._new_result()
+        submit = get_fanout_executor().submit
+        futures = {submit(self._probe_func(t)): t.name for t in self.http_targets}
+        futures.update(self._submit_pings(self.ping_targets, submit))
+        self._collect(result, futures, fast, on_result)
+        return result
+
+    def _test_socket(
+        self,
+        fast: bool = False,
+        on_result: Optional[Callable[[str, bool], None]] = None
+    ) -> ConnectivityResult:
+        result = self._new_result()
+        # One probe per target, so fast mode need not wait for the slowest
+        submit = get_fanout_executor().submit
+        futures = {submit(self._socket_probe_func(t)): t.name for t in self.targets}
+        self._collect(result, futures, fast, on_result)
+        return result
+
+    def _collect(
+        self,
+        result: ConnectivityResult,
+        futures: Dict[Future, str],
+        fast: bool,
+        on_result: Optional[Callable[[str, bool], None]]
+    ) -> None:
+        pending = set(futures.values())
+        done = {t.name for t in self.targets if t.name not in pending}
+        if fast and futures and result.is_decided(done):
+            self._abandon(result, futures)
+            return
+
+        for future in as_completed(futures):
+            key = futures.pop(future)
+            try:
+                value, latency = future.result()
+            except Exception as e:
+                logger.error(f"Test {key} failed: {e}")
+                value, latency = False, None
+
+            self._record(result, key, value, latency, on_result)
+            done.add(key)
+
+            if fast and futures and result.is_decided(done):
+                self._abandon(result, futures)
+                return
+
+    @staticmethod
+    def _record(
+        result: ConnectivityResult,
+        key: str,
+        value: bool,
+        latency_ms: Optional[float],
+        on_result: Optional[Callable[[str, bool], None]]
+    ) -> None:
+        result.results[key] = value
+        if latency_ms is not None:
+            result.latency_ms[key] = latency_ms
+        if on_result:
+            try:
+                on_result(key, value)
+            except Exception as e:
+                logger.error(f"Connectivity result callback failed: {e}")
+
+    @staticmethod
+    def _abandon(result: ConnectivityResult, futures: Dict[Future, str]) -> None:
+        for future, key in futures.items():
+            # Frees the worker of probes still queued; running ones can't be stopped
+            future.cancel()
+            result.pending.append(key)
+        logger.debug(f"Fast verdict reached, abandoned probes: {result.pending}")
+
+    def _submit_pings(
+        self,
+        targets: Sequence[ProbeTarget],
+        submit: Callable[..., Future]
+    ) -> Dict[Future, str]:
+        """Ping targets in one submitted job; each target's future resolves as its ping finishes."""
+        if not targets:
+            return {}
+        futures = [Future() for _ in targets]
+
+        def settle(index: int, ok: bool) -> None:
+            if futures[index].set_running_or_notify_cancel():
+                futures[index].set_result((ok, None))
+
+        def run() -> None:
+            try:
+                self._ping_many(targets, settle)
+            except Exception as e:
+                for future in futures:
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(e)
+
+        submit(run)
+        return {future: target.name for future, target in zip(futures, targets)}
+
+    def _ping_command(self, target: str) -> List[str]:
+        return [
             "ping",
             "-n", "1",
             "-w", str(self.ping_timeout_ms),
             target
         ]
 
-        result = executor.run(cmd, check=False)
+    def _ping(self, target: str) -> bool:
+        from .executor import get_executor
+        result = get_executor().run(self._ping_command(target), check=False)
         return result.return_code == 0
 
-    def _http_test(self) -> bool:
-        try:
-            with urllib.request.urlopen(
-                self.HTTP_TARGET,
-                timeout=self.http_timeout_sec
-            ) as response:
-                return 200 <= response.getcode() < 400
-        except Exception as e:
-            logger.debug(f"HTTP test failed: {e}")
-            return False
+    def _ping_many(
+        self,
+        targets: Sequence[ProbeTarget],
+        on_result: Callable[[int, bool], None]
+    ) -> None:
+        """Ping targets as concurrent asyncio subprocesses; on_result gets (index, ok)."""
+        from .executor import get_executor
+        get_executor().run_many(
+            [self._ping_command(t.address) for t in targets],
+            check=False,
+            on_result=lambda index, result: on_result(index, result.return_code == 0)
+        )
+
+    def _http_test(self, url: str) -> HttpTiming:
+        return self.http_probe.check(url)
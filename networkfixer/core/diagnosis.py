@@ -0,0 +1,205 @@
+"""
+Fault diagnosis.
+
+Runs a quick battery of independent checks concurrently and maps what it
+finds to the smallest set of repair steps, so a DNS or proxy problem is not
+answered with a Winsock reset and a DHCP renewal.
+"""
+
+import socket
+import logging
+from concurrent.futures import wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from .operations import NetworkOperations, Step
+from .pool import get_fanout_executor
+from ..models.result import StepResult
+
+logger = logging.getLogger(__name__)
+
+DEAD_ENV_PROXY = "dead_env_proxy"  # proxy variable pointing at a closed port
+DEAD_SYSTEM_PROXY = "dead_system_proxy"  # enabled system proxy with a closed port
+NO_ROUTE = "no_route"  # raw IP addresses unreachable
+DNS_FAILURE = "dns_failure"  # IPs reachable, names do not resolve
+CAPTIVE_PORTAL = "captive_portal"  # HTTP answered by someone else; needs a browser login
+
+
+@dataclass
+class Finding:
+    code: str
+    detail: str = ""
+    step: Optional[str] = None  # name of the step that addresses it, if any
+
+
+@dataclass
+class Diagnosis:
+    """Findings in rank order and the minimal steps that address them."""
+    findings: List[Finding] = field(default_factory=list)
+    steps: List[Step] = field(default_factory=list)
+    checks: Dict[str, Optional[bool]] = field(default_factory=dict)  # check name -> passed, None if unknown
+
+    @property
+    def unknown(self) -> List[str]:
+        """Checks that did not finish in time."""
+        return [name for name, passed in self.checks.items() if passed is None]
+
+    @property
+    def healthy(self) -> bool:
+        return not self.findings and not self.unknown
+
+
+class DiagnosisEngine:
+    DNS_TEST_HOST = "www.msftconnecttest.com"
+    CAPTIVE_URL = "http://www.msftconnecttest.com/connecttest.txt"
+    CAPTIVE_EXPECTED = b"Microsoft Connect Test"
+
+    def __init__(self, operations: NetworkOperations):
+        self.operations = operations
+        self.timeout_sec = operations.config.http_timeout_sec
+
+    def diagnose(self) -> Diagnosis:
+        """Run all checks concurrently and return the ranked diagnosis."""
+        ops = self.operations
+        pool = get_fanout_executor()
+        futures = {
+            "env_proxy": pool.submit(ops.scan_proxy_env),
+            "system_proxy": pool.submit(self._check_system_proxy),
+            "raw_ip": pool.submit(self._check_raw_ip),
+            "dns": pool.submit(self._check_dns),
+            "captive_portal": pool.submit(self._check_captive_portal),
+        }
+        wait(futures.values(), timeout=self._wait_budget())
+
+        unknown = set()
+
+        def outcome(name, default):
+            future = futures[name]
+            if not future.done():
+                # Unknown, not healthy: a stuck check proves nothing either way
+                logger.debug(f"Diagnosis check {name} timed out")
+                unknown.add(name)
+                return default
+            try:
+                return future.result()
+            except Exception as e:
+                logger.error(f"Diagnosis check {name} failed: {e}")
+                return default
+
+        _, dead_env = outcome("env_proxy", ([], []))
+        dead_server = outcome("system_proxy", None)
+        raw_ip_ok = outcome("raw_ip", False)
+        dns_ok = outcome("dns", False)
+        portal = outcome("captive_portal", None)
+
+        checks = {
+            "env_proxy": not dead_env,
+            "system_proxy": dead_server is None,
+            "raw_ip": raw_ip_ok,
+            "dns": dns_ok,
+            "captive_portal": portal is None,
+        }
+        diagnosis = Diagnosis(checks={
+            name: None if name in unknown else passed for name, passed in checks.items()
+        })
+        findings = diagnosis.findings
+
+        # Rank: cheapest and most specific causes first. DNS is only judged
+        # once raw IPs are known to work, the portal once DNS works too.
+        if dead_env:
+            names = sorted({f"{p.scope}:{p.name}" for p in dead_env})
+            findings.append(Finding(DEAD_ENV_PROXY, ", ".join(names), "clear_proxy_env"))
+        if dead_server:
+            findings.append(Finding(DEAD_SYSTEM_PROXY, dead_server, "disable_proxy"))
+        if "raw_ip" not in unknown:
+            if not raw_ip_ok:
+                findings.append(Finding(NO_ROUTE, "no probe target answered", "reset_ip"))
+            elif "dns" not in unknown:
+                if not dns_ok:
+                    findings.append(Finding(DNS_FAILURE, self.DNS_TEST_HOST, "flush_dns"))
+                elif portal:
+                    findings.append(Finding(CAPTIVE_PORTAL, portal))
+
+        diagnosis.steps = self._build_steps(findings)
+        logger.info(
+            f"Diagnosis: {[f.code for f in findings] or 'healthy'}, "
+            f"steps {[s.name for s in diagnosis.steps]}"
+        )
+        return diagnosis
+
+    def _wait_budget(self) -> float:
+        """Time the slowest check may take; only a stuck resolver runs longer."""
+        ops = self.operations
+        checker = ops.proxy_ghost_killer.health_checker
+        return max(
+            2 * self.timeout_sec,  # urllib applies its timeout to the connect and to the read
+            ops.connectivity_tester.probe_engine.timeout_sec,
+            checker.timeout,
+        ) + 1.0
+
+    def _build_steps(self, findings: List[Finding]) -> List[Step]:
+        ops = self.operations
+        wanted = {f.step for f in findings if f.step}
+
+        steps = []
+        if "clear_proxy_env" in wanted:
+            steps.append(Step("step.clear_proxy_env", self._clear_proxy_env))
+        steps.extend(ops.build_steps(
+            do_proxy="disable_proxy" in wanted,
+            do_dns="flush_dns" in wanted,
+            do_winsock=False,
+            do_ip="reset_ip" in wanted,
+            do_tcpip=False,
+            do_adapter=False
+        ))
+        return steps
+
+    def _clear_proxy_env(self) -> StepResult:
+        results = self.operations.fix_proxy_env()
+        return StepResult(
+            ok=all(r.ok for r in results.values()),
+            title="clear_proxy_env",
+            output="\n".join(r.output for r in results.values() if r.output)
+        )
+
+    def _check_system_proxy(self) -> Optional[str]:
+        """Return the server if the system proxy is enabled but dead."""
+        enabled, server = self.operations.get_proxy_status()
+        if not enabled or not server:
+            return None
+        checker = self.operations.proxy_ghost_killer.health_checker
+        return None if checker.check_proxy(server) else server
+
+    def _check_raw_ip(self) -> bool:
+        tester = self.operations.connectivity_tester
+        targets = [target.address for target in tester.ping_targets]
+        return any(result.ok for result in tester.probe_engine.probe(targets).values())
+
+    def _check_dns(self) -> bool:
+        try:
+            socket.getaddrinfo(self.DNS_TEST_HOST, 80, type=socket.SOCK_STREAM)
+            return True
+        except OSError as e:
+            logger.debug(f"DNS check failed: {e}")
+            return False
+
+    def _check_captive_portal(self) -> Optional[str]:
+        """Return the URL we ended up at if the probe page was replaced."""
+        import urllib.request
+
+        # Bypass proxies: a dead proxy is diagnosed separately
+        opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        try:
+            with opener.open(self.CAPTIVE_URL, timeout=self.timeout_sec) as response:
+                body = response.read(256)
+                final_url = response.geturl()
+        except Exception as e:
+            logger.debug(f"Captive portal check failed: {e}")
+            return None
+
+        if body.startswith(self.CAPTIVE_EXPECTED):
+            return None
+        if urlparse(final_url).hostname != urlparse(self.CAPTIVE_URL).hostname:
+            return final_url
+        return self.CAPTIVE_URL
@@ -0,0 +1,219 @@
+"""
+DNS resolver probes.
+
+Sends hand-built DNS queries over UDP to several resolvers at once from a
+single ``selectors`` loop, measuring per-resolver latency and failures
+without going through the system resolver or its cache.
+"""
+
+import os
+import random
+import selectors
+import socket
+import struct
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DNS_PORT = 53
+QTYPE_A = 1
+QCLASS_IN = 1
+FLAG_QR = 0x8000  # response
+FLAG_RD = 0x0100  # recursion desired
+RCODE_NOERROR = 0
+
+
+@dataclass
+class DnsProbeResult:
+    """Outcome of one query to one resolver."""
+    resolver: str
+    ok: bool = False
+    rtt_ms: Optional[float] = None
+    rcode: Optional[int] = None
+    answers: int = 0
+    error: str = ""
+
+
+@dataclass
+class ResolverStats:
+    """Aggregated benchmark figures for one resolver."""
+    resolver: str
+    queries: int = 0
+    failures: int = 0
+    median_ms: Optional[float] = None
+    mean_ms: Optional[float] = None
+    min_ms: Optional[float] = None
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.queries if self.queries else 1.0
+
+
+def build_query(name: str, txid: int, qtype: int = QTYPE_A) -> bytes:
+    """Build a recursive query packet for a single question."""
+    header = struct.pack("!HHHHHH", txid, FLAG_RD, 1, 0, 0, 0)
+    qname = b""
+    for label in name.rstrip(".").split("."):
+        encoded = label.encode("idna")
+        if not 0 < len(encoded) < 64:
+            raise ValueError(f"Invalid DNS label in {name!r}")
+        qname += bytes([len(encoded)]) + encoded
+    return header + qname + b"\x00" + struct.pack("!HH", qtype, QCLASS_IN)
+
+
+def parse_response(packet: bytes, txid: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse the header of a response.
+
+    Returns:
+        (rcode, answer count), or None if the packet is not a response to txid
+    """
+    if len(packet) < 12:
+        return None
+    rid, flags, _, ancount, _, _ = struct.unpack("!HHHHHH", packet[:12])
+    if rid != txid or not flags & FLAG_QR:
+        return None
+    return flags & 0x000F, ancount
+
+
+def parse_resolver(resolver: str) -> Tuple[str, int]:
+    """Split "host", "host:port" or "[v6]:port" into (host, port)."""
+    if resolver.startswith("["):
+        host, _, rest = resolver[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else DNS_PORT
+    if resolver.count(":") == 1:
+        host, port = resolver.split(":")
+        return host, int(port)
+    return resolver, DNS_PORT
+
+
+class DnsProber:
+    """Queries many resolvers concurrently on one event loop."""
+
+    def __init__(self, resolvers: Sequence[str], timeout_sec: float = 1.5):
+        self.resolvers = list(resolvers)
+        self.timeout_sec = timeout_sec
+        self._random = random.Random(os.urandom(8))
+
+    def query(self, name: str, resolvers: Optional[Sequence[str]] = None) -> Dict[str, DnsProbeResult]:
+        """
+        Resolve name on every resolver in parallel.
+
+        Args:
+            name: Hostname to query (A record)
+            resolvers: Override the configured resolvers
+
+        Returns:
+            Mapping of resolver to its DnsProbeResult
+        """
+        resolvers = list(resolvers or self.resolvers)
+        results = {resolver: DnsProbeResult(resolver=resolver) for resolver in resolvers}
+        selector = selectors.DefaultSelector()
+        deadline = time.monotonic() + self.timeout_sec
+
+        try:
+            for resolver in resolvers:
+                self._send(selector, name, results[resolver])
+            self._receive(selector, deadline)
+        finally:
+            for key in list(selector.get_map().values()):
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+            selector.close()
+
+        for result in results.values():
+            if not result.ok and not result.error:
+                result.error = "timeout"
+        return results
+
+    def benchmark(self, names: Sequence[str], rounds: int = 3) -> Dict[str, ResolverStats]:
+        """Query every name ``rounds`` times on all resolvers and aggregate."""
+        rtts: Dict[str, List[float]] = {resolver: [] for resolver in self.resolvers}
+        stats = {resolver: ResolverStats(resolver=resolver) for resolver in self.resolvers}
+
+        for _ in range(rounds):
+            for name in names:
+                for resolver, result in self.query(name).items():
+                    stats[resolver].queries += 1
+                    if result.ok:
+                        rtts[resolver].append(result.rtt_ms)
+                    else:
+                        stats[resolver].failures += 1
+
+        for resolver, samples in rtts.items():
+            if samples:
+                samples.sort()
+                mid = len(samples) // 2
+                stats[resolver].median_ms = (
+                    samples[mid] if len(samples) % 2 else (samples[mid - 1] + samples[mid]) / 2
+                )
+                stats[resolver].mean_ms = sum(samples) / len(samples)
+                stats[resolver].min_ms = samples[0]
+        return stats
+
+    @staticmethod
+    def recommend(stats: Dict[str, ResolverStats]) -> Optional[str]:
+        """Most reliable resolver, fastest median latency breaking ties."""
+        candidates = [s for s in stats.values() if s.median_ms is not None]
+        if not candidates:
+            return None
+        best = min(candidates, key=lambda s: (s.failure_rate, s.median_ms))
+        return best.resolver
+
+    def _send(self, selector: selectors.BaseSelector, name: str, result: DnsProbeResult) -> None:
+        try:
+            host, port = parse_resolver(result.resolver)
+            family, _, _, _, sockaddr = socket.getaddrinfo(
+                host, port, type=socket.SOCK_DGRAM, flags=socket.AI_NUMERICHOST
+            )[0]
+        except (OSError, ValueError) as e:
+            result.error = f"invalid resolver: {e}"
+            return
+
+        txid = self._random.getrandbits(16)
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        try:
+            # connect() filters foreign replies and surfaces ICMP port unreachable
+            sock.connect(sockaddr)
+            sock.send(build_query(name, txid))
+        except OSError as e:
+            sock.close()
+            result.error = str(e)
+            return
+        selector.register(sock, selectors.EVENT_READ, (result, txid, time.monotonic()))
+
+    @staticmethod
+    def _receive(selector: selectors.BaseSelector, deadline: float) -> None:
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            for key, _ in selector.select(remaining):
+                sock = key.fileobj
+                result, txid, sent = key.data
+                try:
+                    packet = sock.recv(512)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError as e:
+                    result.error = str(e)
+                    packet = None
+
+                if packet is not None:
+                    parsed = parse_response(packet, txid)
+                    if parsed is None:
+                        # Stray or spoofed packet: keep waiting for the real reply
+                        continue
+                    result.rtt_ms = (time.monotonic() - sent) * 1000
+                    result.rcode, result.answers = parsed
+                    result.ok = result.rcode == RCODE_NOERROR
+                    if not result.ok:
+                        result.error = f"rcode {result.rcode}"
+
+                selector.unregister(sock)
+                sock.close()
@@ -1,19 +1,75 @@
+import codecs
+import sys
 import subprocess
+import threading
 import time
 import logging
 import shlex
-from typing import List, Union, Optional
+import weakref
+from collections import deque
+from typing import Callable, Dict, Iterator, IO, List, Union, Optional, Tuple, TYPE_CHECKING
 
 from ..models.result import StepResult
+from ..models.config import get_config
+
+if TYPE_CHECKING:
+    import asyncio  # imported lazily at run time; it dominates startup cost
 
 logger = logging.getLogger(__name__)
 
 CREATE_NO_WINDOW = 0x08000000
 
+_console_encoding: Optional[str] = None
+
+
+def detect_console_encoding() -> str:
+    """
+    Codec that console programs (netsh, ipconfig, ping) write to a pipe.
+
+    On Windows this is the console output code page, or the OEM code page
+    when the process has no console (the GUI); elsewhere the locale
+    encoding. Detected once per process.
+    """
+    global _console_encoding
+    if _console_encoding is None:
+        encoding = None
+        if sys.platform == "win32":
+            try:
+                import ctypes
+                kernel32 = ctypes.windll.kernel32
+                code_page = kernel32.GetConsoleOutputCP() or kernel32.GetOEMCP()
+                encoding = "utf-8" if code_page == 65001 else f"cp{code_page}"
+            except Exception as e:
+                logger.debug(f"Console code page detection failed: {e}")
+        else:
+            import locale
+            encoding = locale.getpreferredencoding(False)
+
+        try:
+            _console_encoding = codecs.lookup(encoding or "utf-8").name
+        except LookupError:
+            _console_encoding = "utf-8"
+        logger.debug(f"Console encoding: {_console_encoding}")
+    return _console_encoding
+
 
 class CommandExecutor:
-    def __init__(self, hide_window: bool = True):
+    # UTF-8 is tried first: it rejects bytes in other encodings, while a
+    # single-byte OEM code page (cp437, cp850) accepts anything and would
+    # silently garble UTF-8 output. Then the console encoding, then these;
+    # codecs missing on this platform are skipped.
+    DECODE_ORDER = ('mbcs', 'gbk')
+    STREAM_CHUNK_SIZE = 4096
+
+    def __init__(self, hide_window: bool = True, max_concurrency: int = 4):
         self.hide_window = hide_window
+        self._decode_candidates: Optional[Tuple[str, ...]] = None
+        # Command family (program name) -> codec that last decoded its output
+        self._family_codecs: Dict[str, str] = {}
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
 
     def run(
         self,
@@ -44,7 +100,7 @@ class CommandExecutor:
                 text=False
             )
 
-            output = self._decode_output(proc.stdout)
+            output = self._decode_output(proc.stdout, self._command_family(args))
             duration_ms = (time.time() - start_time) * 1000
 
             return StepResult(
@@ -56,7 +112,7 @@ class CommandExecutor:
             )
 
         except subprocess.CalledProcessError as e:
-            output = self._decode_output(e.stdout) if e.stdout else str(e)
+            output = self._decode_output(e.stdout, self._command_family(e.cmd)) if e.stdout else str(e)
             return StepResult(
                 ok=False,
                 title="",
@@ -83,24 +139,373 @@ class CommandExecutor:
                 error=e
             )
 
-    def run_chain(self, commands: List[Union[str, List[str]]]) -> StepResult:
+    def run_streaming(
+        self,
+        command: Union[str, List[str]],
+        on_line: Optional[Callable[[str], None]] = None,
+        shell: bool = False,
+        timeout: Optional[float] = None,
+        check: bool = True,
+        tail_lines: Optional[int] = None
+    ) -> StepResult:
+        """Run a command, decoding its output incrementally as it arrives.
+
+        Args:
+            command: Command string or argument list
+            on_line: Called from the calling thread with each output line
+                (without its line ending) as soon as it is complete
+            shell: Run through the shell
+            timeout: Kill the process after this many seconds
+            check: Treat a non-zero exit code as failure
+            tail_lines: Keep only the last N lines in StepResult.output;
+                None keeps everything
+
+        Returns:
+            StepResult; ``streamed`` is set when its output is the tail of
+            the lines already passed to on_line
+        """
+        start_time = time.time()
+        creationflags = CREATE_NO_WINDOW if self.hide_window else 0
+        tail: deque = deque(maxlen=tail_lines)
+        timed_out = threading.Event()
+        timer = None
+        proc = None
+
+        try:
+            if isinstance(command, str) and not shell:
+                args = shlex.split(command)
+            else:
+                args = command
+
+            logger.debug(f"Executing (streaming): {args}")
+
+            proc = subprocess.Popen(
+                args,
+                shell=shell,
+                creationflags=creationflags,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+            if timeout is not None:
+                timer = threading.Timer(timeout, self._kill_on_timeout, (proc, timed_out))
+                timer.daemon = True
+                timer.start()
+
+            encoding, fallback = self._stream_codecs(self._command_family(args))
+            for line in self._iter_lines(proc.stdout, encoding, fallback):
+                tail.append(line)
+                if on_line is not None:
+                    try:
+                        on_line(line)
+                    except Exception as e:
+                        logger.error(f"Output callback failed: {e}")
+
+            return_code = proc.wait()
+
+        except Exception as e:
+            logger.exception(f"Command execution failed: {e}")
+            return StepResult(
+                ok=False,
+                title="",
+                output=str(e),
+                error=e
+            )
+
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if proc is not None:
+                proc.stdout.close()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+
+        if timed_out.is_set():
+            logger.error(f"Command timeout: {command}")
+            return StepResult(
+                ok=False,
+                title="",
+                output="Command timed out",
+                error=subprocess.TimeoutExpired(args, timeout)
+            )
+
+        output = "\n".join(tail).strip()
+        if check and return_code != 0:
+            return StepResult(
+                ok=False,
+                title="",
+                output=output,
+                error=subprocess.CalledProcessError(return_code, args),
+                return_code=return_code,
+                streamed=True
+            )
+
+        return StepResult(
+            ok=True,
+            title="",
+            output=output,
+            return_code=return_code,
+            duration_ms=(time.time() - start_time) * 1000,
+            streamed=True
+        )
+
+    async def run_async(
+        self,
+        command: Union[str, List[str]],
+        shell: bool = False,
+        timeout: Optional[float] = None,
+        check: bool = True
+    ) -> StepResult:
+        """Run a command as an asyncio subprocess.
+
+        At most max_concurrency commands run at a time per event loop; the
+        timeout counts from when the command starts, not while it waits for
+        a slot.
+        """
+        async with self._get_semaphore():
+            return await self._run_async(command, shell, timeout, check)
+
+    def run_many(
+        self,
+        commands: List[Union[str, List[str]]],
+        shell: bool = False,
+        timeout: Optional[float] = None,
+        check: bool = True,
+        on_result: Optional[Callable[[int, StepResult], None]] = None
+    ) -> List[StepResult]:
+        """Run commands concurrently (at most max_concurrency at a time).
+
+        Blocks the calling thread, which runs the event loop; results are
+        returned in input order. on_result is called from the calling thread
+        with (index, result) as each command finishes.
+        """
+        import asyncio
+
+        async def run_one(index: int, command: Union[str, List[str]]) -> StepResult:
+            result = await self.run_async(command, shell=shell, timeout=timeout, check=check)
+            if on_result is not None:
+                try:
+                    on_result(index, result)
+                except Exception as e:
+                    logger.error(f"Result callback failed: {e}")
+            return result
+
+        async def gather() -> List[StepResult]:
+            return await asyncio.gather(*(
+                run_one(index, cmd) for index, cmd in enumerate(commands)
+            ))
+
+        if not commands:
+            return []
+        return asyncio.run(gather())
+
+    def _get_semaphore(self) -> "asyncio.Semaphore":
+        import asyncio
+
+        # asyncio primitives are bound to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _run_async(
+        self,
+        command: Union[str, List[str]],
+        shell: bool,
+        timeout: Optional[float],
+        check: bool
+    ) -> StepResult:
+        import asyncio
+
+        start_time = time.time()
+        creationflags = CREATE_NO_WINDOW if self.hide_window else 0
+        proc = None
+
+        try:
+            logger.debug(f"Executing (async): {command}")
+
+            if shell:
+                if not isinstance(command, str):
+                    command = subprocess.list2cmdline(command)
+                proc = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    creationflags=creationflags
+                )
+            else:
+                args = shlex.split(command) if isinstance(command, str) else command
+                proc = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    creationflags=creationflags
+                )
+
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            output = self._decode_output(stdout, self._command_family(command))
+            duration_ms = (time.time() - start_time) * 1000
+
+            if check and proc.returncode != 0:
+                return StepResult(
+                    ok=False,
+                    title="",
+                    output=output,
+                    error=subprocess.CalledProcessError(proc.returncode, command, stdout),
+                    return_code=proc.returncode
+                )
+
+            return StepResult(
+                ok=True,
+                title="",
+                output=output,
+                return_code=proc.returncode,
+                duration_ms=duration_ms
+            )
+
+        except asyncio.TimeoutError:
+            logger.error(f"Command timeout: {command}")
+            if proc is not None and proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            return StepResult(
+                ok=False,
+                title="",
+                output="Command timed out",
+                error=subprocess.TimeoutExpired(command, timeout)
+            )
+
+        except Exception as e:
+            logger.exception(f"Command execution failed: {e}")
+            return StepResult(
+                ok=False,
+                title="",
+                output=str(e),
+                error=e
+            )
+
+    def run_chain(
+        self,
+        commands: List[Union[str, List[str]]],
+        on_line: Optional[Callable[[str], None]] = None,
+        tail_lines: Optional[int] = None
+    ) -> StepResult:
+        """Run commands in order, stopping at the first failure.
+
+        With on_line set, each command is run with run_streaming().
+        """
         result = StepResult(ok=True, title="")
         for cmd in commands:
-            result = self.run(cmd)
+            if on_line is not None:
+                result = self.run_streaming(cmd, on_line=on_line, tail_lines=tail_lines)
+            else:
+                result = self.run(cmd)
             if not result.ok:
                 return result
         return result
 
+    @classmethod
+    def _iter_lines(cls, stream: IO[bytes], encoding: str, fallback: Optional[str] = None) -> Iterator[str]:
+        """Yield decoded lines from a byte stream as they are completed.
+
+        With a fallback, the stream is decoded strictly as ``encoding`` until
+        a chunk fails to decode; from that chunk on it is decoded as
+        ``fallback`` (lines already yielded were valid in ``encoding``).
+        """
+        errors = "strict" if fallback else "replace"
+        decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        pending = ""
+        while True:
+            # read1 returns whatever is available instead of waiting for a full chunk
+            chunk = stream.read1(cls.STREAM_CHUNK_SIZE)
+            final = not chunk
+            try:
+                decoded = decoder.decode(chunk, final=final)
+            except UnicodeDecodeError:
+                # Bytes of a character split across chunks are still buffered
+                buffered = decoder.getstate()[0]
+                logger.debug(f"Output is not {encoding}, decoding as {fallback}")
+                decoder = codecs.getincrementaldecoder(fallback)(errors="replace")
+                fallback = None
+                decoded = decoder.decode(buffered + chunk, final=final)
+            text = pending + decoded
+            # Hold back a trailing CR in case its LF arrives with the next chunk
+            hold = "\r" if text.endswith("\r") and not final else ""
+            if hold:
+                text = text[:-1]
+            lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            pending = lines.pop() + hold
+            yield from lines
+            if final:
+                if pending:
+                    yield pending
+                return
+
     @staticmethod
-    def _decode_output(data: bytes) -> str:
+    def _kill_on_timeout(proc: subprocess.Popen, timed_out: threading.Event) -> None:
+        if proc.poll() is None:
+            timed_out.set()
+            proc.kill()
+
+    @staticmethod
+    def _command_family(command: Union[str, List[str], None]) -> str:
+        """Lower-case program name without directory or .exe, e.g. "netsh"."""
+        if isinstance(command, str):
+            command = command.split(None, 1)
+        if not command:
+            return ""
+        name = str(command[0]).strip('"').replace("\\", "/").rsplit("/", 1)[-1].lower()
+        return name[:-4] if name.endswith(".exe") else name
+
+    def _candidates(self) -> Tuple[str, ...]:
+        """UTF-8, the console encoding, then DECODE_ORDER, without duplicates or missing codecs."""
+        if self._decode_candidates is None:
+            candidates: List[str] = []
+            for encoding in ('utf-8', detect_console_encoding()) + self.DECODE_ORDER:
+                try:
+                    name = codecs.lookup(encoding).name
+                except LookupError:
+                    continue
+                if name not in candidates:
+                    candidates.append(name)
+            self._decode_candidates = tuple(candidates)
+        return self._decode_candidates
+
+    def _stream_codecs(self, family: str) -> Tuple[str, Optional[str]]:
+        """Codec to stream with before any output arrived, and its fallback.
+
+        UTF-8 first, falling back to the codec last seen for this command
+        (or the console encoding) once the output proves not to be UTF-8.
+        """
+        candidates = self._candidates()
+        fallback = self._family_codecs.get(family)
+        if fallback is None or fallback == candidates[0]:
+            fallback = candidates[1] if len(candidates) > 1 else None
+        return candidates[0], fallback
+
+    def _decode_output(self, data: bytes, family: str = "") -> str:
         if not data:
             return ""
+        if data.isascii():
+            # Every candidate code page is an ASCII superset
+            return data.decode('ascii').strip()
+
+        # UTF-8 is always tried first (see DECODE_ORDER), then the codec that
+        # last decoded this command's output
+        candidates = self._candidates()
+        cached = self._family_codecs.get(family)
+        if cached is not None and cached != candidates[0]:
+            candidates = (candidates[0], cached) + tuple(c for c in candidates[1:] if c != cached)
 
-        for encoding in ['mbcs', 'utf-8', 'gbk']:
+        for encoding in candidates:
             try:
-                return data.decode(encoding).strip()
-            except (UnicodeDecodeError, LookupError):
+                text = data.decode(encoding)
+            except UnicodeDecodeError:
                 continue
+            self._family_codecs[family] = encoding
+            return text.strip()
 
         return data.decode('utf-8', errors='replace').strip()
 
@@ -111,5 +516,7 @@ _executor: Optional[CommandExecutor] = None
 def get_executor() -> CommandExecutor:
     global _executor
     if _executor is None:
-        _executor = CommandExecutor()
+        _executor = CommandExecutor(
+            max_concurrency=get_config().max_concurrent_commands
+        )
     return _executor
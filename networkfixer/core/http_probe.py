@@ -0,0 +1,236 @@
+"""
+HTTP reachability probe.
+
+Sends ``HEAD`` requests over ``http.client`` connections that are kept alive
+and reused between checks, and times DNS, connect (including TLS) and
+time-to-first-byte separately. Redirects are not followed: any status below
+400 proves the server answered.
+"""
+
+import socket
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Raised when a pooled connection was closed by the server while idle
+# (RemoteDisconnected, BrokenPipeError and ConnectionResetError)
+_STALE_ERRORS = (ConnectionError,)
+
+PoolKey = Tuple[str, str, int, Optional[str]]  # (scheme, host, port, proxy)
+
+
+@dataclass
+class HttpTiming:
+    """Outcome of one HTTP check. Phases skipped on a reused connection are None."""
+    url: str
+    ok: bool = False
+    status: Optional[int] = None
+    dns_ms: Optional[float] = None
+    connect_ms: Optional[float] = None  # TCP (and TLS) handshake
+    ttfb_ms: Optional[float] = None  # request sent -> status line and headers read
+    total_ms: Optional[float] = None
+    reused: bool = False
+    via_proxy: bool = False
+    error: str = ""
+
+
+class HttpProbe:
+    """HEAD-only HTTP checks over a small keep-alive connection pool."""
+
+    USER_AGENT = "NetworkFixer-Probe"
+    # Servers that refuse HEAD are retried with GET, reading only the headers
+    HEAD_REJECTED = (405, 501)
+
+    def __init__(self, timeout_sec: float = 3.0, max_idle_per_host: int = 2, use_proxies: bool = True):
+        """
+        Args:
+            timeout_sec: Socket timeout for each phase
+            max_idle_per_host: Idle connections kept per (host, port, proxy)
+            use_proxies: Honour the environment/system proxy like urllib does
+        """
+        self.timeout_sec = timeout_sec
+        self.max_idle_per_host = max_idle_per_host
+        self.use_proxies = use_proxies
+        self._idle: Dict[PoolKey, List] = {}
+        self._lock = threading.Lock()
+        self._ssl = None
+
+    def check(self, url: str) -> HttpTiming:
+        timing = HttpTiming(url=url)
+        start = time.monotonic()
+
+        try:
+            parts = urlsplit(url)
+            scheme = parts.scheme.lower()
+            if scheme not in ("http", "https") or not parts.hostname:
+                raise ValueError(f"Unsupported URL: {url}")
+            port = parts.port or (443 if scheme == "https" else 80)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+
+            proxy = self._proxy_for(url, scheme)
+            timing.via_proxy = proxy is not None
+            key = (scheme, parts.hostname, port, proxy)
+            if proxy is not None and scheme == "http":
+                # Plain HTTP through a proxy uses the absolute URL as target
+                path = url
+
+            self._request(key, path, timing)
+        except Exception as e:
+            timing.error = str(e) or type(e).__name__
+            logger.debug(f"HTTP probe {url} failed: {timing.error}")
+
+        timing.total_ms = (time.monotonic() - start) * 1000
+        return timing
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _request(self, key: PoolKey, path: str, timing: HttpTiming) -> None:
+        conn = self._acquire(key)
+        timing.reused = conn is not None
+        if conn is not None:
+            try:
+                response = self._send(conn, "HEAD", path, timing)
+            except _STALE_ERRORS as e:
+                logger.debug(f"Pooled connection to {key[1]} went stale: {e}")
+                conn.close()
+                conn = None
+                timing.reused = False
+            except Exception:
+                # Timeouts and protocol errors are real failures; don't leak the socket
+                conn.close()
+                raise
+
+        try:
+            if conn is None:
+                conn = self._connect(key, timing)
+                response = self._send(conn, "HEAD", path, timing)
+
+            if response.status in self.HEAD_REJECTED:
+                response.close()
+                conn.close()
+                conn = self._connect(key, timing)
+                timing.reused = False
+                response = self._send(conn, "GET", path, timing)
+                # The body is not read, so this connection cannot be reused
+                response.close()
+                conn.close()
+                conn = None
+            else:
+                response.read()
+        except Exception:
+            if conn is not None:
+                conn.close()
+            raise
+
+        timing.status = response.status
+        timing.ok = 200 <= response.status < 400
+
+        if conn is not None and not response.will_close:
+            self._release(key, conn)
+        elif conn is not None:
+            conn.close()
+
+    def _send(self, conn, method: str, path: str, timing: HttpTiming):
+        sent = time.monotonic()
+        conn.request(method, path, headers={
+            "User-Agent": self.USER_AGENT,
+            "Connection": "keep-alive",
+        })
+        response = conn.getresponse()
+        timing.ttfb_ms = (time.monotonic() - sent) * 1000
+        return response
+
+    def _connect(self, key: PoolKey, timing: HttpTiming):
+        import http.client
+
+        scheme, host, port, proxy = key
+        if proxy is not None:
+            proxy_host, proxy_port = proxy.rsplit(":", 1)
+            if scheme == "https":
+                # CONNECT tunnel: http.client does DNS, CONNECT and TLS in one call
+                conn = http.client.HTTPSConnection(
+                    proxy_host, int(proxy_port), timeout=self.timeout_sec, context=self._ssl_context()
+                )
+                conn.set_tunnel(host, port)
+                started = time.monotonic()
+                conn.connect()
+                timing.connect_ms = (time.monotonic() - started) * 1000
+                return conn
+            connect_host, connect_port = proxy_host, int(proxy_port)
+        else:
+            connect_host, connect_port = host, port
+
+        started = time.monotonic()
+        family, _, _, _, sockaddr = socket.getaddrinfo(
+            connect_host, connect_port, type=socket.SOCK_STREAM
+        )[0]
+        timing.dns_ms = (time.monotonic() - started) * 1000
+
+        started = time.monotonic()
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout_sec)
+        try:
+            sock.connect(sockaddr)
+            if scheme == "https":
+                sock = self._ssl_context().wrap_socket(sock, server_hostname=host)
+        except Exception:
+            sock.close()
+            raise
+        timing.connect_ms = (time.monotonic() - started) * 1000
+
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout_sec)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout_sec)
+        conn.sock = sock
+        return conn
+
+    def _acquire(self, key: PoolKey):
+        with self._lock:
+            connections = self._idle.get(key)
+            return connections.pop() if connections else None
+
+    def _release(self, key: PoolKey, conn) -> None:
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.max_idle_per_host:
+                connections.append(conn)
+                return
+        conn.close()
+
+    def _proxy_for(self, url: str, scheme: str) -> Optional[str]:
+        """Return "host:port" of the proxy urllib would use for url, if any."""
+        if not self.use_proxies:
+            return None
+
+        import urllib.request
+
+        proxy_url = urllib.request.getproxies().get(scheme)
+        if not proxy_url or urllib.request.proxy_bypass(urlsplit(url).hostname or ""):
+            return None
+        if "://" not in proxy_url:
+            proxy_url = "http://" + proxy_url
+        parts = urlsplit(proxy_url)
+        if not parts.hostname:
+            return None
+        return f"{parts.hostname}:{parts.port or 80}"
+
+    def _ssl_context(self):
+        # Loading the CA store is costly; build the context once
+        if self._ssl is None:
+            import ssl
+            self._ssl = ssl.create_default_context()
+        return self._ssl
@@ -0,0 +1,298 @@
+"""
+Continuous connectivity monitor.
+
+Probes a fixed set of targets on a schedule and keeps the last N samples of
+each in flat ``array`` ring buffers, so memory stays constant however long
+the monitor runs. Rolling latency percentiles, loss and jitter computed
+from those buffers tell a slow network from a broken one.
+"""
+
+import math
+import threading
+import logging
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .http_probe import HttpProbe
+from .probe import ProbeEngine, ProbeResult
+
+logger = logging.getLogger(__name__)
+
+STATUS_UNKNOWN = "unknown"  # no samples yet
+STATUS_OK = "ok"
+STATUS_SLOW = "slow"  # reachable, but high latency or some loss
+STATUS_BROKEN = "broken"  # failing consistently
+
+# Best first; the overall status is the best status of any target
+_STATUS_RANK = (STATUS_OK, STATUS_SLOW, STATUS_BROKEN, STATUS_UNKNOWN)
+
+
+class RingBuffer:
+    """Fixed-capacity probe history for one target.
+
+    RTTs are kept in an ``array('d')`` (NaN for failed probes) and success
+    flags in an ``array('B')``; appending overwrites the oldest sample.
+    """
+
+    __slots__ = ("capacity", "_rtt", "_ok", "_next", "_count")
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._rtt = array("d", [math.nan]) * capacity
+        self._ok = array("B", [0]) * capacity
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, ok: bool, rtt_ms: Optional[float]) -> None:
+        i = self._next
+        self._ok[i] = 1 if ok else 0
+        self._rtt[i] = rtt_ms if ok and rtt_ms is not None else math.nan
+        self._next = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self) -> None:
+        self._next = 0
+        self._count = 0
+
+    def _indices(self) -> range:
+        """Buffer positions from oldest to newest (negative indices wrap around)."""
+        return range(self._next - self._count, self._next)
+
+    def rtts(self) -> List[float]:
+        """RTTs of successful probes, oldest first."""
+        rtt = self._rtt
+        return [rtt[i] for i in self._indices() if not math.isnan(rtt[i])]
+
+    def failures(self) -> int:
+        return self._count - sum(self._ok[i] for i in self._indices())
+
+    def trailing_failures(self) -> int:
+        """Number of consecutive failures at the newest end."""
+        count = 0
+        for i in reversed(self._indices()):
+            if self._ok[i]:
+                break
+            count += 1
+        return count
+
+    def last_ok(self) -> Optional[bool]:
+        if not self._count:
+            return None
+        return bool(self._ok[self._next - 1])
+
+
+@dataclass
+class LatencyStats:
+    """Rolling statistics for one target over the monitor window."""
+    target: str
+    samples: int = 0
+    loss_pct: float = 0.0
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    jitter_ms: Optional[float] = None  # mean difference between consecutive RTTs
+    consecutive_failures: int = 0
+    last_ok: Optional[bool] = None
+    status: str = STATUS_UNKNOWN
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def jitter(values: List[float]) -> Optional[float]:
+    if len(values) < 2:
+        return None
+    return sum(abs(b - a) for a, b in zip(values, values[1:])) / (len(values) - 1)
+
+
+class ConnectivityMonitor:
+    """Background service probing targets every ``interval_sec`` seconds.
+
+    Each round probes all targets in one ProbeEngine batch, appends the
+    results to the per-target ring buffers and notifies subscribers with a
+    fresh stats snapshot.
+    """
+
+    def __init__(
+        self,
+        targets: Dict[str, str],
+        probe_engine: Optional[ProbeEngine] = None,
+        interval_sec: float = 5.0,
+        window_size: int = 720,
+        slow_p95_ms: float = 500.0,
+        slow_loss_pct: float = 5.0,
+        broken_loss_pct: float = 50.0,
+        broken_after_failures: int = 3,
+        http_targets: Optional[Dict[str, str]] = None,
+        http_probe: Optional[HttpProbe] = None
+    ):
+        """
+        Args:
+            targets: Mapping of name to host or IP address
+            probe_engine: Engine used for each round (a default one if None)
+            interval_sec: Delay between probe rounds
+            window_size: Samples kept per target
+            slow_p95_ms: p95 latency above which a target counts as slow
+            slow_loss_pct: Loss percentage at which a target counts as slow
+            broken_loss_pct: Loss percentage at which a target counts as broken
+            broken_after_failures: Consecutive failures that mark a target broken
+                even while the window loss is still low
+            http_targets: Mapping of name to URL, checked with HEAD requests over
+                kept-alive connections; their RTT is the time to first byte
+            http_probe: Probe used for http_targets (a default one if None)
+        """
+        self.targets = dict(targets)
+        self.http_targets = dict(http_targets or {})
+        self.probe_engine = probe_engine or ProbeEngine()
+        self.http_probe = http_probe or HttpProbe()
+        self.interval_sec = interval_sec
+        self.window_size = window_size
+        self.slow_p95_ms = slow_p95_ms
+        self.slow_loss_pct = slow_loss_pct
+        self.broken_loss_pct = broken_loss_pct
+        self.broken_after_failures = broken_after_failures
+
+        self._buffers = {
+            name: RingBuffer(window_size) for name in list(self.targets) + list(self.http_targets)
+        }
+        self._subscribers: List[Callable[[Dict[str, LatencyStats]], None]] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, callback: Callable[[Dict[str, LatencyStats]], None]) -> Callable[[], None]:
+        """
+        Register a callback for each completed round (called on the monitor thread).
+
+        Returns:
+            A function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="connectivity-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        thread, self._thread = self._thread, None
+        if thread is None:
+            self.http_probe.close()
+            return
+        # The monitor thread closes the HTTP probe once its last round is done
+        thread.join(timeout=self._round_budget())
+
+    def _round_budget(self) -> float:
+        """Upper bound on one round: the probe batch, then each HTTP check in turn."""
+        # An HTTP check may wait a full timeout to connect and another for the response
+        http_sec = 2 * self.http_probe.timeout_sec * len(self.http_targets)
+        return self.probe_engine.timeout_sec + http_sec + 1.0
+
+    def reset(self) -> None:
+        """Drop all samples, e.g. after a repair changed the network."""
+        with self._lock:
+            for buffer in self._buffers.values():
+                buffer.clear()
+
+    def sample(self) -> Dict[str, LatencyStats]:
+        """Run one probe round now and return the updated snapshot."""
+        probes = self.probe_engine.probe(list(self.targets.values()))
+        timings = {name: self.http_probe.check(url) for name, url in self.http_targets.items()}
+
+        with self._lock:
+            for name, target in self.targets.items():
+                probe = probes.get(target) or ProbeResult(target=target)
+                self._buffers[name].append(probe.ok, probe.rtt_ms)
+            for name, timing in timings.items():
+                self._buffers[name].append(timing.ok, timing.ttfb_ms)
+            subscribers = list(self._subscribers)
+
+        snapshot = self.snapshot()
+        for callback in subscribers:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Connectivity monitor subscriber failed: {e}")
+        return snapshot
+
+    def stats(self, name: str) -> LatencyStats:
+        with self._lock:
+            buffer = self._buffers[name]
+            samples = len(buffer)
+            rtts = buffer.rtts()
+            failures = buffer.failures()
+            trailing = buffer.trailing_failures()
+            last_ok = buffer.last_ok()
+
+        ordered = sorted(rtts)
+        stats = LatencyStats(
+            target=name,
+            samples=samples,
+            loss_pct=failures * 100 / samples if samples else 0.0,
+            p50_ms=percentile(ordered, 50),
+            p95_ms=percentile(ordered, 95),
+            p99_ms=percentile(ordered, 99),
+            jitter_ms=jitter(rtts),
+            consecutive_failures=trailing,
+            last_ok=last_ok,
+        )
+        stats.status = self._classify(stats)
+        return stats
+
+    def snapshot(self) -> Dict[str, LatencyStats]:
+        return {name: self.stats(name) for name in self._buffers}
+
+    def status(self) -> str:
+        """Overall status: the best status of any target (one reachable target is enough)."""
+        statuses = [stats.status for stats in self.snapshot().values()]
+        return min(statuses, key=_STATUS_RANK.index, default=STATUS_UNKNOWN)
+
+    def _classify(self, stats: LatencyStats) -> str:
+        if not stats.samples:
+            return STATUS_UNKNOWN
+        if stats.consecutive_failures >= self.broken_after_failures or stats.loss_pct >= self.broken_loss_pct:
+            return STATUS_BROKEN
+        if stats.loss_pct >= self.slow_loss_pct:
+            return STATUS_SLOW
+        if stats.p95_ms is not None and stats.p95_ms > self.slow_p95_ms:
+            return STATUS_SLOW
+        return STATUS_OK
+
+    def _run(self) -> None:
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self.sample()
+                except Exception as e:
+                    logger.error(f"Connectivity monitor round failed: {e}")
+                self._stop_event.wait(self.interval_sec)
+        finally:
+            self.http_probe.close()
@@ -1,21 +1,45 @@
 import logging
-from typing import List, Callable, Tuple, Optional
+from concurrent.futures import Future
+from typing import List, Callable, Tuple, Optional, Iterable
 
 from .executor import get_executor
 from .registry import ProxyRegistry
 from .adapters import AdapterManager
 from .connectivity import ConnectivityTester
-from .proxy_env import ProxyGhostKiller
-from ..models.result import StepResult, AppConfig, ConnectivityResult
+from .monitor import ConnectivityMonitor
+from .proxy_env import ProxyGhostKiller, ProxyHealthCache
+from .scheduler import StepScheduler
+from .singleflight import SingleFlight
+from .watcher import ProxyWatcher
+from ..models.result import StepResult, AppConfig, ConnectivityResult, AdapterInfo
 from ..models.config import get_config
 
 logger = logging.getLogger(__name__)
 
 
 class Step:
-    def __init__(self, title_key: str, func: Callable[[], StepResult]):
+    """A unit of repair work.
+
+    ``depends_on`` names steps that must finish first, ``conflicts`` names
+    steps that must not run at the same time, and ``exclusive`` steps run
+    alone. The name defaults to the title key without its ``step.`` prefix.
+    """
+
+    def __init__(
+        self,
+        title_key: str,
+        func: Callable[[], StepResult],
+        name: Optional[str] = None,
+        depends_on: Iterable[str] = (),
+        conflicts: Iterable[str] = (),
+        exclusive: bool = False
+    ):
         self.title_key = title_key
         self.func = func
+        self.name = name or title_key.split(".", 1)[-1]
+        self.depends_on = frozenset(depends_on)
+        self.conflicts = frozenset(conflicts)
+        self.exclusive = exclusive
 
 
 class NetworkOperations:
@@ -28,38 +52,121 @@ class NetworkOperations:
         )
         self.connectivity_tester = ConnectivityTester(
             ping_timeout_ms=self.config.ping_timeout_ms,
-            http_timeout_sec=self.config.http_timeout_sec
+            http_timeout_sec=self.config.http_timeout_sec,
+            probe_tcp_ports=self.config.probe_tcp_ports,
+            dns_resolvers=self.config.dns_resolvers,
+            dns_test_names=self.config.dns_test_names,
+            dns_timeout_ms=self.config.dns_timeout_ms,
+            targets=self.config.probe_targets,
+            quorum=self.config.probe_quorum
         )
         self.proxy_ghost_killer = ProxyGhostKiller(
-            health_check_timeout=2.0
+            health_check_timeout=2.0,
+            health_cache=ProxyHealthCache(
+                positive_ttl=self.config.proxy_health_positive_ttl_sec,
+                negative_ttl=self.config.proxy_health_negative_ttl_sec
+            )
+        )
+
+        # Concurrent identical requests (UI, scheduler, watchdog) share one run
+        self._flights = SingleFlight()
+
+        self._output_subscribers: List[Callable[[str, str], None]] = []
+
+        self.proxy_watcher = ProxyWatcher(
+            registry=self.proxy_registry.registry,
+            poll_min_interval=self.config.proxy_watch_min_interval_sec,
+            poll_max_interval=self.config.proxy_watch_max_interval_sec
+        )
+        # Cached proxy health verdicts may not hold for the new configuration
+        self.proxy_watcher.subscribe(lambda change: self.proxy_ghost_killer.invalidate_health())
+
+        self.connectivity_monitor = ConnectivityMonitor(
+            targets={t.name: t.address for t in self.connectivity_tester.ping_targets},
+            probe_engine=self.connectivity_tester.probe_engine,
+            interval_sec=self.config.monitor_interval_sec,
+            window_size=self.config.monitor_window_size,
+            slow_p95_ms=self.config.monitor_slow_p95_ms,
+            slow_loss_pct=self.config.monitor_slow_loss_pct,
+            broken_loss_pct=self.config.monitor_broken_loss_pct,
+            broken_after_failures=self.config.monitor_broken_after_failures,
+            http_targets={t.name: t.address for t in self.connectivity_tester.http_targets},
+            http_probe=self.connectivity_tester.http_probe
         )
 
     def get_proxy_status(self) -> Tuple[bool, str]:
+        # Served from the watcher snapshot when it is running
+        state = self.proxy_watcher.state if self.proxy_watcher.is_running else None
+        if state is not None:
+            return state.system_enabled, state.system_server
         return self.proxy_registry.get_status()
 
     def disable_proxy(self) -> StepResult:
-        return self.proxy_registry.disable()
+        result = self.proxy_registry.disable()
+        self.proxy_ghost_killer.invalidate_health()
+        if self.proxy_watcher.is_running:
+            # Don't serve the pre-disable snapshot until the next notification
+            self.proxy_watcher.refresh()
+        return result
+
+    def subscribe_output(self, callback: Callable[[str, str], None]) -> Callable[[], None]:
+        """
+        Receive (step name, line) for each output line of a repair command
+        while it runs. Callbacks fire on the worker thread running the step.
+
+        Returns:
+            Function that removes the subscription
+        """
+        self._output_subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._output_subscribers:
+                self._output_subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _output_forwarder(self, name: str) -> Callable[[str], None]:
+        def forward(line: str) -> None:
+            for callback in list(self._output_subscribers):
+                callback(name, line)
+        return forward
 
     def flush_dns(self) -> StepResult:
-        result = self.executor.run("ipconfig /flushdns")
+        result = self.executor.run_streaming(
+            "ipconfig /flushdns",
+            on_line=self._output_forwarder("flush_dns"),
+            tail_lines=self.config.command_output_tail_lines
+        )
         result.title = "flush_dns"
         return result
 
     def reset_winsock(self) -> StepResult:
-        result = self.executor.run("netsh winsock reset")
+        result = self.executor.run_streaming(
+            "netsh winsock reset",
+            on_line=self._output_forwarder("reset_winsock"),
+            tail_lines=self.config.command_output_tail_lines
+        )
         result.title = "reset_winsock"
         return result
 
     def reset_ip(self) -> StepResult:
-        result = self.executor.run_chain([
-            ["ipconfig", "/release"],
-            ["ipconfig", "/renew"]
-        ])
+        result = self.executor.run_chain(
+            [
+                ["ipconfig", "/release"],
+                ["ipconfig", "/renew"]
+            ],
+            on_line=self._output_forwarder("reset_ip"),
+            tail_lines=self.config.command_output_tail_lines
+        )
         result.title = "reset_ip"
         return result
 
     def reset_tcpip(self) -> StepResult:
-        result = self.executor.run("netsh int ip reset")
+        result = self.executor.run_streaming(
+            "netsh int ip reset",
+            on_line=self._output_forwarder("reset_tcpip"),
+            tail_lines=self.config.command_output_tail_lines
+        )
         result.title = "reset_tcpip"
         return result
 
@@ -67,8 +174,18 @@ class NetworkOperations:
         return self.adapter_manager.list_names()
 
     def refresh_adapters(self, force: bool = False) -> List[str]:
+        # AdapterManager already coalesces concurrent refreshes
         return self.adapter_manager.refresh(force)
 
+    def refresh_adapter_info(self, force: bool = False) -> List[AdapterInfo]:
+        return self.adapter_manager.refresh_info(force)
+
+    def get_cached_adapters(self) -> List[AdapterInfo]:
+        return self.adapter_manager.get_cached()
+
+    def revalidate_adapters(self, force: bool = False) -> Future:
+        return self.adapter_manager.revalidate(force)
+
     def restart_adapter(self, adapter_name: str) -> StepResult:
         if not self.adapter_manager.validate_name(adapter_name):
             return StepResult(
@@ -84,17 +201,42 @@ class NetworkOperations:
         result.title = "restart_adapter"
         return result
 
-    def test_connectivity(self) -> ConnectivityResult:
-        return self.connectivity_tester.test()
+    def test_connectivity(
+        self,
+        fast: bool = False,
+        on_result: Optional[Callable[[str, bool], None]] = None
+    ) -> ConnectivityResult:
+        """
+        Test connectivity.
+
+        Concurrent calls with the same ``fast`` flag share one test run and
+        receive the same result object, which callers must not modify. Calls
+        with an on_result callback need their own stream and are not coalesced.
+        """
+        if on_result is not None:
+            return self.connectivity_tester.test(
+                mode=self.config.connectivity_mode,
+                fast=fast,
+                on_result=on_result
+            )
+
+        return self._flights.do(
+            ("test_connectivity", fast),
+            self.connectivity_tester.test,
+            mode=self.config.connectivity_mode,
+            fast=fast
+        )
 
     def scan_proxy_env(self):
         """
         Scan and test proxy environment variables for ghost proxies.
 
+        Concurrent calls share one scan and receive the same lists.
+
         Returns:
             Tuple of (healthy_proxies, dead_proxies)
         """
-        return self.proxy_ghost_killer.scan_and_test()
+        return self._flights.do("scan_proxy_env", self.proxy_ghost_killer.scan_and_test)
 
     def fix_proxy_env(self) -> dict:
         """
@@ -103,7 +245,18 @@ class NetworkOperations:
         Returns:
             Dictionary of StepResults for each scope
         """
-        return self.proxy_ghost_killer.auto_fix()
+        results = self.proxy_ghost_killer.auto_fix()
+        if self.proxy_watcher.is_running:
+            # Process-level variables don't raise registry notifications
+            self.proxy_watcher.refresh()
+        return results
+
+    def clear_process_proxy_env(self, var_names: List[str]) -> StepResult:
+        """Remove the given proxy variables from this process."""
+        result = self.proxy_ghost_killer.clear_process_env(var_names)
+        if self.proxy_watcher.is_running:
+            self.proxy_watcher.refresh()
+        return result
 
     def build_steps(
         self,
@@ -117,21 +270,37 @@ class NetworkOperations:
     ) -> List[Step]:
         steps = []
 
+        # disable_proxy only touches the registry and can overlap with
+        # everything; the netsh/ipconfig resets keep their historical order
         if do_proxy:
             steps.append(Step("step.disable_proxy", self.disable_proxy))
         if do_dns:
-            steps.append(Step("step.flush_dns", self.flush_dns))
+            steps.append(Step(
+                "step.flush_dns", self.flush_dns,
+                conflicts=("reset_ip",)
+            ))
         if do_winsock:
-            steps.append(Step("step.reset_winsock", self.reset_winsock))
+            steps.append(Step(
+                "step.reset_winsock", self.reset_winsock,
+                conflicts=("reset_tcpip",)
+            ))
         if do_ip:
-            steps.append(Step("step.reset_ip", self.reset_ip))
+            steps.append(Step(
+                "step.reset_ip", self.reset_ip,
+                depends_on=("reset_winsock",)
+            ))
         if do_tcpip:
-            steps.append(Step("step.reset_tcpip", self.reset_tcpip))
+            steps.append(Step(
+                "step.reset_tcpip", self.reset_tcpip,
+                depends_on=("reset_winsock", "reset_ip")
+            ))
 
         if do_adapter and adapter_name:
             steps.append(Step(
                 "step.restart_adapter",
-                lambda: self.restart_adapter(adapter_name)
+                lambda: self.restart_adapter(adapter_name),
+                depends_on=("disable_proxy", "flush_dns", "reset_winsock", "reset_ip", "reset_tcpip"),
+                exclusive=True
             ))
 
         return steps
@@ -140,22 +309,21 @@ class NetworkOperations:
         self,
         steps: List[Step],
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
-        cancel_check: Optional[Callable[[], bool]] = None
+        cancel_check: Optional[Callable[[], bool]] = None,
+        result_callback: Optional[Callable[[Step, StepResult], None]] = None
     ) -> List[StepResult]:
-        results = []
-        total = len(steps)
-
-        for i, step in enumerate(steps):
-            if cancel_check and cancel_check():
-                logger.info("Operation cancelled by user")
-                break
-
-            if progress_callback:
-                progress_callback(i + 1, total, step.title_key)
-
-            result = step.func()
-            results.append(result)
-
-            logger.info(f"Step {i+1}/{total}: {result}")
+        """
+        Run steps concurrently where their dependencies and conflicts allow.
 
-        return results
+        progress_callback fires as each step starts, cancel_check is polled
+        before dispatching new steps (running steps finish), and
+        result_callback fires as each step finishes. Results are returned in
+        plan order.
+        """
+        scheduler = StepScheduler(max_workers=self.config.max_parallel_steps)
+        return scheduler.run(
+            steps,
+            progress_callback=progress_callback,
+            cancel_check=cancel_check,
+            result_callback=result_callback
+        )
@@ -0,0 +1,136 @@
+import sys
+import threading
+import logging
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from ..models.config import get_config
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_task_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_thread_state = threading.local()
+
+
+def _mark_worker_thread() -> None:
+    _thread_state.in_worker_pool = True
+
+
+def in_worker_pool() -> bool:
+    """True when called from one of the shared worker pool's threads."""
+    return getattr(_thread_state, "in_worker_pool", False)
+
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """Return the process-wide worker pool, creating it on first use.
+
+    Sized by AppConfig.worker_pool_size. Only leaf work (single probes,
+    checks, adapter queries) runs here; tasks that wait on other pool tasks
+    belong on the task pool (see submit_task).
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                size = max(1, get_config().worker_pool_size)
+                _pool = ThreadPoolExecutor(
+                    max_workers=size,
+                    thread_name_prefix="networkfixer",
+                    initializer=_mark_worker_thread
+                )
+                logger.debug(f"Worker pool started with {size} threads")
+    return _pool
+
+
+def get_task_pool() -> ThreadPoolExecutor:
+    """Return the pool for top-level background jobs, creating it on first use.
+
+    Sized by AppConfig.task_pool_size. Jobs here may fan out to the worker
+    pool and wait for the results; keeping them off the worker pool means
+    they can never hold the workers their own probes need.
+    """
+    global _task_pool
+    if _task_pool is None:
+        with _pool_lock:
+            if _task_pool is None:
+                size = max(1, get_config().task_pool_size)
+                _task_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="networkfixer-task")
+                logger.debug(f"Task pool started with {size} threads")
+    return _task_pool
+
+
+class _InlineExecutor(Executor):
+    """Runs each task in the submitting thread."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+_inline_executor = _InlineExecutor()
+
+
+def get_fanout_executor() -> Executor:
+    """Executor for work the caller submits and then waits on.
+
+    The worker pool, except on one of its own threads: a pool task waiting
+    on other pool tasks can hold the last free worker and deadlock, so
+    there the work runs inline instead.
+    """
+    return _inline_executor if in_worker_pool() else get_worker_pool()
+
+
+def submit(func: Callable, *args, **kwargs) -> Future:
+    return get_worker_pool().submit(func, *args, **kwargs)
+
+
+def submit_task(func: Callable, *args, **kwargs) -> Future:
+    """Run a top-level background job (UI actions, scans) on the task pool."""
+    return get_task_pool().submit(func, *args, **kwargs)
+
+
+def submit_daemon(func: Callable, *args, **kwargs) -> Future:
+    """Run func on its own daemon thread.
+
+    For work the caller may abandon: the pool's threads are joined at
+    interpreter exit, a daemon thread is not, so an abandoned task cannot
+    hold up exit.
+    """
+    future: Future = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="networkfixer-daemon", daemon=True).start()
+    return future
+
+
+def shutdown_worker_pool(wait: bool = False) -> None:
+    """Stop the shared pools; queued tasks are cancelled (Python 3.9+), running ones finish.
+
+    A later get_worker_pool() or get_task_pool() call starts a fresh pool.
+    """
+    global _pool, _task_pool
+    with _pool_lock:
+        pools = [p for p in (_task_pool, _pool) if p is not None]
+        _pool = _task_pool = None
+
+    for pool in pools:
+        if sys.version_info >= (3, 9):
+            pool.shutdown(wait=wait, cancel_futures=True)
+        else:
+            pool.shutdown(wait=wait)
+    if pools:
+        logger.debug("Worker pools shut down")
@@ -0,0 +1,308 @@
+"""
+In-process reachability probes.
+
+Probes many targets from a single ``selectors`` loop instead of spawning one
+``ping.exe`` per target. ICMP echo is sent over an unprivileged datagram
+socket where the OS allows it (Linux ``ping_group_range``, macOS); targets
+that do not answer it (or cannot use it) are probed with non-blocking TCP
+connects to a set of ports.
+"""
+
+import errno
+import os
+import selectors
+import socket
+import struct
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .pool import submit_daemon
+
+logger = logging.getLogger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+_REFUSED_ERRNOS = {errno.ECONNREFUSED, getattr(errno, "WSAECONNREFUSED", 10061)}
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing a single target."""
+    target: str
+    ok: bool = False
+    rtt_ms: Optional[float] = None
+    method: str = ""  # "icmp" or "tcp"
+    port: Optional[int] = None  # TCP port that answered, if any
+
+
+class ProbeEngine:
+    """Probes a batch of targets concurrently on one event loop."""
+
+    DEFAULT_TCP_PORTS = (443, 53, 80)
+    # Share of the timeout spent waiting for host names, so resolved targets
+    # still get time to answer when one name is slow to resolve
+    RESOLVE_WAIT_SHARE = 0.5
+    # Share of the remaining time ICMP gets before unanswered targets fall back to TCP
+    ICMP_WAIT_SHARE = 0.5
+
+    def __init__(
+        self,
+        timeout_sec: float = 2.0,
+        tcp_ports: Sequence[int] = DEFAULT_TCP_PORTS,
+        use_icmp: bool = True,
+        refused_is_reachable: bool = True
+    ):
+        """
+        Args:
+            timeout_sec: Time to wait for all answers
+            tcp_ports: Ports tried per target when ICMP is unavailable
+            use_icmp: Try unprivileged ICMP echo first
+            refused_is_reachable: Count a refused TCP connection as an answer
+                (the host is up even if the port is closed)
+        """
+        self.timeout_sec = timeout_sec
+        self.tcp_ports = tuple(tcp_ports)
+        self.use_icmp = use_icmp
+        self._reachable_errnos = {0} | (_REFUSED_ERRNOS if refused_is_reachable else set())
+        self._ident = os.getpid() & 0xFFFF
+
+    def probe(self, targets: Sequence[str]) -> Dict[str, ProbeResult]:
+        """
+        Probe all targets and wait at most ``timeout_sec`` for answers.
+
+        Name resolution counts against the timeout; names not resolved within
+        RESOLVE_WAIT_SHARE of it are given up on. Targets that get no ICMP
+        reply within ICMP_WAIT_SHARE of the time left are retried over TCP.
+
+        Args:
+            targets: Hostnames or IP addresses
+
+        Returns:
+            Mapping of target to its ProbeResult (unreachable targets have ok=False)
+        """
+        results = {target: ProbeResult(target=target) for target in targets}
+        if not results:
+            return results
+
+        started = time.monotonic()
+        deadline = started + self.timeout_sec
+        addresses = self._resolve_all(list(results), started + self.timeout_sec * self.RESOLVE_WAIT_SHARE)
+
+        icmp_sock = self._open_icmp_socket() if self.use_icmp else None
+        selector = selectors.DefaultSelector()
+        try:
+            unanswered = list(addresses)
+            if icmp_sock is not None:
+                icmp_targets = [t for t in unanswered if addresses[t][0] == socket.AF_INET]
+                icmp_deadline = time.monotonic() + (deadline - time.monotonic()) * self.ICMP_WAIT_SHARE
+                self._run_icmp(selector, icmp_sock, results, addresses, icmp_targets, icmp_deadline)
+                unanswered = [t for t in unanswered if not results[t].ok]
+            if unanswered:
+                self._run_tcp(selector, results, addresses, unanswered, deadline)
+        finally:
+            for key in list(selector.get_map().values()):
+                selector.unregister(key.fileobj)
+                self._close(key.fileobj)
+            selector.close()
+            if icmp_sock is not None:
+                self._close(icmp_sock)
+
+        return results
+
+    def _resolve_all(self, targets: List[str], deadline: float) -> Dict[str, Tuple[int, tuple]]:
+        """
+        Resolve each target once, giving up on names still unresolved at deadline.
+
+        IP literals resolve immediately; names are looked up concurrently on
+        daemon threads, since a stuck getaddrinfo call cannot be cancelled.
+
+        Returns:
+            Mapping of each resolved target to (family, sockaddr without port)
+        """
+
+        def lookup(target: str, flags: int = 0) -> Tuple[int, tuple]:
+            family, _, _, _, sockaddr = socket.getaddrinfo(
+                target, None, type=socket.SOCK_STREAM, flags=flags
+            )[0]
+            return family, sockaddr
+
+        addresses: Dict[str, Tuple[int, tuple]] = {}
+        futures = {}
+        for target in targets:
+            try:
+                addresses[target] = lookup(target, socket.AI_NUMERICHOST)
+            except socket.gaierror:
+                futures[target] = submit_daemon(lookup, target)
+            except OSError as e:
+                logger.debug(f"Cannot resolve {target}: {e}")
+
+        for target, future in futures.items():
+            try:
+                addresses[target] = future.result(max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                logger.debug(f"Cannot resolve {target}: {e or 'timed out'}")
+        return addresses
+
+    def _open_icmp_socket(self) -> Optional[socket.socket]:
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            sock.setblocking(False)
+            return sock
+        except (OSError, AttributeError) as e:
+            logger.debug(f"Unprivileged ICMP unavailable, using TCP probes: {e}")
+            return None
+
+    def _run_icmp(
+        self,
+        selector: selectors.BaseSelector,
+        sock: socket.socket,
+        results: Dict[str, ProbeResult],
+        addresses: Dict[str, Tuple[int, tuple]],
+        targets: List[str],
+        deadline: float
+    ) -> None:
+        # seq -> (target, address, send time)
+        outstanding: Dict[int, Tuple[str, str, float]] = {}
+        for seq, target in enumerate(targets, start=1):
+            address = addresses[target][1][0]
+            results[target].method = "icmp"
+            try:
+                sock.sendto(self._build_echo(seq), (address, 0))
+                outstanding[seq] = (target, address, time.monotonic())
+            except OSError as e:
+                logger.debug(f"ICMP send to {target} failed: {e}")
+
+        selector.register(sock, selectors.EVENT_READ)
+        while outstanding:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not selector.select(remaining):
+                continue
+
+            while True:
+                try:
+                    packet, (source, _) = sock.recvfrom(1024)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError as e:
+                    logger.debug(f"ICMP receive failed: {e}")
+                    break
+
+                seq = self._parse_reply(packet)
+                entry = outstanding.get(seq) if seq is not None else None
+                if entry is None or entry[1] != source:
+                    continue
+
+                target, _, sent = entry
+                del outstanding[seq]
+                results[target].ok = True
+                results[target].rtt_ms = (time.monotonic() - sent) * 1000
+        selector.unregister(sock)
+
+        if outstanding:
+            logger.debug(f"No ICMP reply from {[entry[0] for entry in outstanding.values()]}, trying TCP")
+
+    def _run_tcp(
+        self,
+        selector: selectors.BaseSelector,
+        results: Dict[str, ProbeResult],
+        addresses: Dict[str, Tuple[int, tuple]],
+        targets: List[str],
+        deadline: float
+    ) -> None:
+        for target in targets:
+            results[target].method = "tcp"
+            for port in self.tcp_ports:
+                self._start_connect(selector, target, addresses[target], port)
+
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            for key, _ in selector.select(remaining):
+                sock = key.fileobj
+                target, port, started = key.data
+                result = results[target]
+                if result.ok:
+                    # already closed by _drop_target earlier in this batch
+                    continue
+
+                selector.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                self._close(sock)
+
+                if err in self._reachable_errnos:
+                    result.ok = True
+                    result.rtt_ms = (time.monotonic() - started) * 1000
+                    result.port = port
+                    self._drop_target(selector, target)
+
+    def _start_connect(
+        self,
+        selector: selectors.BaseSelector,
+        target: str,
+        address: Tuple[int, tuple],
+        port: int
+    ) -> None:
+        family, sockaddr = address
+        sockaddr = (sockaddr[0], port) + tuple(sockaddr[2:])
+
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        started = time.monotonic()
+        err = sock.connect_ex(sockaddr)
+        if err not in self._reachable_errnos and err not in (
+            errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN
+        ):
+            logger.debug(f"TCP probe {target}:{port} failed immediately with code {err}")
+            self._close(sock)
+            return
+        selector.register(sock, selectors.EVENT_WRITE, (target, port, started))
+
+    def _drop_target(self, selector: selectors.BaseSelector, target: str) -> None:
+        """Cancel the other in-flight port probes of a target that already answered."""
+        for key in list(selector.get_map().values()):
+            if key.data[0] == target:
+                selector.unregister(key.fileobj)
+                self._close(key.fileobj)
+
+    def _build_echo(self, seq: int) -> bytes:
+        payload = b"networkfixer"
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, self._ident, seq)
+        checksum = self._checksum(header + payload)
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, self._ident, seq)
+        return header + payload
+
+    @staticmethod
+    def _parse_reply(packet: bytes) -> Optional[int]:
+        # Some platforms (macOS) deliver the IP header on datagram ICMP sockets
+        if len(packet) >= 20 and packet[0] >> 4 == 4:
+            packet = packet[(packet[0] & 0x0F) * 4:]
+        if len(packet) < 8:
+            return None
+        icmp_type, _, _, _, seq = struct.unpack("!BBHHH", packet[:8])
+        if icmp_type != ICMP_ECHO_REPLY:
+            return None
+        return seq
+
+    @staticmethod
+    def _checksum(data: bytes) -> int:
+        if len(data) % 2:
+            data += b"\x00"
+        total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+        total = (total >> 16) + (total & 0xFFFF)
+        total += total >> 16
+        return ~total & 0xFFFF
+
+    @staticmethod
+    def _close(sock) -> None:
+        try:
+            sock.close()
+        except Exception:
+            pass
+
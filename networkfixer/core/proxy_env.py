@@ -6,13 +6,20 @@ after proxy software is closed.
 """
 
 import os
+import errno
 import socket
-import winreg
+import selectors
+import threading
+import time
 import logging
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict, Iterable, Set
+from collections import OrderedDict
+from concurrent.futures import Future
 from urllib.parse import urlparse
 from dataclasses import dataclass
 
+from .pool import submit_daemon
+from .registry import RegistryBackend, get_registry, HKCU, HKLM
 from ..models.result import StepResult
 
 logger = logging.getLogger(__name__)
@@ -33,15 +40,30 @@ class ProxyEnvScanner:
     PROXY_VAR_NAMES = [
         "http_proxy", "HTTP_PROXY",
         "https_proxy", "HTTPS_PROXY",
+        "ftp_proxy", "FTP_PROXY",
         "all_proxy", "ALL_PROXY",
     ]
 
+    # Reported by the scan but never health-checked: they hold host lists, not endpoints
+    BYPASS_VAR_NAMES = [
+        "no_proxy", "NO_PROXY",
+    ]
+
     REGISTRY_USER_PATH = r"Environment"
     REGISTRY_MACHINE_PATH = r"SYSTEM\CurrentControlSet\Control\Session Manager\Environment"
 
-    def __init__(self):
+    _PROXY_NAMES_LOWER = frozenset(n.lower() for n in PROXY_VAR_NAMES)
+    _TRACKED_NAMES_LOWER = _PROXY_NAMES_LOWER | frozenset(n.lower() for n in BYPASS_VAR_NAMES)
+
+    def __init__(self, registry: Optional[RegistryBackend] = None):
+        self.registry = registry or get_registry()
         self.detected_proxies: List[ProxyEnvInfo] = []
 
+    @classmethod
+    def is_proxy_var(cls, name: str) -> bool:
+        """True for variables holding a proxy endpoint (as opposed to no_proxy lists)."""
+        return name.lower() in cls._PROXY_NAMES_LOWER
+
     def scan_all(self) -> List[ProxyEnvInfo]:
         """
         Scan all proxy environment variables across Process, User, and Machine levels.
@@ -65,69 +87,126 @@ class ProxyEnvScanner:
 
     def _scan_process_env(self) -> None:
         """Scan process-level environment variables."""
-        for var_name in self.PROXY_VAR_NAMES:
-            value = os.environ.get(var_name)
-            if value:
-                logger.debug(f"Found process-level proxy: {var_name}={value}")
-                self.detected_proxies.append(ProxyEnvInfo(
-                    name=var_name,
-                    value=value,
-                    scope="Process"
-                ))
+        self._collect(os.environ.items(), "Process")
 
     def _scan_user_env(self) -> None:
         """Scan user-level environment variables from registry."""
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                self.REGISTRY_USER_PATH,
-                0,
-                winreg.KEY_READ
-            ) as key:
-                self._read_registry_vars(key, "User")
+            values = self.registry.read_values(HKCU, self.REGISTRY_USER_PATH)
+            self._collect(values.items(), "User")
         except Exception as e:
             logger.debug(f"Failed to read user environment variables: {e}")
 
     def _scan_machine_env(self) -> None:
         """Scan machine-level environment variables from registry."""
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                self.REGISTRY_MACHINE_PATH,
-                0,
-                winreg.KEY_READ
-            ) as key:
-                self._read_registry_vars(key, "Machine")
+            values = self.registry.read_values(HKLM, self.REGISTRY_MACHINE_PATH)
+            self._collect(values.items(), "Machine")
         except PermissionError:
             logger.debug("No permission to read machine environment variables (expected if not admin)")
         except Exception as e:
             logger.debug(f"Failed to read machine environment variables: {e}")
 
-    def _read_registry_vars(self, key, scope: str) -> None:
-        """Read proxy variables from a registry key."""
-        for var_name in self.PROXY_VAR_NAMES:
-            try:
-                value, _ = winreg.QueryValueEx(key, var_name)
-                if value:
-                    logger.debug(f"Found {scope}-level proxy: {var_name}={value}")
-                    self.detected_proxies.append(ProxyEnvInfo(
-                        name=var_name,
-                        value=value,
-                        scope=scope
-                    ))
-            except FileNotFoundError:
-                pass
-            except Exception as e:
-                logger.debug(f"Error reading {var_name} from {scope}: {e}")
+    def _collect(self, items: Iterable[Tuple[str, object]], scope: str) -> None:
+        """Match proxy variable names case-insensitively in a single pass."""
+        for var_name, value in items:
+            if var_name.lower() not in self._TRACKED_NAMES_LOWER:
+                continue
+            if value and isinstance(value, str):
+                logger.debug(f"Found {scope}-level proxy: {var_name}={value}")
+                self.detected_proxies.append(ProxyEnvInfo(
+                    name=var_name,
+                    value=value,
+                    scope=scope
+                ))
+
+
+class ProxyHealthCache:
+    """Thread-safe LRU cache of endpoint health verdicts.
+
+    Alive and dead verdicts expire separately, so a dead proxy that comes
+    back is noticed sooner than a live one is re-checked. ``clock`` returns
+    seconds and defaults to time.monotonic.
+    """
+
+    def __init__(
+        self,
+        positive_ttl: float = 30.0,
+        negative_ttl: float = 10.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[bool, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, endpoint: Tuple[str, int]) -> Optional[bool]:
+        """
+        Look up a cached verdict.
+
+        Args:
+            endpoint: Normalized (host, port)
+
+        Returns:
+            Cached alive/dead verdict, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is not None:
+                alive, expires_at = entry
+                if self.clock() < expires_at:
+                    self._entries.move_to_end(endpoint)
+                    self.hits += 1
+                    return alive
+                del self._entries[endpoint]
+
+            self.misses += 1
+            return None
+
+    def put(self, endpoint: Tuple[str, int], alive: bool) -> None:
+        ttl = self.positive_ttl if alive else self.negative_ttl
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[endpoint] = (alive, self.clock() + ttl)
+            self._entries.move_to_end(endpoint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: Optional[Tuple[str, int]] = None) -> None:
+        """
+        Drop one endpoint, or every entry if endpoint is None.
+
+        Args:
+            endpoint: Normalized (host, port) to forget
+        """
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(endpoint, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for instrumentation."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
 
 
 class ProxyHealthChecker:
     """TCP-based health checker for proxy endpoints."""
 
     DEFAULT_TIMEOUT = 2.0  # seconds
+    LOOKUP_POLL_INTERVAL = 0.02  # seconds between checks for finished lookups
 
-    def __init__(self, timeout: float = DEFAULT_TIMEOUT):
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, cache: Optional[ProxyHealthCache] = None):
         self.timeout = timeout
+        self.cache = cache
 
     def check_proxy(self, proxy_url: str) -> bool:
         """
@@ -139,15 +218,78 @@ class ProxyHealthChecker:
         Returns:
             True if proxy is responding, False otherwise
         """
+        endpoint = self.parse_endpoint(proxy_url)
+        if endpoint is None:
+            return False
+
+        if self.cache is not None:
+            alive = self.cache.get(endpoint)
+            if alive is not None:
+                return alive
+
+        alive = self._tcp_ping(*endpoint)
+        if self.cache is not None:
+            self.cache.put(endpoint, alive)
+        return alive
+
+    def check_many(self, proxy_urls: Iterable[str]) -> Dict[str, bool]:
+        """
+        Check many proxy URLs at once.
+
+        URLs are deduplicated by normalized (host, port) and every distinct
+        endpoint is probed concurrently. Lookups of host names and the
+        connects share one timeout; names that do not resolve in time count
+        as dead.
+
+        Args:
+            proxy_urls: Proxy URLs (duplicates allowed)
+
+        Returns:
+            Mapping of each given URL to True if its endpoint is responding
+        """
+        endpoints = {url: self.parse_endpoint(url) for url in proxy_urls}
+
+        alive: Dict[Tuple[str, int], bool] = {}
+        to_probe = set()
+        for endpoint in set(endpoints.values()):
+            if endpoint is None:
+                continue
+            cached = self.cache.get(endpoint) if self.cache is not None else None
+            if cached is None:
+                to_probe.add(endpoint)
+            else:
+                alive[endpoint] = cached
+
+        probed = self._tcp_ping_many(to_probe) if to_probe else {}
+        if self.cache is not None:
+            for endpoint, verdict in probed.items():
+                self.cache.put(endpoint, verdict)
+        alive.update(probed)
+
+        return {url: alive.get(endpoint, False) for url, endpoint in endpoints.items()}
+
+    @staticmethod
+    def parse_endpoint(proxy_url: str) -> Optional[Tuple[str, int]]:
+        """
+        Normalize a proxy URL to a (host, port) pair.
+
+        Args:
+            proxy_url: Proxy URL, with or without scheme (e.g., "127.0.0.1:7890")
+
+        Returns:
+            (lowercased host, port), or None if the URL cannot be parsed
+        """
         try:
-            parsed = urlparse(proxy_url)
-            host = parsed.hostname or "127.0.0.1"
+            value = proxy_url.strip()
+            if "://" not in value:
+                value = "http://" + value
+            parsed = urlparse(value)
+            host = (parsed.hostname or "127.0.0.1").lower()
             port = parsed.port or 8080
-
-            return self._tcp_ping(host, port)
+            return host, port
         except Exception as e:
-            logger.debug(f"Failed to parse/check proxy URL {proxy_url}: {e}")
-            return False
+            logger.debug(f"Failed to parse proxy URL {proxy_url}: {e}")
+            return None
 
     def _tcp_ping(self, host: str, port: int) -> bool:
         """
@@ -186,12 +328,139 @@ class ProxyHealthChecker:
                     pass
 
 
+    def _tcp_ping_many(self, endpoints: Set[Tuple[str, int]]) -> Dict[Tuple[str, int], bool]:
+        """
+        Connect to all endpoints concurrently with non-blocking sockets.
+
+        Name lookups and connects share one deadline, ``timeout`` from the
+        start: IP literals are connected to at once, names as soon as their
+        lookup finishes. Endpoints still unresolved at the deadline are dead.
+
+        Args:
+            endpoints: Distinct (host, port) pairs
+
+        Returns:
+            Mapping of endpoint to True if the connection succeeded
+        """
+        results = {endpoint: False for endpoint in endpoints}
+        deadline = time.monotonic() + self.timeout
+        addresses, lookups = self._resolve_many(endpoints)
+        selector = selectors.DefaultSelector()
+
+        try:
+            for endpoint, address in addresses.items():
+                self._start_connect(selector, endpoint, address)
+
+            while lookups or selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                for endpoint, future in list(lookups.items()):
+                    if future.done():
+                        del lookups[endpoint]
+                        try:
+                            self._start_connect(selector, endpoint, future.result())
+                        except Exception as e:
+                            logger.debug(f"Cannot resolve {endpoint[0]}:{endpoint[1]}: {e}")
+
+                wait = min(remaining, self.LOOKUP_POLL_INTERVAL) if lookups else remaining
+                if not selector.get_map():
+                    # select() with nothing registered fails on Windows
+                    time.sleep(wait)
+                    continue
+
+                for key, _ in selector.select(wait):
+                    sock = key.fileobj
+                    selector.unregister(sock)
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    sock.close()
+
+                    results[key.data] = err == 0
+                    logger.debug(f"TCP connection to {key.data[0]}:{key.data[1]} "
+                                 f"{'succeeded' if err == 0 else f'failed with code {err}'}")
+        finally:
+            for host, port in lookups:
+                logger.debug(f"Lookup of {host} for port {port} timed out")
+            for key in list(selector.get_map().values()):
+                logger.debug(f"TCP connection to {key.data[0]}:{key.data[1]} timed out")
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+            selector.close()
+
+        return results
+
+    @staticmethod
+    def _start_connect(
+        selector: selectors.BaseSelector,
+        endpoint: Tuple[str, int],
+        address: Tuple[int, tuple]
+    ) -> None:
+        host, port = endpoint
+        family, sockaddr = address
+        sock = None
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex(sockaddr)
+            if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                logger.debug(f"TCP connection to {host}:{port} failed with code {err}")
+                sock.close()
+                return
+            selector.register(sock, selectors.EVENT_WRITE, endpoint)
+        except Exception as e:
+            logger.debug(f"TCP connection to {host}:{port} error: {e}")
+            if sock:
+                sock.close()
+
+    @staticmethod
+    def _resolve_many(
+        endpoints: Set[Tuple[str, int]]
+    ) -> Tuple[Dict[Tuple[str, int], Tuple[int, tuple]], Dict[Tuple[str, int], Future]]:
+        """
+        Start resolving endpoints without waiting for names.
+
+        IP literals resolve immediately; names are looked up on daemon threads,
+        since a stuck getaddrinfo call cannot be cancelled.
+
+        Returns:
+            Tuple of (endpoint -> (family, sockaddr) for resolved endpoints,
+            endpoint -> Future of the same for names still being looked up)
+        """
+
+        def lookup(host: str, port: int, flags: int = 0) -> Tuple[int, tuple]:
+            family, _, _, _, sockaddr = socket.getaddrinfo(
+                host, port, type=socket.SOCK_STREAM, flags=flags
+            )[0]
+            return family, sockaddr
+
+        addresses: Dict[Tuple[str, int], Tuple[int, tuple]] = {}
+        lookups: Dict[Tuple[str, int], Future] = {}
+        for host, port in endpoints:
+            try:
+                addresses[(host, port)] = lookup(host, port, socket.AI_NUMERICHOST)
+            except socket.gaierror:
+                lookups[(host, port)] = submit_daemon(lookup, host, port)
+            except OSError as e:
+                logger.debug(f"Cannot resolve {host}:{port}: {e}")
+        return addresses, lookups
+
+
 class ProxyGhostKiller:
     """Main class for detecting and removing ghost proxy configurations."""
 
-    def __init__(self, health_check_timeout: float = 2.0):
-        self.scanner = ProxyEnvScanner()
-        self.health_checker = ProxyHealthChecker(timeout=health_check_timeout)
+    def __init__(
+        self,
+        health_check_timeout: float = 2.0,
+        health_cache: Optional[ProxyHealthCache] = None,
+        registry: Optional[RegistryBackend] = None
+    ):
+        self.registry = registry or get_registry()
+        self.scanner = ProxyEnvScanner(self.registry)
+        self.health_checker = ProxyHealthChecker(
+            timeout=health_check_timeout,
+            cache=health_cache
+        )
 
     def scan_and_test(self) -> Tuple[List[ProxyEnvInfo], List[ProxyEnvInfo]]:
         """
@@ -200,16 +469,19 @@ class ProxyGhostKiller:
         Returns:
             Tuple of (healthy_proxies, dead_proxies)
         """
-        proxies = self.scanner.scan_all()
+        proxies = [p for p in self.scanner.scan_all() if self.scanner.is_proxy_var(p.name)]
 
-        # Test health for each detected proxy
+        # Test health once per distinct endpoint, all endpoints concurrently
+        alive = self.health_checker.check_many(p.value for p in proxies)
         for proxy in proxies:
-            proxy.is_alive = self.health_checker.check_proxy(proxy.value)
+            proxy.is_alive = alive[proxy.value]
 
         healthy = [p for p in proxies if p.is_alive]
         dead = [p for p in proxies if p.is_alive is False]
 
         logger.info(f"Health check complete: {len(healthy)} healthy, {len(dead)} dead proxies")
+        if self.health_checker.cache is not None:
+            logger.debug(f"Proxy health cache: {self.health_checker.cache.stats()}")
         return healthy, dead
 
     def clear_process_env(self, var_names: Optional[List[str]] = None) -> StepResult:
@@ -261,23 +533,10 @@ class ProxyGhostKiller:
         if var_names is None:
             var_names = ProxyEnvScanner.PROXY_VAR_NAMES
 
-        cleared = []
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                ProxyEnvScanner.REGISTRY_USER_PATH,
-                0,
-                winreg.KEY_WRITE
-            ) as key:
-                for var_name in var_names:
-                    try:
-                        winreg.DeleteValue(key, var_name)
-                        cleared.append(var_name)
-                        logger.info(f"Deleted user environment variable: {var_name}")
-                    except FileNotFoundError:
-                        pass  # Variable doesn't exist, no action needed
-                    except Exception as e:
-                        logger.warning(f"Failed to delete user variable {var_name}: {e}")
+            cleared = self.registry.delete_values(HKCU, ProxyEnvScanner.REGISTRY_USER_PATH, var_names)
+            for var_name in cleared:
+                logger.info(f"Deleted user environment variable: {var_name}")
 
             if cleared:
                 return StepResult(
@@ -314,23 +573,10 @@ class ProxyGhostKiller:
         if var_names is None:
             var_names = ProxyEnvScanner.PROXY_VAR_NAMES
 
-        cleared = []
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                ProxyEnvScanner.REGISTRY_MACHINE_PATH,
-                0,
-                winreg.KEY_WRITE
-            ) as key:
-                for var_name in var_names:
-                    try:
-                        winreg.DeleteValue(key, var_name)
-                        cleared.append(var_name)
-                        logger.info(f"Deleted machine environment variable: {var_name}")
-                    except FileNotFoundError:
-                        pass  # Variable doesn't exist
-                    except Exception as e:
-                        logger.warning(f"Failed to delete machine variable {var_name}: {e}")
+            cleared = self.registry.delete_values(HKLM, ProxyEnvScanner.REGISTRY_MACHINE_PATH, var_names)
+            for var_name in cleared:
+                logger.info(f"Deleted machine environment variable: {var_name}")
 
             if cleared:
                 return StepResult(
@@ -392,4 +638,11 @@ class ProxyGhostKiller:
         if machine_vars:
             results["machine"] = self.clear_machine_env(machine_vars)
 
+        # Verdicts were taken before the fix; re-check on the next scan
+        self.invalidate_health()
         return results
+
+    def invalidate_health(self) -> None:
+        """Forget cached endpoint verdicts, e.g. after proxy settings changed."""
+        if self.health_checker.cache is not None:
+            self.health_checker.cache.invalidate()
@@ -1,34 +1,165 @@
-import winreg
 import logging
-from typing import Tuple
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import winreg
+except ImportError:  # non-Windows: only the in-memory backend is usable
+    winreg = None
 
 from ..models.result import StepResult
 
 logger = logging.getLogger(__name__)
 
+HKCU = "HKEY_CURRENT_USER"
+HKLM = "HKEY_LOCAL_MACHINE"
 
-class ProxyRegistry:
-    REGISTRY_PATH = r"Software\Microsoft\Windows\CurrentVersion\Internet Settings"
+REG_SZ = "REG_SZ"
+REG_DWORD = "REG_DWORD"
 
-    def get_status(self) -> Tuple[bool, str]:
-        try:
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                self.REGISTRY_PATH,
-                0,
-                winreg.KEY_READ
-            ) as key:
+
+class RegistryBackend(ABC):
+    """Minimal registry interface used by the core components.
+
+    Each call opens the key once. Missing keys raise FileNotFoundError and
+    denied access raises PermissionError, as winreg does.
+    """
+
+    @abstractmethod
+    def read_values(self, hive: str, path: str) -> Dict[str, Any]:
+        """Return every value of a key, enumerated in one pass."""
+
+    @abstractmethod
+    def set_values(self, hive: str, path: str, values: Dict[str, Tuple[str, Any]]) -> None:
+        """Write values given as {name: (REG_SZ | REG_DWORD, data)}."""
+
+    @abstractmethod
+    def delete_values(self, hive: str, path: str, names: Iterable[str]) -> List[str]:
+        """Delete the named values and return the ones that existed."""
+
+
+class WinRegistryBackend(RegistryBackend):
+    """RegistryBackend on top of winreg."""
+
+    def read_values(self, hive: str, path: str) -> Dict[str, Any]:
+        values = {}
+        with winreg.OpenKey(self._hive(hive), path, 0, winreg.KEY_READ) as key:
+            _, value_count, _ = winreg.QueryInfoKey(key)
+            for i in range(value_count):
                 try:
-                    enable, _ = winreg.QueryValueEx(key, "ProxyEnable")
-                except FileNotFoundError:
-                    enable = 0
+                    name, data, _ = winreg.EnumValue(key, i)
+                except OSError:
+                    break
+                values[name] = data
+        return values
+
+    def set_values(self, hive: str, path: str, values: Dict[str, Tuple[str, Any]]) -> None:
+        types = {REG_SZ: winreg.REG_SZ, REG_DWORD: winreg.REG_DWORD}
+        with winreg.OpenKey(self._hive(hive), path, 0, winreg.KEY_WRITE) as key:
+            for name, (value_type, data) in values.items():
+                winreg.SetValueEx(key, name, 0, types[value_type], data)
 
+    def delete_values(self, hive: str, path: str, names: Iterable[str]) -> List[str]:
+        deleted = []
+        with winreg.OpenKey(self._hive(hive), path, 0, winreg.KEY_WRITE) as key:
+            for name in names:
                 try:
-                    server, _ = winreg.QueryValueEx(key, "ProxyServer")
+                    winreg.DeleteValue(key, name)
+                    deleted.append(name)
                 except FileNotFoundError:
-                    server = ""
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to delete registry value {name}: {e}")
+        return deleted
+
+    @staticmethod
+    def _hive(hive: str):
+        if winreg is None:
+            raise OSError("Windows registry is not available on this platform")
+        return getattr(winreg, hive)
+
+
+class InMemoryRegistry(RegistryBackend):
+    """Dict-backed registry for tests and non-Windows hosts.
+
+    Key paths and value names are case-insensitive like the real registry;
+    value names keep the case they were written with.
+    """
+
+    def __init__(self):
+        self._keys: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._denied: set = set()
 
-                return bool(enable), server
+    def add_key(self, hive: str, path: str, values: Optional[Dict[str, Any]] = None) -> None:
+        key = self._keys.setdefault((hive, path.lower()), {})
+        for name, data in (values or {}).items():
+            self._store(key, name, data)
+
+    def deny(self, hive: str, path: str) -> None:
+        """Make every access to a key raise PermissionError."""
+        self._denied.add((hive, path.lower()))
+
+    def read_values(self, hive: str, path: str) -> Dict[str, Any]:
+        return dict(self._key(hive, path))
+
+    def set_values(self, hive: str, path: str, values: Dict[str, Tuple[str, Any]]) -> None:
+        key = self._key(hive, path)
+        for name, (_, data) in values.items():
+            self._store(key, name, data)
+
+    def delete_values(self, hive: str, path: str, names: Iterable[str]) -> List[str]:
+        key = self._key(hive, path)
+        deleted = []
+        for name in names:
+            existing = self._find(key, name)
+            if existing is not None:
+                del key[existing]
+                deleted.append(name)
+        return deleted
+
+    def _key(self, hive: str, path: str) -> Dict[str, Any]:
+        ident = (hive, path.lower())
+        if ident in self._denied:
+            raise PermissionError(f"Access denied: {hive}\\{path}")
+        if ident not in self._keys:
+            raise FileNotFoundError(f"Registry key not found: {hive}\\{path}")
+        return self._keys[ident]
+
+    def _store(self, key: Dict[str, Any], name: str, data: Any) -> None:
+        existing = self._find(key, name)
+        if existing is not None:
+            del key[existing]
+        key[name] = data
+
+    @staticmethod
+    def _find(key: Dict[str, Any], name: str) -> Optional[str]:
+        lowered = name.lower()
+        for existing in key:
+            if existing.lower() == lowered:
+                return existing
+        return None
+
+
+_backend: Optional[RegistryBackend] = None
+
+
+def get_registry() -> RegistryBackend:
+    global _backend
+    if _backend is None:
+        _backend = WinRegistryBackend()
+    return _backend
+
+
+class ProxyRegistry:
+    REGISTRY_PATH = r"Software\Microsoft\Windows\CurrentVersion\Internet Settings"
+
+    def __init__(self, registry: Optional[RegistryBackend] = None):
+        self.registry = registry or get_registry()
+
+    def get_status(self) -> Tuple[bool, str]:
+        try:
+            values = self.registry.read_values(HKCU, self.REGISTRY_PATH)
+            return bool(values.get("ProxyEnable", 0)), values.get("ProxyServer", "")
 
         except Exception as e:
             logger.error(f"Failed to get proxy status: {e}")
@@ -36,14 +167,10 @@ class ProxyRegistry:
 
     def disable(self) -> StepResult:
         try:
-            with winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                self.REGISTRY_PATH,
-                0,
-                winreg.KEY_WRITE
-            ) as key:
-                winreg.SetValueEx(key, "ProxyEnable", 0, winreg.REG_DWORD, 0)
-                winreg.SetValueEx(key, "ProxyServer", 0, winreg.REG_SZ, "")
+            self.registry.set_values(HKCU, self.REGISTRY_PATH, {
+                "ProxyEnable": (REG_DWORD, 0),
+                "ProxyServer": (REG_SZ, ""),
+            })
 
             logger.info("System proxy disabled")
             return StepResult(ok=True, title="disable_proxy")
@@ -0,0 +1,132 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Set, TYPE_CHECKING
+
+from ..models.result import StepResult
+
+if TYPE_CHECKING:
+    from .operations import Step
+
+logger = logging.getLogger(__name__)
+
+
+class StepScheduler:
+    """Runs steps as a DAG on a worker pool.
+
+    A step becomes ready once every step named in its ``depends_on`` has
+    finished (dependencies not present in the plan are ignored). Ready steps
+    are dispatched in plan order, skipping any that conflict with a running
+    step; ``exclusive`` steps never overlap with anything.
+    """
+
+    def __init__(self, max_workers: int = 3):
+        self.max_workers = max(1, max_workers)
+
+    def run(
+        self,
+        steps: List["Step"],
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        result_callback: Optional[Callable[["Step", StepResult], None]] = None
+    ) -> List[StepResult]:
+        total = len(steps)
+        names = {step.name for step in steps}
+        deps: Dict[int, Set[str]] = {
+            i: {d for d in step.depends_on if d in names and d != step.name}
+            for i, step in enumerate(steps)
+        }
+        self._check_acyclic(steps, deps)
+
+        pending = list(range(total))
+        running: Dict[Future, int] = {}
+        done_names: Set[str] = set()
+        results: Dict[int, StepResult] = {}
+        started = 0
+        cancelled = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if not cancelled and cancel_check and cancel_check():
+                    logger.info("Operation cancelled by user")
+                    cancelled = True
+
+                if not cancelled:
+                    for i in self._ready(steps, pending, running, deps, done_names):
+                        step = steps[i]
+                        started += 1
+                        if progress_callback:
+                            progress_callback(started, total, step.title_key)
+                        pending.remove(i)
+                        running[pool.submit(step.func)] = i
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = running.pop(future)
+                    step = steps[i]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.exception(f"Step {step.name} raised: {e}")
+                        result = StepResult(ok=False, title=step.name, output=str(e), error=e)
+
+                    results[i] = result
+                    done_names.add(step.name)
+                    logger.info(f"Step {len(results)}/{total}: {result}")
+                    if result_callback:
+                        result_callback(step, result)
+
+        return [results[i] for i in sorted(results)]
+
+    def _ready(
+        self,
+        steps: List["Step"],
+        pending: List[int],
+        running: Dict[Future, int],
+        deps: Dict[int, Set[str]],
+        done_names: Set[str]
+    ) -> List[int]:
+        running_steps = [steps[i] for i in running.values()]
+        if any(s.exclusive for s in running_steps):
+            return []
+
+        selected = []
+        slots = self.max_workers - len(running_steps)
+        for i in pending:
+            if slots <= 0:
+                break
+            step = steps[i]
+            if not deps[i] <= done_names:
+                continue
+
+            active = running_steps + [steps[j] for j in selected]
+            if step.exclusive:
+                if active:
+                    continue
+                return [i]
+            if any(self._conflicts(step, other) for other in active):
+                continue
+
+            selected.append(i)
+            slots -= 1
+
+        return selected
+
+    @staticmethod
+    def _conflicts(a: "Step", b: "Step") -> bool:
+        return b.exclusive or b.name in a.conflicts or a.name in b.conflicts
+
+    @staticmethod
+    def _check_acyclic(steps: List["Step"], deps: Dict[int, Set[str]]) -> None:
+        remaining = dict(deps)
+        resolved: Set[str] = set()
+        while remaining:
+            ready = [i for i, d in remaining.items() if d <= resolved]
+            if not ready:
+                cycle = sorted(steps[i].name for i in remaining)
+                raise ValueError(f"Step dependency cycle among: {', '.join(cycle)}")
+            for i in ready:
+                resolved.add(steps[i].name)
+                del remaining[i]
@@ -0,0 +1,283 @@
+"""
+Self-healing repair watchdog.
+
+Periodically tests connectivity and, once it stays degraded, walks a ladder
+of repair plans from the cheapest (clearing a dead proxy) to the most
+disruptive (resetting the TCP/IP stack). Each plan is re-verified before
+escalating, and repairs are rate limited with exponential backoff once the
+whole ladder has failed.
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, List, Optional
+
+from .operations import NetworkOperations, Step
+from ..models.result import StepResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RepairPlan:
+    """A named set of steps tried as one rung of the ladder."""
+    name: str
+    steps: List[Step]
+
+
+@dataclass
+class RepairAttempt:
+    """Outcome of applying one plan."""
+    plan: str
+    steps: List[str]
+    results: List[StepResult] = field(default_factory=list)
+    recovered: bool = False
+    started_at: float = 0.0
+    duration_ms: float = 0.0
+
+
+class RepairWatchdog:
+    """Background service that repairs connectivity without user action.
+
+    Plans, cheapest first:
+
+    * ``proxy``: clear dead process-level proxy variables and disable a
+      system proxy whose port is closed (skipped when neither applies)
+    * ``dns``: flush the DNS cache
+    * ``winsock``: reset Winsock and renew the IP address
+    * ``tcpip``: reset the TCP/IP stack
+    """
+
+    PLAN_ORDER = ("proxy", "dns", "winsock", "tcpip")
+
+    def __init__(
+        self,
+        operations: NetworkOperations,
+        check_interval_sec: float = 10.0,
+        failures_before_repair: int = 2,
+        min_repair_interval_sec: float = 30.0,
+        max_repairs_per_hour: int = 6,
+        backoff_initial_sec: float = 60.0,
+        backoff_max_sec: float = 900.0,
+        verify_delay_sec: float = 2.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            operations: Source of the connectivity test and repair steps
+            check_interval_sec: Delay between connectivity checks
+            failures_before_repair: Consecutive failed checks before repairing
+            min_repair_interval_sec: Minimum delay between two repairs
+            max_repairs_per_hour: Repairs allowed in any sliding hour
+            backoff_initial_sec: Pause after the whole ladder failed once
+            backoff_max_sec: Upper bound for the doubling pause
+            verify_delay_sec: Settle time before re-testing after a repair
+            clock: Monotonic time source for rate limiting and backoff
+        """
+        self.operations = operations
+        self.check_interval_sec = check_interval_sec
+        self.failures_before_repair = failures_before_repair
+        self.min_repair_interval_sec = min_repair_interval_sec
+        self.max_repairs_per_hour = max_repairs_per_hour
+        self.backoff_initial_sec = backoff_initial_sec
+        self.backoff_max_sec = backoff_max_sec
+        self.verify_delay_sec = verify_delay_sec
+        self.clock = clock
+
+        self._level = 0
+        self._failed_checks = 0
+        self._backoff = backoff_initial_sec
+        self._paused_until = 0.0
+        self._repair_times: Deque[float] = deque()
+        self.history: Deque[RepairAttempt] = deque(maxlen=50)
+
+        self._subscribers: List[Callable[[RepairAttempt], None]] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, operations: NetworkOperations) -> "RepairWatchdog":
+        config = operations.config
+        return cls(
+            operations,
+            check_interval_sec=config.watchdog_check_interval_sec,
+            failures_before_repair=config.watchdog_failures_before_repair,
+            min_repair_interval_sec=config.watchdog_min_repair_interval_sec,
+            max_repairs_per_hour=config.watchdog_max_repairs_per_hour,
+            backoff_initial_sec=config.watchdog_backoff_initial_sec,
+            backoff_max_sec=config.watchdog_backoff_max_sec,
+            verify_delay_sec=config.watchdog_verify_delay_sec
+        )
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, callback: Callable[[RepairAttempt], None]) -> Callable[[], None]:
+        """
+        Register a callback for each repair attempt (called on the watchdog thread).
+
+        Returns:
+            A function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="repair-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def check_once(self) -> Optional[RepairAttempt]:
+        """
+        Run one check and, if warranted and allowed, one repair plan.
+
+        Returns:
+            The attempt made, or None if no repair was needed or allowed
+        """
+        if self.operations.test_connectivity(fast=True).all_ok:
+            self._on_healthy()
+            return None
+
+        self._failed_checks += 1
+        if self._failed_checks < self.failures_before_repair:
+            logger.info(f"Connectivity degraded ({self._failed_checks}/{self.failures_before_repair})")
+            return None
+
+        now = self.clock()
+        if not self._repair_allowed(now):
+            return None
+
+        plan = self._next_plan()
+        if plan is None:
+            # Every rung failed: start over from the cheapest after a pause
+            logger.warning(f"All repair plans failed, backing off {self._backoff:.0f}s")
+            self._paused_until = now + self._backoff
+            self._backoff = min(self._backoff * 2, self.backoff_max_sec)
+            self._level = 0
+            return None
+
+        attempt = self._apply(plan)
+        if attempt.recovered:
+            self._on_healthy()
+        else:
+            self._level = self.PLAN_ORDER.index(plan.name) + 1
+        return attempt
+
+    def build_plan(self, name: str) -> Optional[RepairPlan]:
+        """Steps for a plan, or None if the plan does not apply right now."""
+        ops = self.operations
+
+        if name == "proxy":
+            return self._build_proxy_plan()
+        if name == "dns":
+            return RepairPlan(name, ops.build_steps(False, True, False, False, False, False))
+        if name == "winsock":
+            return RepairPlan(name, ops.build_steps(False, False, True, True, False, False))
+        if name == "tcpip":
+            return RepairPlan(name, ops.build_steps(False, False, False, False, True, False))
+        raise ValueError(f"Unknown repair plan: {name}")
+
+    def _build_proxy_plan(self) -> Optional[RepairPlan]:
+        ops = self.operations
+        steps = []
+
+        _, dead = ops.scan_proxy_env()
+        dead_process_vars = [p.name for p in dead if p.scope == "Process"]
+        if dead_process_vars:
+            steps.append(Step(
+                "step.clear_proxy_env",
+                lambda: ops.clear_process_proxy_env(dead_process_vars)
+            ))
+
+        enabled, server = ops.get_proxy_status()
+        if enabled and server and not ops.proxy_ghost_killer.health_checker.check_proxy(server):
+            steps.extend(ops.build_steps(True, False, False, False, False, False))
+
+        return RepairPlan("proxy", steps) if steps else None
+
+    def _next_plan(self) -> Optional[RepairPlan]:
+        for name in self.PLAN_ORDER[self._level:]:
+            plan = self.build_plan(name)
+            if plan is not None:
+                return plan
+        return None
+
+    def _apply(self, plan: RepairPlan) -> RepairAttempt:
+        logger.info(f"Applying repair plan '{plan.name}': {[s.name for s in plan.steps]}")
+        attempt = RepairAttempt(
+            plan=plan.name,
+            steps=[step.name for step in plan.steps],
+            started_at=time.time()
+        )
+        start = self.clock()
+        self._repair_times.append(start)
+
+        attempt.results = self.operations.execute_steps(
+            plan.steps,
+            cancel_check=self._stop_event.is_set
+        )
+
+        if not self._stop_event.wait(self.verify_delay_sec):
+            attempt.recovered = self.operations.test_connectivity().all_ok
+        attempt.duration_ms = (self.clock() - start) * 1000
+
+        logger.info(f"Repair plan '{plan.name}' {'recovered' if attempt.recovered else 'did not recover'} connectivity")
+        self.history.append(attempt)
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(attempt)
+            except Exception as e:
+                logger.error(f"Watchdog subscriber failed: {e}")
+        return attempt
+
+    def _repair_allowed(self, now: float) -> bool:
+        if now < self._paused_until:
+            return False
+
+        while self._repair_times and now - self._repair_times[0] >= 3600:
+            self._repair_times.popleft()
+        if len(self._repair_times) >= self.max_repairs_per_hour:
+            logger.debug("Repair rate limit reached")
+            return False
+
+        if self._repair_times and now - self._repair_times[-1] < self.min_repair_interval_sec:
+            return False
+        return True
+
+    def _on_healthy(self) -> None:
+        self._failed_checks = 0
+        self._level = 0
+        self._backoff = self.backoff_initial_sec
+        self._paused_until = 0.0
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.check_once()
+            except Exception as e:
+                logger.error(f"Watchdog check failed: {e}")
+            self._stop_event.wait(self.check_interval_sec)
@@ -0,0 +1,296 @@
+"""
+Proxy state watcher.
+
+Keeps an in-memory snapshot of the system proxy (Internet Settings) and the
+proxy environment variables, re-reading them only when a change source says
+something may have changed, and pushes diffs to subscribers.
+"""
+
+import sys
+import threading
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from .registry import ProxyRegistry, RegistryBackend, get_registry, HKCU, HKLM
+from .proxy_env import ProxyEnvScanner
+
+logger = logging.getLogger(__name__)
+
+EnvEntry = Tuple[str, str, str]  # (scope, name, value)
+
+
+@dataclass(frozen=True)
+class ProxyState:
+    """Immutable snapshot of proxy configuration."""
+    system_enabled: bool = False
+    system_server: str = ""
+    env: Tuple[EnvEntry, ...] = ()
+
+
+@dataclass(frozen=True)
+class ProxyStateChange:
+    """Difference between two snapshots."""
+    old: ProxyState
+    new: ProxyState
+    system_changed: bool
+    env_added: Tuple[EnvEntry, ...]
+    env_removed: Tuple[EnvEntry, ...]
+
+    @classmethod
+    def between(cls, old: ProxyState, new: ProxyState) -> "ProxyStateChange":
+        old_env, new_env = set(old.env), set(new.env)
+        return cls(
+            old=old,
+            new=new,
+            system_changed=(old.system_enabled, old.system_server)
+            != (new.system_enabled, new.system_server),
+            env_added=tuple(e for e in new.env if e not in old_env),
+            env_removed=tuple(e for e in old.env if e not in new_env),
+        )
+
+
+class ChangeSource(ABC):
+    """Tells the watcher when proxy state may have changed."""
+
+    @abstractmethod
+    def wait(self, stop_event: threading.Event) -> None:
+        """Block until state should be re-read or stop_event is set."""
+
+    def feedback(self, changed: bool) -> None:
+        """Report whether the last re-read found a change."""
+
+    def close(self) -> None:
+        pass
+
+
+class PollingChangeSource(ChangeSource):
+    """Re-reads on a timer that backs off exponentially while nothing changes."""
+
+    def __init__(self, min_interval: float = 1.0, max_interval: float = 30.0, factor: float = 2.0):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.factor = factor
+        self.interval = min_interval
+
+    def wait(self, stop_event: threading.Event) -> None:
+        stop_event.wait(self.interval)
+
+    def feedback(self, changed: bool) -> None:
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.factor, self.max_interval)
+
+
+class RegistryChangeSource(ChangeSource):
+    """Wakes on RegNotifyChangeKeyValue for the watched registry keys (Windows only).
+
+    Process-level variables have no notification, so a re-read is also
+    forced every ``fallback_interval`` seconds.
+    """
+
+    KEY_NOTIFY = 0x0010
+    REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+    WAIT_TIMEOUT = 0x00000102
+    STOP_POLL_MS = 500
+
+    def __init__(self, keys: List[Tuple[str, str]], fallback_interval: float = 30.0):
+        import ctypes
+        import winreg
+
+        self._ctypes = ctypes
+        self._advapi32 = ctypes.windll.advapi32
+        self._kernel32 = ctypes.windll.kernel32
+        self._kernel32.CreateEventW.restype = ctypes.c_void_p
+        self._kernel32.CloseHandle.argtypes = [ctypes.c_void_p]
+        self._advapi32.RegNotifyChangeKeyValue.argtypes = [
+            ctypes.c_void_p, ctypes.c_int, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_int
+        ]
+        self.fallback_interval = fallback_interval
+        self._watches = []
+
+        for hive, path in keys:
+            try:
+                key = winreg.OpenKey(getattr(winreg, hive), path, 0, self.KEY_NOTIFY)
+            except OSError as e:
+                logger.debug(f"Cannot watch {hive}\\{path}: {e}")
+                continue
+            event = self._kernel32.CreateEventW(None, False, False, None)
+            self._watches.append((key, event))
+            self._arm(key, event)
+
+        if not self._watches:
+            raise OSError("No registry keys could be watched")
+
+    def wait(self, stop_event: threading.Event) -> None:
+        count = len(self._watches)
+        handles = (self._ctypes.c_void_p * count)(*(event for _, event in self._watches))
+        waited = 0.0
+
+        while not stop_event.is_set() and waited < self.fallback_interval:
+            index = self._kernel32.WaitForMultipleObjects(count, handles, False, self.STOP_POLL_MS)
+            if index == self.WAIT_TIMEOUT:
+                waited += self.STOP_POLL_MS / 1000
+                continue
+            if 0 <= index < count:
+                self._arm(*self._watches[index])
+            else:
+                # WAIT_FAILED: avoid spinning, fall back to timed re-reads
+                stop_event.wait(self.fallback_interval)
+            return
+
+    def close(self) -> None:
+        for key, event in self._watches:
+            try:
+                key.Close()
+                self._kernel32.CloseHandle(event)
+            except Exception:
+                pass
+        self._watches = []
+
+    def _arm(self, key, event) -> None:
+        self._advapi32.RegNotifyChangeKeyValue(
+            key.handle, False, self.REG_NOTIFY_CHANGE_LAST_SET, event, True
+        )
+
+
+class ProxyWatcher:
+    """Background service keeping an O(1)-readable proxy state snapshot."""
+
+    WATCHED_KEYS = [
+        (HKCU, ProxyRegistry.REGISTRY_PATH),
+        (HKCU, ProxyEnvScanner.REGISTRY_USER_PATH),
+        (HKLM, ProxyEnvScanner.REGISTRY_MACHINE_PATH),
+    ]
+
+    def __init__(
+        self,
+        registry: Optional[RegistryBackend] = None,
+        source: Optional[ChangeSource] = None,
+        poll_min_interval: float = 1.0,
+        poll_max_interval: float = 30.0
+    ):
+        self.registry = registry or get_registry()
+        self.proxy_registry = ProxyRegistry(self.registry)
+        self.scanner = ProxyEnvScanner(self.registry)
+        self._source = source
+        self._poll_min_interval = poll_min_interval
+        self._poll_max_interval = poll_max_interval
+
+        self._state: Optional[ProxyState] = None
+        self._subscribers: List[Callable[[ProxyStateChange], None]] = []
+        self._lock = threading.Lock()
+        # Serializes read, compare and swap, so an older read can never replace
+        # a newer one; reentrant so a subscriber may call refresh() itself
+        self._refresh_lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def state(self) -> Optional[ProxyState]:
+        """Latest snapshot, or None before the first read."""
+        return self._state
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, callback: Callable[[ProxyStateChange], None]) -> Callable[[], None]:
+        """
+        Register a callback for state changes.
+
+        Called on the thread that ran refresh() (usually the watcher thread),
+        in order, while later refreshes wait; callbacks should be quick.
+
+        Returns:
+            A function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self.refresh()
+        if self._source is None:
+            self._source = self._create_source()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="proxy-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def refresh(self) -> bool:
+        """
+        Re-read proxy state now (e.g. after changing process variables ourselves).
+
+        Safe to call from any thread; concurrent refreshes run one at a time
+        and subscribers see their changes in order.
+
+        Returns:
+            True if the state changed
+        """
+        with self._refresh_lock:
+            new_state = self._read_state()
+
+            with self._lock:
+                old_state, self._state = self._state, new_state
+                subscribers = list(self._subscribers)
+
+            if old_state is None or old_state == new_state:
+                return False
+
+            change = ProxyStateChange.between(old_state, new_state)
+            logger.info(
+                f"Proxy state changed: system={change.system_changed}, "
+                f"env +{len(change.env_added)}/-{len(change.env_removed)}"
+            )
+            for callback in subscribers:
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.error(f"Proxy watcher subscriber failed: {e}")
+            return True
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._source.wait(self._stop_event)
+            if self._stop_event.is_set():
+                break
+            try:
+                changed = self.refresh()
+            except Exception as e:
+                logger.error(f"Proxy watcher refresh failed: {e}")
+                changed = False
+            self._source.feedback(changed)
+
+    def _read_state(self) -> ProxyState:
+        enabled, server = self.proxy_registry.get_status()
+        env = tuple((p.scope, p.name, p.value) for p in self.scanner.scan_all())
+        return ProxyState(system_enabled=enabled, system_server=server, env=env)
+
+    def _create_source(self) -> ChangeSource:
+        if sys.platform == "win32":
+            try:
+                return RegistryChangeSource(self.WATCHED_KEYS, self._poll_max_interval)
+            except Exception as e:
+                logger.debug(f"Registry notifications unavailable, polling instead: {e}")
+        return PollingChangeSource(self._poll_min_interval, self._poll_max_interval)
@@ -8,9 +8,7 @@
 
 from .base import t, get_available_languages, detect_system_language, register_translations
 
-# 导入翻译模块，自动注册翻译字典
-from . import zh_CN  # 注册中文翻译
-from . import en_US  # 注册英文翻译
+# 翻译模块（zh_CN / en_US）在首次使用对应语言时由 base.t() 按需导入并注册
 
 __all__ = [
     "t",
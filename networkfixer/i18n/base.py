@@ -1,3 +1,4 @@
+import importlib
 import logging
 from typing import Dict
 
@@ -5,6 +6,14 @@ logger = logging.getLogger(__name__)
 
 _translations: Dict[str, Dict[str, str]] = {}
 
+# Bundled translation modules, imported the first time a language is used
+BUILTIN_LANGUAGES = ("zh_CN", "en_US")
+
+
+def _ensure_loaded(lang: str) -> None:
+    if lang not in _translations and lang in BUILTIN_LANGUAGES:
+        importlib.import_module(f"{__package__}.{lang}")
+
 
 def register_translations(lang: str, translations: Dict[str, str]) -> None:
     _translations[lang] = translations
@@ -12,6 +21,7 @@ def register_translations(lang: str, translations: Dict[str, str]) -> None:
 
 
 def t(key: str, lang: str = "zh_CN", **kwargs) -> str:
+    _ensure_loaded(lang)
     lang_dict = _translations.get(lang, {})
     text = lang_dict.get(key, key)
 
@@ -25,7 +35,9 @@ def t(key: str, lang: str = "zh_CN", **kwargs) -> str:
 
 
 def get_available_languages() -> list:
-    return list(_translations.keys())
+    languages = list(BUILTIN_LANGUAGES)
+    languages.extend(lang for lang in _translations if lang not in languages)
+    return languages
 
 
 def detect_system_language() -> str:
@@ -35,10 +47,11 @@ def detect_system_language() -> str:
         lang = locale.getdefaultlocale()[0]
         if lang:
             lang = lang.replace("-", "_")
-            if lang in _translations:
+            available_languages = get_available_languages()
+            if lang in available_languages:
                 return lang
             main_lang = lang.split("_")[0]
-            for available in _translations:
+            for available in available_languages:
                 if available.startswith(main_lang):
                     return available
     except Exception:
@@ -27,6 +27,7 @@ TRANSLATIONS = {
     "step.reset_ip": "Resetting IP address",
     "step.reset_tcpip": "Resetting TCP/IP stack",
     "step.restart_adapter": "Restarting adapter",
+    "step.clear_proxy_env": "Clearing dead proxy variables",
     "step.test_connectivity": "Testing connectivity",
     "status.ready": "Ready",
     "status.fixing": "Repairing...",
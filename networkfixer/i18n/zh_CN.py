@@ -27,6 +27,7 @@ TRANSLATIONS = {
     "step.reset_ip": "重置 IP 地址",
     "step.reset_tcpip": "重置 TCP/IP 协议栈",
     "step.restart_adapter": "重启网卡",
+    "step.clear_proxy_env": "清除失效的代理变量",
     "step.test_connectivity": "连通性测试",
     "status.ready": "就绪",
     "status.fixing": "正在修复...",
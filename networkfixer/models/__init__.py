@@ -4,6 +4,7 @@ from .result import (
     LogLevel,
     StepResult,
     ConnectivityResult,
+    ProbeTarget,
     AdapterInfo,
     ProxyStatus,
     AppConfig,
@@ -14,6 +15,7 @@ __all__ = [
     "LogLevel",
     "StepResult",
     "ConnectivityResult",
+    "ProbeTarget",
     "AdapterInfo",
     "ProxyStatus",
     "AppConfig",
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 class LogLevel(Enum):
@@ -18,27 +18,110 @@ class StepResult:
     error: Optional[Exception] = None
     return_code: int = 0
     duration_ms: float = 0.0
+    streamed: bool = False  # output is the tail of lines already forwarded while running
 
     def __str__(self) -> str:
         status = "✓" if self.ok else "✗"
         return f"{status} {self.title}"
 
 
-@dataclass
+@dataclass(frozen=True)
+class ProbeTarget:
+    """One connectivity probe.
+
+    ``all_ok`` requires every ``required`` target to pass and the passing
+    targets to carry at least ``quorum`` of the total weight.
+    """
+    KIND_PING = "ping"  # address is a host or IP
+    KIND_HTTP = "http"  # address is a URL
+
+    name: str
+    kind: str
+    address: str
+    weight: float = 1.0
+    required: bool = False
+    label: str = ""  # shown in the UI instead of the address
+
+
+DEFAULT_PROBE_TARGETS: Tuple[ProbeTarget, ...] = (
+    ProbeTarget("ping_114", ProbeTarget.KIND_PING, "114.114.114.114", required=True, label="114DNS"),
+    ProbeTarget("ping_google", ProbeTarget.KIND_PING, "8.8.8.8"),
+    ProbeTarget("http_test", ProbeTarget.KIND_HTTP, "http://www.msftconnecttest.com/redirect", required=True),
+)
+
+
 class ConnectivityResult:
-    ping_114: bool = False
-    ping_google: bool = False
-    http_test: bool = False
+    """Outcome of one connectivity test, keyed by target name.
+
+    Slots-based and sharing the target tuple with the tester, since the
+    monitor and watchdog create many of these.
+    """
+
+    __slots__ = ("targets", "quorum", "results", "latency_ms", "pending")
+
+    def __init__(
+        self,
+        targets: Tuple[ProbeTarget, ...] = DEFAULT_PROBE_TARGETS,
+        quorum: float = 0.5,
+        results: Optional[Dict[str, bool]] = None,
+        latency_ms: Optional[Dict[str, Optional[float]]] = None,
+        pending: Optional[List[str]] = None
+    ):
+        self.targets = targets
+        self.quorum = quorum
+        self.results: Dict[str, bool] = results if results is not None else {}
+        self.latency_ms: Dict[str, Optional[float]] = latency_ms if latency_ms is not None else {}
+        self.pending: List[str] = pending if pending is not None else []  # abandoned by a fast verdict
+
+    def get(self, name: str) -> bool:
+        return self.results.get(name, False)
 
     @property
     def all_ok(self) -> bool:
-        return self.ping_114 and self.http_test
+        if any(t.required and not self.get(t.name) for t in self.targets):
+            return False
+        return self._ok_weight() >= self._needed_weight()
+
+    def is_decided(self, done: Iterable[str]) -> bool:
+        """True once all_ok can no longer change, given the finished targets."""
+        done = set(done)
+        if any(t.required and t.name in done and not self.get(t.name) for t in self.targets):
+            return True
+
+        ok_weight = self._ok_weight()
+        open_weight = sum(t.weight for t in self.targets if t.name not in done)
+        if ok_weight + open_weight < self._needed_weight():
+            return True
+        required_done = all(t.name in done for t in self.targets if t.required)
+        return required_done and ok_weight >= self._needed_weight()
+
+    def _ok_weight(self) -> float:
+        return sum(t.weight for t in self.targets if self.get(t.name))
+
+    def _needed_weight(self) -> float:
+        return self.quorum * sum(t.weight for t in self.targets)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ConnectivityResult):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ConnectivityResult(all_ok={self.all_ok}, results={self.results}, pending={self.pending})"
 
 
 @dataclass
 class AdapterInfo:
     name: str
     is_connected: bool = True
+    index: Optional[int] = None
+    type: str = ""  # "ethernet", "wireless", ... or the raw type code
+    state: str = ""
+    mac: str = ""
+    mtu: Optional[int] = None
+    speed_bps: Optional[int] = None
+    description: str = ""
+    admin_enabled: Optional[bool] = None
 
 
 @dataclass
@@ -47,13 +130,47 @@ class ProxyStatus:
     server: str = ""
 
 
+DEFAULT_DNS_RESOLVERS: Tuple[str, ...] = ("114.114.114.114", "223.5.5.5", "119.29.29.29", "8.8.8.8", "1.1.1.1")
+DEFAULT_DNS_TEST_NAMES: Tuple[str, ...] = ("www.msftconnecttest.com", "www.baidu.com")
+
+
 @dataclass
 class AppConfig:
     ping_timeout_ms: int = 2000
     http_timeout_sec: int = 3
+    connectivity_mode: str = "subprocess"  # "subprocess" (ping.exe) or "socket"
+    probe_targets: Tuple[ProbeTarget, ...] = DEFAULT_PROBE_TARGETS
+    probe_quorum: float = 0.5  # share of total target weight that must pass
+    probe_tcp_ports: Tuple[int, ...] = (443, 53, 80)
+    dns_resolvers: Tuple[str, ...] = DEFAULT_DNS_RESOLVERS
+    dns_test_names: Tuple[str, ...] = DEFAULT_DNS_TEST_NAMES
+    dns_timeout_ms: int = 1500
     adapter_cache_ttl_sec: int = 5
+    max_concurrent_commands: int = 4  # subprocesses run at once by run_many
+    max_parallel_steps: int = 3
+    worker_pool_size: int = 8
+    task_pool_size: int = 4  # top-level background jobs (UI actions)
+    proxy_health_positive_ttl_sec: float = 30.0
+    proxy_health_negative_ttl_sec: float = 10.0
+    proxy_watch_min_interval_sec: float = 1.0
+    proxy_watch_max_interval_sec: float = 30.0
+    monitor_interval_sec: float = 5.0
+    monitor_window_size: int = 720  # samples kept per target (1 hour at 5s)
+    monitor_slow_p95_ms: float = 500.0
+    monitor_slow_loss_pct: float = 5.0
+    monitor_broken_loss_pct: float = 50.0
+    monitor_broken_after_failures: int = 3
+    watchdog_check_interval_sec: float = 10.0
+    watchdog_failures_before_repair: int = 2
+    watchdog_min_repair_interval_sec: float = 30.0
+    watchdog_max_repairs_per_hour: int = 6
+    watchdog_backoff_initial_sec: float = 60.0
+    watchdog_backoff_max_sec: float = 900.0
+    watchdog_verify_delay_sec: float = 2.0
     log_to_file: bool = True
     log_file_name: str = "networkfixer.log"
+    log_max_lines: int = 5000  # lines kept in the GUI log pane
+    command_output_tail_lines: int = 200  # output lines kept in StepResult of streamed commands
     window_width: int = 560
     window_height: int = 760
     language: str = "zh_CN"
@@ -10,14 +10,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText
-import threading
 import logging
 from typing import Optional
 
 from ..utils.thread import UISafeCaller, CancellationToken
+from ..utils.log_sink import TextLogSink
+from ..utils.ui_state import UIStateStore
 from ..utils.admin import is_admin
 from ..core.operations import NetworkOperations, Step
-from ..models.result import StepResult, ConnectivityResult, AppConfig
+from ..core.pool import submit_task, shutdown_worker_pool
+from ..models.result import StepResult, ConnectivityResult, ProbeTarget, AppConfig
 from ..models.config import get_config
 from ..i18n import t, detect_system_language
 
@@ -33,6 +35,19 @@ class NetworkFixerApp:
     投递到主线程执行，避免 Tkinter 线程安全问题。
     """
 
+    # 徽标状态 -> (背景色, 前景色)
+    BADGE_STYLES = {
+        "ready": ("#dcfce7", "#166534"),
+        "running": ("#dbeafe", "#1d4ed8"),
+        "testing": ("#e0f2fe", "#075985"),
+        "done": ("#dcfce7", "#166534"),
+        "error": ("#fee2e2", "#b91c1c"),
+        "cancelled": ("#ffedd5", "#c2410c"),
+    }
+
+    # 这些状态键有同名徽标，其余状态显示为“运行中”
+    STATUS_BADGES = {"status.testing": "testing", "status.done": "done", "status.ready": "ready"}
+
     def __init__(self, root: tk.Tk, config: Optional[AppConfig] = None):
         self.root = root
         self.config = config or get_config()
@@ -42,12 +57,28 @@ class NetworkFixerApp:
         # 初始化线程安全的 UI 调用器
         self.ui_caller = UISafeCaller(root, poll_interval_ms=50)
 
+        # 状态/徽标/进度只保留最新值，每个轮询周期最多渲染一次
+        self.ui_state = UIStateStore(self.ui_caller)
+        self.ui_state.bind("status", self._render_status)
+        self.ui_state.bind("badge", self._render_badge)
+        self.ui_state.bind("progress", self._render_progress)
+        self._badge_texts = {}
+
         # 取消令牌，用于中断长时间操作
         self.cancel_token: Optional[CancellationToken] = None
 
         # 业务逻辑处理器
         self.operations = NetworkOperations(self.config)
 
+        # 后台监听代理设置变化，读取代理状态时无需再查询注册表
+        self.operations.proxy_watcher.start()
+
+        # 修复命令的输出逐行写入日志，无需等待命令结束
+        self.operations.subscribe_output(self._on_command_output)
+
+        # 网卡列表在后台刷新后自动同步到下拉框
+        self.operations.adapter_manager.subscribe(self._on_adapters_changed)
+
         # 初始化界面
         self._setup_window()
         self._setup_style()
@@ -351,6 +382,12 @@ class NetworkFixerApp:
         self.log_text.tag_config("warn", foreground="#fdba74")       # 警告：橙色
         self.log_text.tag_config("error", foreground="#fca5a5")      # 错误：浅红
 
+        # 日志按轮询周期批量写入，超过上限时从顶部裁剪
+        self.log_sink = TextLogSink(self.log_text, self.ui_caller, max_lines=self.config.log_max_lines)
+        self._log_prefixes = {
+            level: t(f"log.{level}", self.lang) for level in ("info", "warn", "error", "success")
+        }
+
     def _log_welcome(self) -> None:
         """显示欢迎信息"""
         self.log(t("welcome.line1", self.lang), "success")
@@ -365,66 +402,62 @@ class NetworkFixerApp:
             text: 日志文本
             level: 日志级别 (info, success, warn, error)
         """
-        prefix_map = {
-            "info": t("log.info", self.lang),
-            "warn": t("log.warn", self.lang),
-            "error": t("log.error", self.lang),
-            "success": t("log.success", self.lang),
-        }
-        line = f"{prefix_map.get(level, t('log.info', self.lang))} {text}"
-        self.log_text.insert(tk.END, line + "\n", level)
-        self.log_text.see(tk.END)
+        prefix = self._log_prefixes.get(level, self._log_prefixes["info"])
+        self.log_sink.write(f"{prefix} {text}", level)
 
     def log_safe(self, text: str, level: str = "info") -> None:
-        """线程安全的日志写入方法（通过 UISafeCaller）
+        """线程安全的日志写入方法（日志缓冲区本身是线程安全的）
         
         参数:
             text: 日志文本
             level: 日志级别 (info, success, warn, error)
         """
-        self.ui_caller.call(self.log, text, level)
+        self.log(text, level)
 
-    def _set_status(self, text: str, color: str = "black") -> None:
-        """更新状态标签（线程安全）"""
-        self.ui_caller.call(
-            lambda: self.status_label.config(text=text, foreground=color)
-        )
+    def _set_status(self, key: str, color: str = "black", **params) -> None:
+        """更新状态标签及对应徽标（线程安全）
 
+        只保存文案键和参数，翻译留到 UI 线程渲染时进行；
+        以 _key 结尾的参数本身也是文案键，渲染时一并翻译。
+        """
         if color == "red":
-            self._set_top_badge("error")
+            badge = "error"
         elif color == "orange":
-            self._set_top_badge("cancelled")
-        elif text == t("status.testing", self.lang):
-            self._set_top_badge("testing")
-        elif text == t("status.done", self.lang):
-            self._set_top_badge("done")
-        elif text == t("status.ready", self.lang):
-            self._set_top_badge("ready")
+            badge = "cancelled"
         else:
-            self._set_top_badge("running")
+            badge = self.STATUS_BADGES.get(key, "running")
+        self.ui_state.set(status=(key, params, color), badge=badge)
 
     def _set_top_badge(self, state: str) -> None:
         """更新顶部状态徽标（线程安全）"""
-        badge_style = {
-            "ready": ("#dcfce7", "#166534"),
-            "running": ("#dbeafe", "#1d4ed8"),
-            "testing": ("#e0f2fe", "#075985"),
-            "done": ("#dcfce7", "#166534"),
-            "error": ("#fee2e2", "#b91c1c"),
-            "cancelled": ("#ffedd5", "#c2410c"),
-        }
-
-        bg, fg = badge_style.get(state, ("#e2e8f0", "#334155"))
-        text = t(f"badge.{state}", self.lang)
-
-        if not hasattr(self, "badge_label"):
-            return
-
-        self.ui_caller.call(lambda: self.badge_label.config(text=text, bg=bg, fg=fg))
+        self.ui_state.set(badge=state)
 
     def _set_progress(self, value: float) -> None:
         """更新进度条（线程安全）"""
-        self.ui_caller.call(lambda: self.progress.config(value=value))
+        self.ui_state.set(progress=value)
+
+    def _render_status(self, status: tuple) -> None:
+        """渲染状态标签（UI 线程）"""
+        key, params, color = status
+        kwargs = {}
+        for name, value in params.items():
+            if name.endswith("_key"):
+                kwargs[name[:-len("_key")]] = t(value, self.lang)
+            else:
+                kwargs[name] = value
+        self.status_label.config(text=t(key, self.lang, **kwargs), foreground=color)
+
+    def _render_badge(self, state: str) -> None:
+        """渲染顶部徽标（UI 线程），翻译结果按状态缓存"""
+        text = self._badge_texts.get(state)
+        if text is None:
+            text = self._badge_texts[state] = t(f"badge.{state}", self.lang)
+        bg, fg = self.BADGE_STYLES.get(state, ("#e2e8f0", "#334155"))
+        self.badge_label.config(text=text, bg=bg, fg=fg)
+
+    def _render_progress(self, value: float) -> None:
+        """渲染进度条（UI 线程）"""
+        self.progress.config(value=value)
 
     def _set_buttons_state(self, enabled: bool) -> None:
         """启用或禁用操作按钮（线程安全）"""
@@ -438,20 +471,46 @@ class NetworkFixerApp:
         )
 
     def _refresh_adapters(self) -> None:
-        """刷新网卡列表"""
-        adapters = self.operations.refresh_adapters(force=True)
+        """刷新网卡列表：先显示缓存结果，后台刷新完成后再更新（不阻塞主线程）"""
+        cached = self.operations.get_cached_adapters()
+        if cached:
+            self._apply_adapters([a.name for a in cached], announce=False)
+
+        future = self.operations.revalidate_adapters(force=True)
+        future.add_done_callback(self._on_adapters_refreshed)
+
+    def _on_adapters_refreshed(self, future) -> None:
+        """后台刷新完成回调（工作线程）"""
+        try:
+            adapters = [a.name for a in future.result()]
+        except Exception:
+            logger.exception("刷新网卡列表失败")
+            adapters = []
+        self.ui_caller.call(self._apply_adapters, adapters)
+
+    def _on_adapters_changed(self, adapters: list) -> None:
+        """网卡列表在后台发生变化时静默更新下拉框（工作线程）"""
+        self.ui_caller.call(self._apply_adapters, [a.name for a in adapters], False)
+
+    def _apply_adapters(self, adapters: list, announce: bool = True) -> None:
+        """将网卡列表填入下拉框（主线程），尽量保留当前选择"""
+        selected = self.adapter_var.get()
         self.combo_adapter.config(values=adapters)
 
         if adapters:
-            self.combo_adapter.current(0)
+            if selected in adapters:
+                self.combo_adapter.current(adapters.index(selected))
+            else:
+                self.combo_adapter.current(0)
+                selected = adapters[0]
             msg = t("adapter.detected", self.lang, count=len(adapters))
-            selected = self.adapter_var.get() or adapters[0]
-            if selected:
-                msg += f"，{t('adapter.selected', self.lang, name=selected)}"
+            msg += f"，{t('adapter.selected', self.lang, name=selected)}"
         else:
+            self.adapter_var.set("")
             msg = t("adapter.none", self.lang)
 
-        self.log(msg)
+        if announce:
+            self.log(msg)
 
     def _export_log(self) -> None:
         """导出日志到文件"""
@@ -465,6 +524,7 @@ class NetworkFixerApp:
             return
 
         try:
+            self.log_sink.flush()
             content = self.log_text.get("1.0", tk.END)
             with open(path, "w", encoding="utf-8") as f:
                 f.write(content)
@@ -485,10 +545,7 @@ class NetworkFixerApp:
         self.cancel_token = CancellationToken()
         self._set_top_badge("running")
 
-        threading.Thread(
-            target=self._fix_network_logic,
-            daemon=True
-        ).start()
+        submit_task(self._fix_network_logic)
 
     def _start_test_thread(self) -> None:
         """启动连通性测试线程"""
@@ -498,10 +555,7 @@ class NetworkFixerApp:
         self.cancel_token = CancellationToken()
         self._set_top_badge("testing")
 
-        threading.Thread(
-            target=self._connectivity_only,
-            daemon=True
-        ).start()
+        submit_task(self._connectivity_only)
 
     def _build_steps(self) -> list:
         """根据选中的选项构建修复步骤列表"""
@@ -529,29 +583,30 @@ class NetworkFixerApp:
         level = "success" if result.ok else "error"
         self.log_safe(f"{t(title_key, self.lang)}：{status}", level)
 
-        # 如果有输出信息，也记录下来
-        if result.output:
+        # 如果有输出信息，也记录下来（逐行输出过的不再重复）
+        if result.output and not result.streamed:
             self.log_safe(result.output, "info" if result.ok else "warn")
 
+    def _on_command_output(self, name: str, line: str) -> None:
+        """转发修复命令的实时输出（后台线程），并行步骤的输出按步骤名加前缀区分"""
+        line = line.rstrip()
+        if line:
+            self.log_safe(f"  [{name}] {line}")
+
     def _log_connectivity_result(self, conn: ConnectivityResult) -> None:
         """记录连通性测试结果"""
-        # Ping 114DNS
-        if conn.ping_114:
-            self.log_safe(t("result.ping_ok", self.lang, target="114DNS"), "success")
-        else:
-            self.log_safe(t("result.ping_fail", self.lang, target="114DNS"), "error")
-
-        # Ping 8.8.8.8
-        if conn.ping_google:
-            self.log_safe(t("result.ping_ok", self.lang, target="8.8.8.8"), "success")
-        else:
-            self.log_safe(t("result.ping_fail", self.lang, target="8.8.8.8"), "error")
-
-        # HTTP 测试
-        if conn.http_test:
-            self.log_safe(t("result.http_ok", self.lang), "success")
-        else:
-            self.log_safe(t("result.http_fail", self.lang), "error")
+        for target in conn.targets:
+            if target.name in conn.pending:
+                continue
+            ok = conn.get(target.name)
+            level = "success" if ok else "error"
+
+            if target.kind == ProbeTarget.KIND_HTTP and not target.label:
+                key = "result.http_ok" if ok else "result.http_fail"
+                self.log_safe(t(key, self.lang), level)
+            else:
+                key = "result.ping_ok" if ok else "result.ping_fail"
+                self.log_safe(t(key, self.lang, target=target.label or target.address), level)
 
     def _fix_network_logic(self) -> None:
         """主修复逻辑（在后台线程运行）"""
@@ -568,39 +623,44 @@ class NetworkFixerApp:
 
             if total == 1:  # 没有选中任何操作
                 self.log_safe(t("warn.no_selection", self.lang), "warn")
-                self._set_status(t("status.ready", self.lang), "black")
+                self._set_status("status.ready", "black")
                 self._set_buttons_state(True)
                 return
 
             per_step = 100 / total
             progress_val = 0.0
 
-            # 逐步执行修复
-            for idx, step in enumerate(steps, start=1):
-                # 检查是否被取消
-                if self.cancel_token and self.cancel_token.is_cancelled:
-                    self._set_status(t("status.cancelled", self.lang), "orange")
-                    break
-
+            def on_step_start(idx: int, step_total: int, title_key: str) -> None:
                 # 更新状态显示
-                action = t(step.title_key, self.lang)
                 self._set_status(
-                    t("progress.step", self.lang, current=idx, total=len(steps), action=action),
-                    "#0057b7"
+                    "progress.step", "#0057b7",
+                    current=idx, total=step_total, action_key=title_key
                 )
 
-                # 执行当前步骤
-                result = step.func()
+            def on_step_done(step: Step, result: StepResult) -> None:
+                nonlocal progress_val
                 self._handle_step_result(step.title_key, result)
 
                 # 更新进度条
                 progress_val += per_step
                 self._set_progress(progress_val)
 
+            # 执行修复（无依赖关系的步骤会并行执行）
+            self.operations.execute_steps(
+                steps,
+                progress_callback=on_step_start,
+                cancel_check=lambda: bool(self.cancel_token and self.cancel_token.is_cancelled),
+                result_callback=on_step_done
+            )
+
+            # 检查是否被取消
+            if self.cancel_token and self.cancel_token.is_cancelled:
+                self._set_status("status.cancelled", "orange")
+
             # 最后进行连通性测试
             self._set_status(
-                t("progress.step", self.lang, current=total, total=total, action=t("step.test_connectivity", self.lang)),
-                "#4b8b3b"
+                "progress.step", "#4b8b3b",
+                current=total, total=total, action_key="step.test_connectivity"
             )
 
             conn = self.operations.test_connectivity()
@@ -608,7 +668,7 @@ class NetworkFixerApp:
             self._set_progress(100)
 
             # 完成
-            self._set_status(t("status.done", self.lang), "#4b8b3b")
+            self._set_status("status.done", "#4b8b3b")
             self.ui_caller.call(
                 lambda: messagebox.showinfo(
                     t("msg.fix_done.title", self.lang),
@@ -618,7 +678,7 @@ class NetworkFixerApp:
 
         except Exception as e:
             logger.exception("修复失败")
-            self._set_status(t("status.error", self.lang, error=str(e)), "red")
+            self._set_status("status.error", "red", error=str(e))
             self.ui_caller.call(
                 lambda: messagebox.showerror(
                     t("msg.fix_error.title", self.lang),
@@ -634,16 +694,16 @@ class NetworkFixerApp:
         try:
             self.log_safe("-" * 50)
             self.log_safe(t("step.test_connectivity", self.lang))
-            self._set_status(t("status.testing", self.lang), "#4b8b3b")
+            self._set_status("status.testing", "#4b8b3b")
 
             conn = self.operations.test_connectivity()
             self._log_connectivity_result(conn)
 
-            self._set_status(t("status.done", self.lang), "#4b8b3b")
+            self._set_status("status.done", "#4b8b3b")
 
         except Exception as e:
             logger.exception("连通性测试失败")
-            self._set_status(t("status.error", self.lang, error=str(e)), "red")
+            self._set_status("status.error", "red", error=str(e))
             self.ui_caller.call(
                 lambda: messagebox.showerror(
                     t("msg.fix_error.title", self.lang),
@@ -663,17 +723,14 @@ class NetworkFixerApp:
         self.progress.start(10)
         self._set_top_badge("running")
 
-        threading.Thread(
-            target=self._proxy_ghost_scan_logic,
-            daemon=True
-        ).start()
+        submit_task(self._proxy_ghost_scan_logic)
 
     def _proxy_ghost_scan_logic(self) -> None:
         """幽灵代理扫描与修复逻辑（后台线程）"""
         try:
             self.log_safe("=" * 50)
             self.log_safe(t("proxy_ghost.scan_title", self.lang), "info")
-            self._set_status(t("proxy_ghost.scanning", self.lang), "#0057b7")
+            self._set_status("proxy_ghost.scanning", "#0057b7")
 
             # 扫描并测试代理环境变量
             healthy, dead = self.operations.scan_proxy_env()
@@ -753,11 +810,11 @@ class NetworkFixerApp:
                     )
                 )
 
-            self._set_status(t("status.done", self.lang), "#4b8b3b")
+            self._set_status("status.done", "#4b8b3b")
 
         except Exception as e:
             logger.exception("幽灵代理扫描失败")
-            self._set_status(t("status.error", self.lang, error=str(e)), "red")
+            self._set_status("status.error", "red", error=str(e))
             self.ui_caller.call(
                 lambda: messagebox.showerror(
                     t("msg.fix_error.title", self.lang),
@@ -773,6 +830,10 @@ class NetworkFixerApp:
     def cleanup(self) -> None:
         """清理资源，在关闭窗口前调用"""
         self.ui_caller.stop()
+        self.operations.proxy_watcher.stop()
+        if self.cancel_token:
+            self.cancel_token.cancel()
+        shutdown_worker_pool(wait=False)
 
 
 def main() -> None:
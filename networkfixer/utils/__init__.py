@@ -1,13 +1,29 @@
-"""Utility functions for NetworkFixer"""
-
-from .thread import UISafeCaller, CancellationToken
-from .logger import setup_logging, GUIHandler
-from .admin import is_admin
-
-__all__ = [
-    "UISafeCaller",
-    "CancellationToken",
-    "setup_logging",
-    "GUIHandler",
-    "is_admin",
-]
+"""Utility functions for NetworkFixer
+
+Attributes are loaded on first access (PEP 562); only the UI helpers touch tkinter.
+"""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "UISafeCaller": ".thread",
+    "CancellationToken": ".thread",
+    "TextLogSink": ".log_sink",
+    "UIStateStore": ".ui_state",
+    "setup_logging": ".logger",
+    "GUIHandler": ".logger",
+    "is_admin": ".admin",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _EXPORTS)
+
+if TYPE_CHECKING:
+    from .thread import UISafeCaller, CancellationToken
+    from .log_sink import TextLogSink
+    from .ui_state import UIStateStore
+    from .logger import setup_logging, GUIHandler
+    from .admin import is_admin
+
+__all__ = list(_EXPORTS)
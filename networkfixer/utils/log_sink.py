@@ -0,0 +1,67 @@
+import threading
+import logging
+from collections import deque
+from itertools import groupby
+from typing import Deque, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tkinter import Text
+    from .thread import UISafeCaller
+
+logger = logging.getLogger(__name__)
+
+
+class TextLogSink:
+    """Batched, thread-safe writer for a Tk Text log pane.
+
+    Lines written from any thread are buffered; the first line after a
+    flush schedules a single flush on the UI thread, which inserts the whole
+    batch in one Text.insert call (one chars/tag pair per run of equal
+    tags), trims the widget to ``max_lines`` from the top and scrolls once.
+    """
+
+    def __init__(self, widget: "Text", ui_caller: "UISafeCaller", max_lines: int = 5000):
+        self.widget = widget
+        self.ui_caller = ui_caller
+        self.max_lines = max_lines
+        # Lines beyond max_lines would be trimmed anyway, so a stalled UI
+        # cannot make the buffer grow without bound
+        self._pending: Deque[Tuple[str, str]] = deque(maxlen=max_lines)
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def write(self, line: str, tag: str = "info") -> None:
+        with self._lock:
+            self._pending.append((line, tag))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.ui_caller.call(self.flush)
+
+    def flush(self) -> None:
+        """Render buffered lines. Must run on the UI thread."""
+        with self._lock:
+            lines: List[Tuple[str, str]] = list(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+
+        if not lines:
+            return
+
+        args = []
+        for tag, run in groupby(lines, key=lambda item: item[1]):
+            args.append("".join(line + "\n" for line, _ in run))
+            args.append((tag,))
+
+        widget = self.widget
+        # Only follow the output if the user has not scrolled up to read
+        at_bottom = widget.yview()[1] >= 0.999
+        widget.insert("end", *args)
+
+        line_count = int(widget.index("end-1c").split(".")[0])
+        excess = line_count - 1 - self.max_lines
+        if excess > 0:
+            widget.delete("1.0", f"{excess + 1}.0")
+
+        if at_bottom:
+            widget.see("end")
@@ -1,45 +1,194 @@
-import queue
+import threading
+import time
 import logging
-from typing import Callable
-from tkinter import Tk
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tkinter import Tk
 
 logger = logging.getLogger(__name__)
 
 
 class UISafeCaller:
-    def __init__(self, root: Tk, poll_interval_ms: int = 50):
+    """Runs callbacks on the Tk thread on behalf of worker threads.
+
+    Polling backs off from ``poll_interval_ms`` to ``max_poll_interval_ms``
+    while the queue stays empty and snaps back as soon as work arrives:
+    the first callback posted to an empty queue while backed off wakes the
+    dispatcher. On the Tk thread this happens at once; a worker thread
+    schedules the wake with one ``after(0)`` per idle period rather than
+    calling into Tk for every post, since a marshalled Tcl call blocks it
+    until the UI thread is free.
+
+    Each tick runs callbacks for at most ``budget_ms`` before yielding back
+    to Tk, and callbacks posted with ``call_latest`` replace a pending one
+    with the same key, so only the newest value of an update is applied.
+    """
+
+    def __init__(
+        self,
+        root: "Tk",
+        poll_interval_ms: int = 50,
+        max_poll_interval_ms: int = 400,
+        budget_ms: float = 8.0
+    ):
         self.root = root
         self.poll_interval_ms = poll_interval_ms
-        self._queue: queue.Queue[Callable] = queue.Queue()
+        self.max_poll_interval_ms = max(poll_interval_ms, max_poll_interval_ms)
+        self.budget_ms = budget_ms
+
+        self._lock = threading.Lock()
+        # (key, callback); keyed entries hold None and read _latest[key]
+        self._queue: Deque[Tuple[Optional[Hashable], Optional[Callable[[], None]]]] = deque()
+        self._latest: Dict[Hashable, Callable[[], None]] = {}
         self._running = True
+        self._interval = poll_interval_ms
+        self._after_id: Optional[str] = None
+        self._in_poll = False
+        self._wake_pending = False  # a worker already asked the Tk thread to wake
+        self._main_thread = threading.current_thread()
         self._start_polling()
 
     def _start_polling(self) -> None:
         self._poll()
 
     def _poll(self) -> None:
+        self._after_id = None
         if not self._running:
             return
 
+        # Callbacks that post again must not start a second poll chain;
+        # this tick reschedules itself below
+        self._in_poll = True
+        try:
+            ran = self._run_batch()
+        finally:
+            self._in_poll = False
+        with self._lock:
+            backlog = bool(self._queue)
+
+        if backlog:
+            # Budget exhausted: let Tk redraw and handle input, then continue
+            self._interval = self.poll_interval_ms
+            self._after_id = self.root.after(1, self._poll)
+            return
+
+        if ran:
+            self._interval = self.poll_interval_ms
+        else:
+            self._interval = min(self._interval * 2, self.max_poll_interval_ms)
+        self._after_id = self.root.after(self._interval, self._poll)
+
+    def _run_batch(self) -> int:
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        ran = 0
         while True:
+            with self._lock:
+                if not self._queue:
+                    break
+                key, callback = self._queue.popleft()
+                if callback is None:
+                    callback = self._latest.pop(key)
+
             try:
-                callback = self._queue.get_nowait()
-                try:
-                    callback()
-                except Exception as e:
-                    logger.error(f"UI callback error: {e}")
-            except queue.Empty:
+                callback()
+            except Exception as e:
+                logger.error(f"UI callback error: {e}")
+            ran += 1
+
+            if time.perf_counter() >= deadline:
                 break
+        return ran
+
+    def _enqueue(self, key: Optional[Hashable], callback: Callable[[], None]) -> None:
+        on_main = threading.current_thread() is self._main_thread
+        with self._lock:
+            was_empty = not self._queue
+            if key is None:
+                self._queue.append((None, callback))
+            else:
+                if key not in self._latest:
+                    self._queue.append((key, None))
+                self._latest[key] = callback
+
+            backed_off = self._interval > self.poll_interval_ms
+            wake_later = backed_off and was_empty and not on_main and not self._wake_pending
+            if wake_later:
+                self._wake_pending = True
+
+        if backed_off and on_main:
+            # Backed off while idle: on the Tk thread we may reschedule right away
+            self._wake()
+        elif wake_later:
+            try:
+                self.root.after(0, self._wake)
+            except Exception as e:
+                # Tk is gone or not looping yet; the regular poll picks the work up
+                logger.debug(f"Cannot wake UI dispatcher: {e}")
+                self._wake_pending = False
 
-        self.root.after(self.poll_interval_ms, self._poll)
+    def _wake(self) -> None:
+        self._wake_pending = False
+        if not self._running or self._in_poll:
+            return
+        self._interval = self.poll_interval_ms
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(0, self._poll)
 
     def call(self, func: Callable, *args, **kwargs) -> None:
         def wrapper():
             func(*args, **kwargs)
-        self._queue.put(wrapper)
+        self._enqueue(None, wrapper)
+
+    def call_latest(self, key: Hashable, func: Callable, *args, **kwargs) -> None:
+        """
+        Like call(), but replaces a still-pending callback posted with the same key.
+
+        Use for idempotent updates (status text, progress value, badge) where
+        only the newest value matters. The callback keeps the queue position
+        of the first pending post with that key.
+        """
+        def wrapper():
+            func(*args, **kwargs)
+        self._enqueue(key, wrapper)
+
+    def call_and_wait(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run func on the UI thread and return its result (or raise its exception).
+
+        Called from the UI thread itself, func runs immediately.
+        """
+        if threading.current_thread() is self._main_thread:
+            return func(*args, **kwargs)
+
+        done = threading.Event()
+        outcome: Dict[str, Any] = {}
+
+        def wrapper():
+            try:
+                outcome["result"] = func(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        self._enqueue(None, wrapper)
+        if not done.wait(timeout):
+            raise TimeoutError("UI call did not complete in time")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
 
     def stop(self) -> None:
         self._running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
 
 
 class CancellationToken:
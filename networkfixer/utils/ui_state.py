@@ -0,0 +1,53 @@
+import threading
+import logging
+from typing import Any, Callable, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .thread import UISafeCaller
+
+logger = logging.getLogger(__name__)
+
+
+class UIStateStore:
+    """Last-write-wins store for UI state shared with worker threads.
+
+    Any thread may set fields; the UI thread renders each changed field at
+    most once per dispatcher tick, with its latest value only. Renderers are
+    bound per field and always run on the UI thread.
+    """
+
+    _RENDER_KEY = "ui_state.render"
+
+    def __init__(self, ui_caller: "UISafeCaller"):
+        self.ui_caller = ui_caller
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+        self._dirty: Dict[str, Any] = {}
+        self._renderers: Dict[str, Callable[[Any], None]] = {}
+
+    def bind(self, field: str, renderer: Callable[[Any], None]) -> None:
+        self._renderers[field] = renderer
+
+    def get(self, field: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._values.get(field, default)
+
+    def set(self, **fields: Any) -> None:
+        with self._lock:
+            self._values.update(fields)
+            self._dirty.update(fields)
+        self.ui_caller.call_latest(self._RENDER_KEY, self.render)
+
+    def render(self) -> None:
+        """Apply pending changes. Must run on the UI thread."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+
+        for field, value in dirty.items():
+            renderer = self._renderers.get(field)
+            if renderer is None:
+                continue
+            try:
+                renderer(value)
+            except Exception as e:
+                logger.error(f"UI state renderer for {field} failed: {e}")
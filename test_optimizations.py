@@ -39,6 +39,83 @@ def test_encoding_detection():
         print(f"  ✗ Encoding test failed: {e}")
         return False
 
+def _legacy_decode(data):
+    """Decode the way CommandExecutor did before the codec cache"""
+    for encoding in ['mbcs', 'utf-8', 'gbk']:
+        try:
+            return data.decode(encoding).strip()
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return data.decode('utf-8', errors='replace').strip()
+
+
+def test_decode_throughput():
+    """Test cached codec selection against trying every codec per output"""
+    print("\nTesting decode throughput...")
+
+    try:
+        from networkfixer.core import executor as executor_module
+
+        # Pin the console code page to GBK (a Chinese Windows host), so the
+        # result does not depend on the code page of the machine running this
+        saved_encoding = executor_module._console_encoding
+        executor_module._console_encoding = "gbk"
+        try:
+            executor = executor_module.CommandExecutor()
+            print(f"  Console encoding (pinned): {executor_module.detect_console_encoding()}")
+
+            netsh = "\r\n".join(f"Resetting Interface {i}, OK!" for i in range(40))
+            ping = "\r\n".join(
+                f"来自 114.114.114.114 的回复: 字节=32 时间={i % 50}ms TTL=64" for i in range(20000)
+            )
+
+            # The cache saves the failed attempts before the right codec; a
+            # large non-ASCII payload is bound by the codec itself, so parity
+            # (about 1.0x) is the expected result there
+            ok = True
+            for label, family, text, codec, rounds in (
+                ("netsh (small, ASCII)", "netsh", netsh, "ascii", 20000),
+                ("ping (large, GBK)", "ping", ping, "gbk", 20),
+            ):
+                data = text.encode(codec)
+                if executor._decode_output(data, family) != text.strip():
+                    print(f"  ✗ {label}: cached decode does not match the {codec} source text")
+                    ok = False
+                    continue
+
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    _legacy_decode(data)
+                legacy = time.perf_counter() - start
+
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    executor._decode_output(data, family)
+                cached = time.perf_counter() - start
+
+                mb = len(data) * rounds / 1e6
+                print(
+                    f"  ✓ {label}: legacy {mb / legacy:.0f} MB/s, cached {mb / cached:.0f} MB/s "
+                    f"({legacy / cached:.1f}x), codec {executor._family_codecs.get(family, 'ascii')}"
+                )
+
+            # A single-byte OEM page decodes any bytes; UTF-8 output must still be recognised
+            executor_module._console_encoding = "cp437"
+            executor = executor_module.CommandExecutor()
+            text = "Größe 中文"
+            if executor._decode_output(text.encode("utf-8"), "netsh") == text:
+                print("  ✓ UTF-8 output on a cp437 console decodes correctly")
+            else:
+                print("  ✗ UTF-8 output on a cp437 console was mis-decoded")
+                ok = False
+        finally:
+            executor_module._console_encoding = saved_encoding
+
+        return ok
+    except Exception as e:
+        print(f"  ✗ Decode benchmark failed: {e}")
+        return False
+
 def test_command_chaining():
     """Test command chaining optimization"""
     print("\nTesting command chaining optimization...")
@@ -152,6 +229,68 @@ def test_ping_optimization():
         print(f"  ✗ Ping test failed: {e}")
         return False
 
+# Cumulative import time budgets (ms) for a cold interpreter, per entry module
+IMPORT_BUDGETS_MS = {
+    "networkfixer": 20,
+    "networkfixer.core": 40,
+    "networkfixer.cli": 100,
+    "networkfixer.core.operations": 150,
+}
+
+# Heavy modules that headless entry points must not pull in
+FORBIDDEN_ON_IMPORT = ["tkinter", "asyncio", "urllib.request", "networkfixer.ui"]
+
+
+def _cumulative_import_ms(module):
+    """Run `python -X importtime -c "import module"` and return the module's cumulative time"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=30
+    )
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "no importtime output")
+
+
+def test_import_budget():
+    """Test lazy package imports keep startup within budget"""
+    print("\nTesting import-time budget...")
+
+    ok = True
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        try:
+            # Best of 3 to filter out disk cache / scheduler noise
+            elapsed = min(_cumulative_import_ms(module) for _ in range(3))
+        except Exception as e:
+            print(f"  ✗ import {module} failed: {e}")
+            ok = False
+            continue
+
+        if elapsed <= budget:
+            print(f"  ✓ import {module}: {elapsed:.1f}ms (budget {budget}ms)")
+        else:
+            print(f"  ✗ import {module}: {elapsed:.1f}ms exceeds budget {budget}ms")
+            ok = False
+
+    check = (
+        "import sys, networkfixer.cli, networkfixer.core.operations; "
+        f"print(','.join(m for m in {FORBIDDEN_ON_IMPORT!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", check], stdout=subprocess.PIPE, text=True, timeout=30)
+    loaded = proc.stdout.strip()
+    if loaded:
+        print(f"  ✗ Headless imports pulled in: {loaded}")
+        ok = False
+    else:
+        print(f"  ✓ Headless imports avoid {', '.join(FORBIDDEN_ON_IMPORT)}")
+
+    return ok
+
 def main():
     print("=" * 60)
     print("NetworkFixer Performance Optimization Validation")
@@ -165,9 +304,11 @@ def main():
     
     # Run all tests
     results['encoding'] = test_encoding_detection()
+    results['decoding'] = test_decode_throughput()
     results['chaining'] = test_command_chaining()
     results['caching'] = test_caching_mechanism()
     results['ping'] = test_ping_optimization()
+    results['imports'] = test_import_budget()
     
     # Summary
     print("\n" + "=" * 60)
@@ -0,0 +1,15 @@
+import pytest
+
+from networkfixer.core import pool
+from networkfixer.models.config import get_config, reset_config
+
+
+@pytest.fixture
+def single_worker_pool():
+    """Fresh shared pools with one thread each, for deadlock and queueing tests."""
+    pool.shutdown_worker_pool(wait=True)
+    get_config().worker_pool_size = 1
+    get_config().task_pool_size = 1
+    yield
+    pool.shutdown_worker_pool(wait=True)
+    reset_config()
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from networkfixer.core.adapters import AdapterBackend, AdapterManager, NetshAdapterBackend
+from networkfixer.models.result import AdapterInfo, StepResult
+
+
+class GatedBackend(AdapterBackend):
+    """Counts calls and blocks each listing until the test releases it."""
+
+    name = "gated"
+
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def list_adapters(self):
+        self.calls += 1
+        assert self.gate.wait(5)
+        return [AdapterInfo(name=name) for name in self.names]
+
+
+def names(adapters):
+    return [adapter.name for adapter in adapters]
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        AdapterBackend()
+
+
+def test_falls_back_to_next_backend():
+    class Broken(AdapterBackend):
+        name = "broken"
+
+        def list_adapters(self):
+            raise OSError("unavailable")
+
+    manager = AdapterManager(backends=[Broken(), GatedBackend(["Wi-Fi"])])
+    assert names(manager.list_adapters()) == ["Wi-Fi"]
+
+
+def test_stale_cache_is_served_while_one_refresh_runs():
+    backend = GatedBackend(["Ethernet"])
+    manager = AdapterManager(cache_ttl=0, backends=[backend])
+    assert names(manager.refresh_info()) == ["Ethernet"]
+    assert backend.calls == 1
+
+    backend.names = ["Ethernet", "Wi-Fi"]
+    backend.gate.clear()
+    changed = threading.Event()
+    manager.subscribe(lambda adapters: changed.set())
+
+    # Stale entries come back at once and start a single background refresh
+    assert names(manager.get_cached()) == ["Ethernet"]
+    assert names(manager.get_cached()) == ["Ethernet"]
+    first = manager.revalidate()
+    assert manager.revalidate() is first
+
+    backend.gate.set()
+    assert names(first.result(timeout=5)) == ["Ethernet", "Wi-Fi"]
+    assert changed.wait(5)
+    assert backend.calls == 2
+    assert names(manager.get_cached()) == ["Ethernet", "Wi-Fi"]
+
+
+def test_fresh_cache_does_not_refresh():
+    backend = GatedBackend(["Ethernet"])
+    manager = AdapterManager(cache_ttl=60, backends=[backend])
+    manager.refresh_info()
+
+    assert names(manager.get_cached()) == ["Ethernet"]
+    assert names(manager.revalidate().result(timeout=0)) == ["Ethernet"]
+    assert backend.calls == 1
+
+
+def test_netsh_backend_fills_mtus_from_second_listing():
+    class FakeExecutor:
+        def __init__(self):
+            self.batches = []
+
+        def run_many(self, commands):
+            self.batches.append(commands)
+            return [
+                StepResult(ok=True, title="", output=(
+                    "Admin State    State          Type             Interface Name\n"
+                    "-------------------------------------------------------------------------\n"
+                    "Enabled        Connected      Dedicated        Ethernet 2\n"
+                    "Disabled       Disconnected   Dedicated        Wi-Fi\n"
+                )),
+                StepResult(ok=True, title="", output=(
+                    "   MTU  MediaSenseState   Bytes In  Bytes Out  Interface\n"
+                    "------  ---------------  ---------  ---------  -------------\n"
+                    "4294967295                1          0      12345  Loopback Pseudo-Interface 1\n"
+                    "  1500                1  123456789   12345678  Ethernet 2\n"
+                )),
+            ]
+
+    backend = NetshAdapterBackend.__new__(NetshAdapterBackend)
+    backend.executor = FakeExecutor()
+    adapters = backend.list_adapters()
+
+    assert len(backend.executor.batches) == 1
+    assert [(a.name, a.is_connected, a.admin_enabled, a.mtu) for a in adapters] == [
+        ("Ethernet 2", True, True, 1500),
+        ("Wi-Fi", False, False, None),
+    ]
@@ -0,0 +1,128 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+from networkfixer.core.connectivity import ConnectivityTester
+from networkfixer.core.probe import ProbeResult
+from networkfixer.models.result import ProbeTarget
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = (
+    ProbeTarget("required", ProbeTarget.KIND_PING, "192.0.2.1", required=True),
+    ProbeTarget("slow", ProbeTarget.KIND_PING, "192.0.2.2"),
+)
+
+# HTTP targets are submitted as one pool job each, unlike the batched pings
+HTTP_TARGETS = (
+    ProbeTarget("required", ProbeTarget.KIND_HTTP, "http://192.0.2.1/", required=True),
+    ProbeTarget("next", ProbeTarget.KIND_HTTP, "http://192.0.2.2/"),
+    ProbeTarget("queued", ProbeTarget.KIND_HTTP, "http://192.0.2.3/"),
+)
+
+
+class FakeTester(ConnectivityTester):
+    """Probes answer from a table instead of the network."""
+
+    def __init__(self, outcomes, delays=None, targets=TARGETS, **kwargs):
+        super().__init__(targets=targets, **kwargs)
+        self.outcomes = outcomes
+        self.delays = delays or {}
+        self.started = []
+
+    def _probe_func(self, target):
+        def probe():
+            self.started.append(target.name)
+            time.sleep(self.delays.get(target.name, 0))
+            return self.outcomes[target.name], 1.0
+        return probe
+
+    def _ping_many(self, targets, on_result):
+        for index, target in enumerate(targets):
+            time.sleep(self.delays.get(target.name, 0))
+            on_result(index, self.outcomes[target.name])
+
+
+def test_parallel_collects_all_results():
+    result = FakeTester({"required": True, "slow": False}).test()
+
+    assert result.results == {"required": True, "slow": False}
+    assert result.pending == []
+
+
+def test_fast_verdict_abandons_pending_probes():
+    tester = FakeTester({"required": False, "slow": True}, delays={"slow": 5})
+    started = time.monotonic()
+    result = tester.test(fast=True)
+
+    assert time.monotonic() - started < 2
+    assert not result.all_ok
+    assert result.pending == ["slow"]
+
+
+def test_fast_verdict_cancels_queued_probes(single_worker_pool):
+    tester = FakeTester(
+        {"required": False, "next": True, "queued": True},
+        delays={"next": 0.2},
+        targets=HTTP_TARGETS
+    )
+    result = tester.test(fast=True)
+
+    assert result.pending == ["next", "queued"]
+    time.sleep(0.5)
+    # The single worker may already have picked up "next", never "queued"
+    assert "queued" not in tester.started
+
+
+def test_abandoned_queued_probes_do_not_delay_exit():
+    script = textwrap.dedent(f"""
+        import sys
+        sys.path.insert(0, {ROOT!r})
+        from networkfixer.models.config import get_config
+        from tests.test_connectivity import FakeTester, HTTP_TARGETS
+        get_config().worker_pool_size = 1
+        tester = FakeTester(
+            {{"required": False, "next": True, "queued": True}},
+            delays={{"next": 0.2, "queued": 10}},
+            targets=HTTP_TARGETS
+        )
+        print(tester.test(fast=True).pending)
+    """)
+    started = time.monotonic()
+    proc = subprocess.run(
+        [sys.executable, "-c", script], stdout=subprocess.PIPE, text=True, timeout=30
+    )
+
+    assert proc.returncode == 0
+    assert proc.stdout.strip() == "['next', 'queued']"
+    assert time.monotonic() - started < 5
+
+
+class SlowProbeEngine:
+    """Stands in for ProbeEngine; each address answers after its own delay."""
+
+    timeout_sec = 5.0
+
+    def __init__(self, outcomes, delays):
+        self.outcomes = outcomes
+        self.delays = delays
+
+    def probe(self, addresses):
+        time.sleep(max(self.delays.get(a, 0) for a in addresses))
+        return {a: ProbeResult(target=a, ok=self.outcomes[a], rtt_ms=1.0) for a in addresses}
+
+
+def test_socket_mode_fast_verdict_does_not_wait_for_slow_pings():
+    tester = ConnectivityTester(targets=TARGETS)
+    tester.probe_engine = SlowProbeEngine(
+        outcomes={"192.0.2.1": False, "192.0.2.2": True},
+        delays={"192.0.2.2": 3}
+    )
+    started = time.monotonic()
+    result = tester.test(mode=ConnectivityTester.MODE_SOCKET, fast=True)
+
+    assert time.monotonic() - started < 1
+    assert result.results == {"required": False}
+    assert result.pending == ["slow"]
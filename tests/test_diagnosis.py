@@ -0,0 +1,139 @@
+import threading
+from types import SimpleNamespace
+
+from networkfixer.core.diagnosis import (
+    CAPTIVE_PORTAL,
+    DEAD_ENV_PROXY,
+    DEAD_SYSTEM_PROXY,
+    DNS_FAILURE,
+    NO_ROUTE,
+    DiagnosisEngine,
+)
+from networkfixer.core.operations import NetworkOperations
+from networkfixer.models.result import StepResult
+
+
+class StubOperations:
+    """Enough of NetworkOperations to build steps, with short timeouts."""
+
+    build_steps = NetworkOperations.build_steps
+
+    def __init__(self, dead_env=()):
+        self.dead_env = list(dead_env)
+        self.config = SimpleNamespace(http_timeout_sec=0.05)
+        self.connectivity_tester = SimpleNamespace(probe_engine=SimpleNamespace(timeout_sec=0.05))
+        self.proxy_ghost_killer = SimpleNamespace(health_checker=SimpleNamespace(timeout=0.05))
+
+    def scan_proxy_env(self):
+        return [], self.dead_env
+
+    def _step(self):
+        return StepResult(ok=True, title="")
+
+    disable_proxy = flush_dns = reset_winsock = reset_ip = reset_tcpip = _step
+
+
+class ScriptedEngine(DiagnosisEngine):
+    """Check outcomes come from keyword arguments; ``hang`` lists stuck checks."""
+
+    def __init__(self, operations, dead_server=None, raw_ip=True, dns=True, portal=None, hang=()):
+        super().__init__(operations)
+        self.outcomes = {"system_proxy": dead_server, "raw_ip": raw_ip, "dns": dns, "portal": portal}
+        self.hang = set(hang)
+        self.release = threading.Event()
+
+    def _outcome(self, name):
+        if name in self.hang:
+            self.release.wait(5)
+        return self.outcomes[name]
+
+    def _check_system_proxy(self):
+        return self._outcome("system_proxy")
+
+    def _check_raw_ip(self):
+        return self._outcome("raw_ip")
+
+    def _check_dns(self):
+        return self._outcome("dns")
+
+    def _check_captive_portal(self):
+        return self._outcome("portal")
+
+
+def diagnose(operations=None, **outcomes):
+    engine = ScriptedEngine(operations or StubOperations(), **outcomes)
+    try:
+        return engine.diagnose()
+    finally:
+        engine.release.set()
+
+
+def codes(diagnosis):
+    return [finding.code for finding in diagnosis.findings]
+
+
+def step_names(diagnosis):
+    return [step.name for step in diagnosis.steps]
+
+
+def test_everything_passing_is_healthy():
+    diagnosis = diagnose()
+
+    assert diagnosis.healthy
+    assert diagnosis.steps == []
+    assert all(diagnosis.checks.values())
+
+
+def test_dns_failure_only_flushes_dns():
+    diagnosis = diagnose(dns=False)
+
+    assert codes(diagnosis) == [DNS_FAILURE]
+    assert step_names(diagnosis) == ["flush_dns"]
+
+
+def test_no_route_outranks_dns_failure_and_portal():
+    diagnosis = diagnose(raw_ip=False, dns=False, portal="http://login.example/")
+
+    assert codes(diagnosis) == [NO_ROUTE]
+    assert step_names(diagnosis) == ["reset_ip"]
+
+
+def test_dns_failure_outranks_portal():
+    diagnosis = diagnose(dns=False, portal="http://login.example/")
+
+    assert codes(diagnosis) == [DNS_FAILURE]
+
+
+def test_captive_portal_needs_a_browser_not_a_repair():
+    diagnosis = diagnose(portal="http://login.example/")
+
+    assert codes(diagnosis) == [CAPTIVE_PORTAL]
+    assert diagnosis.findings[0].detail == "http://login.example/"
+    assert diagnosis.steps == []
+    assert not diagnosis.healthy
+
+
+def test_dead_proxies_come_first_and_combine_with_other_findings():
+    dead = [SimpleNamespace(scope="Process", name="HTTP_PROXY")]
+    diagnosis = diagnose(StubOperations(dead_env=dead), dead_server="127.0.0.1:9", dns=False)
+
+    assert codes(diagnosis) == [DEAD_ENV_PROXY, DEAD_SYSTEM_PROXY, DNS_FAILURE]
+    assert step_names(diagnosis) == ["clear_proxy_env", "disable_proxy", "flush_dns"]
+
+
+def test_stuck_check_is_unknown_not_healthy():
+    diagnosis = diagnose(hang=["system_proxy"])
+
+    assert diagnosis.checks["system_proxy"] is None
+    assert diagnosis.unknown == ["system_proxy"]
+    assert diagnosis.findings == []
+    assert not diagnosis.healthy
+
+
+def test_stuck_raw_ip_check_hides_dns_verdict():
+    # Without knowing the route works, a failed lookup does not point at DNS
+    diagnosis = diagnose(raw_ip=True, dns=False, hang=["raw_ip"])
+
+    assert diagnosis.checks["raw_ip"] is None
+    assert diagnosis.checks["dns"] is False
+    assert diagnosis.findings == []
@@ -0,0 +1,131 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+from networkfixer.core.dns_probe import (
+    DnsProber, QTYPE_A, build_query, parse_resolver, parse_response
+)
+
+
+class StubResolver:
+    """UDP resolver on 127.0.0.1 answering names in ``answers``, ignoring the rest."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.1)
+        self.address = "127.0.0.1:%d" % self.sock.getsockname()[1]
+        self.queries = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                packet, client = self.sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            name = self._qname(packet)
+            self.queries.append(name)
+            if name in self.answers:
+                self.sock.sendto(self._reply(packet, self.answers[name]), client)
+
+    @staticmethod
+    def _qname(packet):
+        labels, pos = [], 12
+        while packet[pos]:
+            length = packet[pos]
+            labels.append(packet[pos + 1:pos + 1 + length].decode())
+            pos += length + 1
+        return ".".join(labels)
+
+    @staticmethod
+    def _reply(query, rcode):
+        txid, flags = struct.unpack("!HH", query[:4])
+        ancount = 1 if rcode == 0 else 0
+        header = struct.pack("!HHHHHH", txid, flags | 0x8000 | 0x0080 | rcode, 1, ancount, 0, 0)
+        answer = b""
+        if ancount:
+            answer = b"\xc0\x0c" + struct.pack("!HHIH", QTYPE_A, 1, 60, 4) + socket.inet_aton("192.0.2.1")
+        return header + query[12:] + answer
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1)
+        self.sock.close()
+
+
+@pytest.fixture
+def stub():
+    resolver = StubResolver({"ok.test": 0, "missing.test": 3})
+    yield resolver
+    resolver.close()
+
+
+def test_build_and_parse_round_trip():
+    query = build_query("www.example.com", 0x1234)
+    assert StubResolver._qname(query) == "www.example.com"
+    assert parse_response(StubResolver._reply(query, 0), 0x1234) == (0, 1)
+    assert parse_response(StubResolver._reply(query, 0), 0x4321) is None
+    assert parse_response(query, 0x1234) is None  # not a response
+
+
+def test_parse_resolver():
+    assert parse_resolver("8.8.8.8") == ("8.8.8.8", 53)
+    assert parse_resolver("127.0.0.1:5353") == ("127.0.0.1", 5353)
+    assert parse_resolver("[::1]:5353") == ("::1", 5353)
+    assert parse_resolver("2001:db8::1") == ("2001:db8::1", 53)
+
+
+def test_query_success(stub):
+    result = DnsProber([stub.address], timeout_sec=1.0).query("ok.test")[stub.address]
+
+    assert result.ok
+    assert result.rcode == 0
+    assert result.answers == 1
+    assert result.rtt_ms is not None and result.rtt_ms < 1000
+    assert result.error == ""
+
+
+def test_query_error_rcode(stub):
+    result = DnsProber([stub.address], timeout_sec=1.0).query("missing.test")[stub.address]
+
+    assert not result.ok
+    assert result.rcode == 3
+    assert result.error == "rcode 3"
+
+
+def test_query_timeout(stub):
+    result = DnsProber([stub.address], timeout_sec=0.3).query("dropped.test")[stub.address]
+
+    assert not result.ok
+    assert result.rtt_ms is None
+    assert result.error == "timeout"
+    assert stub.queries == ["dropped.test"]
+
+
+def test_benchmark_and_recommend(stub):
+    silent = StubResolver({})
+    try:
+        prober = DnsProber([stub.address, silent.address, "not-an-ip"], timeout_sec=0.3)
+        stats = prober.benchmark(["ok.test"], rounds=2)
+    finally:
+        silent.close()
+
+    good = stats[stub.address]
+    assert (good.queries, good.failures, good.failure_rate) == (2, 0, 0.0)
+    assert good.min_ms <= good.median_ms and good.mean_ms is not None
+
+    dead = stats[silent.address]
+    assert (dead.queries, dead.failures, dead.failure_rate) == (2, 2, 1.0)
+    assert dead.median_ms is None
+
+    assert stats["not-an-ip"].failures == 2
+    assert DnsProber.recommend(stats) == stub.address
+    assert DnsProber.recommend({silent.address: dead}) is None
@@ -0,0 +1,217 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from networkfixer.core import executor as executor_module
+from networkfixer.core.connectivity import ConnectivityTester
+from networkfixer.core.executor import CommandExecutor
+from networkfixer.models.result import ProbeTarget, StepResult
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def sleeper(seconds):
+    return python(f"import time; time.sleep({seconds})")
+
+
+def test_run_many_returns_step_results_in_input_order():
+    executor = CommandExecutor(hide_window=False)
+    results = executor.run_many([
+        python("import time; time.sleep(0.2); print('first')"),
+        python("print('second')"),
+        python("import sys; print('third'); sys.exit(3)"),
+    ])
+
+    assert all(isinstance(r, StepResult) for r in results)
+    assert [r.output for r in results] == ["first", "second", "third"]
+    assert [r.ok for r in results] == [True, True, False]
+    assert results[0].return_code == 0
+    assert results[0].duration_ms > 0
+    assert results[2].return_code == 3
+    assert isinstance(results[2].error, subprocess.CalledProcessError)
+
+
+def test_run_many_without_check_accepts_failures():
+    executor = CommandExecutor(hide_window=False)
+    result, = executor.run_many([python("import sys; sys.exit(1)")], check=False)
+
+    assert result.ok
+    assert result.return_code == 1
+
+
+@pytest.mark.parametrize("limit, min_sec, max_sec", [(2, 1.0, 1.9), (4, 0.5, 0.95)])
+def test_run_many_respects_concurrency_limit(limit, min_sec, max_sec):
+    executor = CommandExecutor(hide_window=False, max_concurrency=limit)
+    started = time.monotonic()
+    results = executor.run_many([sleeper(0.5)] * 4)
+    elapsed = time.monotonic() - started
+
+    assert all(r.ok for r in results)
+    assert min_sec <= elapsed < max_sec
+
+
+def test_run_many_reports_each_result_as_it_finishes():
+    executor = CommandExecutor(hide_window=False)
+    finished = []
+    executor.run_many(
+        [sleeper(0.4), sleeper(0)],
+        on_result=lambda index, result: finished.append(index)
+    )
+
+    assert finished == [1, 0]
+
+
+def test_run_many_kills_commands_past_timeout():
+    executor = CommandExecutor(hide_window=False)
+    started = time.monotonic()
+    slow, fast = executor.run_many([sleeper(10), python("print('done')")], timeout=0.5)
+
+    assert time.monotonic() - started < 3
+    assert not slow.ok
+    assert isinstance(slow.error, subprocess.TimeoutExpired)
+    assert fast.ok and fast.output == "done"
+
+
+def test_run_many_with_no_commands():
+    assert CommandExecutor(hide_window=False).run_many([]) == []
+
+
+class ScriptedPingTester(ConnectivityTester):
+    """Pings run as Python scripts that exit 0 for addresses starting with "up"."""
+
+    def _ping_command(self, target):
+        return python(f"import sys; sys.exit(0 if {target!r}.startswith('up') else 1)")
+
+
+def test_subprocess_pings_run_through_run_many(monkeypatch):
+    monkeypatch.setattr(executor_module, "_executor", CommandExecutor(hide_window=False))
+    calls = []
+    run_many = CommandExecutor.run_many
+
+    def recording_run_many(self, commands, **kwargs):
+        calls.append(len(commands))
+        return run_many(self, commands, **kwargs)
+
+    monkeypatch.setattr(CommandExecutor, "run_many", recording_run_many)
+    tester = ScriptedPingTester(targets=(
+        ProbeTarget("a", ProbeTarget.KIND_PING, "up-a"),
+        ProbeTarget("b", ProbeTarget.KIND_PING, "down-b"),
+        ProbeTarget("c", ProbeTarget.KIND_PING, "up-c"),
+    ))
+    result = tester.test()
+
+    assert calls == [3]
+    assert result.results == {"a": True, "b": False, "c": True}
+
+
+class ChunkedStream:
+    """read1() hands out the given chunks one by one, then EOF."""
+
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+
+    def read1(self, size=-1):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+def lines(*chunks, encoding="utf-8"):
+    return list(CommandExecutor._iter_lines(ChunkedStream(*chunks), encoding))
+
+
+def test_iter_lines_joins_multibyte_char_split_across_chunks():
+    assert lines(b"caf\xc3", b"\xa9\nnext") == ["café", "next"]
+    # GBK "中文" split inside the first character
+    assert lines(b"\xd6", b"\xd0\xce\xc4\r\n", encoding="gbk") == ["中文"]
+
+
+def test_iter_lines_joins_crlf_split_across_chunks():
+    assert lines(b"one\r", b"\ntwo\r\n") == ["one", "two"]
+    assert lines(b"one\r", b"two") == ["one", "two"]
+    assert lines(b"last\r") == ["last"]
+
+
+def test_iter_lines_keeps_blank_lines_and_unterminated_tail():
+    assert lines(b"a\n\nb", b"c") == ["a", "", "bc"]
+
+
+def test_run_streaming_keeps_bounded_tail():
+    executor = CommandExecutor(hide_window=False)
+    seen = []
+    result = executor.run_streaming(
+        python("for i in range(10): print(i, flush=True)"),
+        on_line=seen.append,
+        tail_lines=3
+    )
+
+    assert result.ok
+    assert result.streamed
+    assert seen == [str(i) for i in range(10)]
+    assert result.output == "7\n8\n9"
+
+
+def test_run_streaming_kills_command_past_timeout():
+    executor = CommandExecutor(hide_window=False)
+    seen = []
+    started = time.monotonic()
+    result = executor.run_streaming(
+        python("import time; print('started', flush=True); time.sleep(10)"),
+        on_line=seen.append,
+        timeout=0.5
+    )
+
+    assert time.monotonic() - started < 3
+    assert seen == ["started"]
+    assert not result.ok
+    assert isinstance(result.error, subprocess.TimeoutExpired)
+
+
+@pytest.fixture
+def console_encoding(monkeypatch):
+    """Pins the detected console code page and returns a fresh executor."""
+    def pin(encoding):
+        monkeypatch.setattr(executor_module, "_console_encoding", encoding)
+        return CommandExecutor(hide_window=False)
+    return pin
+
+
+def test_utf8_output_is_not_garbled_by_single_byte_console_page(console_encoding):
+    executor = console_encoding("cp437")
+
+    assert executor._decode_output("Größe 1500".encode("cp437"), "netsh") == "Größe 1500"
+    # cp437 accepts any bytes; UTF-8 output must still be recognised
+    assert executor._decode_output("Größe 中文".encode("utf-8"), "netsh") == "Größe 中文"
+
+
+def test_codec_is_remembered_per_command(console_encoding):
+    executor = console_encoding("cp936")
+    text = "来自 114.114.114.114 的回复: 字节=32"
+
+    assert executor._decode_output(text.encode("gbk"), "ping") == text
+    assert executor._family_codecs["ping"] == "gbk"
+    assert executor._decode_output("Ethernet".encode("gbk"), "netsh") == "Ethernet"
+    assert "netsh" not in executor._family_codecs
+
+
+def test_streaming_falls_back_when_output_is_not_utf8(console_encoding):
+    executor = console_encoding("cp936")
+    assert executor._stream_codecs("ping") == ("utf-8", "gbk")
+
+    # The first GBK byte is a valid UTF-8 lead byte and stays buffered
+    # until the next chunk proves the output is not UTF-8
+    stream = ChunkedStream(b"ok\n\xd6", b"\xd0\xce\xc4\n")
+    assert list(executor._iter_lines(stream, "utf-8", "gbk")) == ["ok", "中文"]
+
+
+def test_run_streaming_decodes_utf8_and_console_page_output(console_encoding):
+    executor = console_encoding("cp936")
+    emit = "import sys; sys.stdout.buffer.write({!r})"
+
+    utf8 = executor.run_streaming(python(emit.format("中文 ok\n".encode("utf-8"))))
+    gbk = executor.run_streaming(python(emit.format("中文 ok\n".encode("gbk"))))
+
+    assert utf8.output == "中文 ok"
+    assert gbk.output == "中文 ok"
@@ -0,0 +1,146 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from networkfixer.core.http_probe import HttpProbe
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Keep-alive test server; the path picks the behaviour.
+
+    ``/``: 200 to HEAD and GET. ``/405`` and ``/501``: refuse HEAD.
+    ``/once``: answer, then drop the connection without saying so.
+    ``/slow``: stall the second request on a connection.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        self.requests_seen = 0
+
+    def do_HEAD(self):
+        self.requests_seen += 1
+        self.server.methods.append(("HEAD", self.path))
+        if self.path in ("/405", "/501"):
+            self._reply(int(self.path[1:]))
+            return
+        if self.path == "/slow" and self.requests_seen > 1:
+            time.sleep(1.0)
+        self._reply(200)
+        if self.path == "/once":
+            self.close_connection = True
+
+    def do_GET(self):
+        self.server.methods.append(("GET", self.path))
+        self._reply(200, b"hello")
+
+    def _reply(self, status, body=b""):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.connections = 0
+    httpd.methods = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server, path="/"):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_keep_alive_connection_is_reused(server):
+    probe = HttpProbe(timeout_sec=2.0, use_proxies=False)
+    try:
+        first = probe.check(url(server))
+        second = probe.check(url(server))
+    finally:
+        probe.close()
+
+    assert first.ok and second.ok
+    assert (first.reused, second.reused) == (False, True)
+    assert server.connections == 1
+
+
+def test_timing_fields(server):
+    probe = HttpProbe(timeout_sec=2.0, use_proxies=False)
+    try:
+        fresh = probe.check(url(server))
+        reused = probe.check(url(server))
+    finally:
+        probe.close()
+
+    assert fresh.status == 200
+    assert not fresh.via_proxy
+    for value in (fresh.dns_ms, fresh.connect_ms, fresh.ttfb_ms, fresh.total_ms):
+        assert value is not None and value >= 0
+    assert fresh.total_ms >= fresh.ttfb_ms
+
+    # A reused connection skips DNS and connect
+    assert reused.dns_ms is None
+    assert reused.connect_ms is None
+    assert reused.ttfb_ms is not None
+
+
+def test_stale_pooled_connection_is_retried_on_a_new_one(server):
+    probe = HttpProbe(timeout_sec=2.0, use_proxies=False)
+    try:
+        assert probe.check(url(server, "/once")).ok
+        time.sleep(0.1)  # let the server close its end
+
+        timing = probe.check(url(server, "/once"))
+    finally:
+        probe.close()
+
+    assert timing.ok, timing.error
+    assert not timing.reused
+    assert timing.connect_ms is not None
+    assert server.connections == 2
+
+
+@pytest.mark.parametrize("status", [405, 501])
+def test_head_rejected_falls_back_to_get(server, status):
+    probe = HttpProbe(timeout_sec=2.0, use_proxies=False)
+    try:
+        timing = probe.check(url(server, f"/{status}"))
+        idle = sum(len(connections) for connections in probe._idle.values())
+    finally:
+        probe.close()
+
+    assert timing.ok
+    assert timing.status == 200
+    assert server.methods == [("HEAD", f"/{status}"), ("GET", f"/{status}")]
+    # The GET body was not read, so its connection is not pooled
+    assert idle == 0
+
+
+def test_failed_request_on_pooled_connection_closes_it(server):
+    probe = HttpProbe(timeout_sec=0.2, use_proxies=False)
+    try:
+        assert probe.check(url(server, "/slow")).ok
+        (pooled,) = [conn for connections in probe._idle.values() for conn in connections]
+
+        timing = probe.check(url(server, "/slow"))
+    finally:
+        probe.close()
+
+    assert not timing.ok
+    assert timing.error
+    assert pooled.sock is None
@@ -0,0 +1,214 @@
+import math
+import threading
+
+import pytest
+
+from networkfixer.core.http_probe import HttpTiming
+from networkfixer.core.monitor import (
+    STATUS_BROKEN,
+    STATUS_OK,
+    STATUS_SLOW,
+    STATUS_UNKNOWN,
+    ConnectivityMonitor,
+    RingBuffer,
+    jitter,
+    percentile,
+)
+from networkfixer.core.probe import ProbeResult
+
+
+def test_ring_buffer_keeps_the_newest_samples_in_order():
+    buffer = RingBuffer(3)
+    for rtt in (1.0, 2.0, 3.0, 4.0, 5.0):
+        buffer.append(True, rtt)
+
+    assert len(buffer) == 3
+    assert buffer.rtts() == [3.0, 4.0, 5.0]
+    assert buffer.failures() == 0
+
+
+def test_ring_buffer_stores_failures_as_nan():
+    buffer = RingBuffer(4)
+    buffer.append(True, 10.0)
+    buffer.append(False, 99.0)  # an RTT reported with a failure is ignored
+    buffer.append(True, None)  # success without an RTT
+    buffer.append(False, None)
+
+    assert all(not math.isnan(rtt) for rtt in buffer.rtts())
+    assert buffer.rtts() == [10.0]
+    assert buffer.failures() == 2
+    assert buffer.trailing_failures() == 1
+    assert buffer.last_ok() is False
+
+
+def test_ring_buffer_trailing_failures_across_wraparound():
+    buffer = RingBuffer(3)
+    for ok in (True, True, False, False):
+        buffer.append(ok, 1.0)
+
+    # Oldest slot was overwritten; the newest two wrap around the array end
+    assert buffer.trailing_failures() == 2
+    assert buffer.failures() == 2
+
+    buffer.append(True, 2.0)
+    assert buffer.trailing_failures() == 0
+    assert buffer.last_ok() is True
+
+
+def test_ring_buffer_clear_and_capacity():
+    buffer = RingBuffer(2)
+    buffer.append(True, 1.0)
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert buffer.rtts() == []
+    assert buffer.last_ok() is None
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile([], 50) is None
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert percentile([7.0], 0) == 7.0
+
+
+def test_jitter_is_mean_consecutive_difference():
+    assert jitter([]) is None
+    assert jitter([5.0]) is None
+    assert jitter([10.0, 20.0, 10.0, 10.0]) == pytest.approx(20.0 / 3)
+
+
+class ScriptedEngine:
+    """Answers each round with the next (ok, rtt) from a script."""
+
+    timeout_sec = 0.1
+
+    def __init__(self, script):
+        self.script = list(script)
+
+    def probe(self, targets):
+        ok, rtt = self.script.pop(0)
+        return {t: ProbeResult(target=t, ok=ok, rtt_ms=rtt if ok else None) for t in targets}
+
+
+def run_rounds(script, **kwargs):
+    monitor = ConnectivityMonitor(
+        targets={"dns": "192.0.2.1"},
+        probe_engine=ScriptedEngine(script),
+        window_size=20,
+        **kwargs
+    )
+    for _ in script:
+        monitor.sample()
+    return monitor.stats("dns")
+
+
+def test_classify_without_samples_is_unknown():
+    monitor = ConnectivityMonitor(targets={"dns": "192.0.2.1"}, probe_engine=ScriptedEngine([]))
+    assert monitor.stats("dns").status == STATUS_UNKNOWN
+    assert monitor.status() == STATUS_UNKNOWN
+
+
+def test_classify_fast_and_reliable_is_ok():
+    stats = run_rounds([(True, 20.0)] * 10)
+
+    assert stats.status == STATUS_OK
+    assert stats.loss_pct == 0.0
+    assert stats.p50_ms == 20.0
+
+
+def test_classify_high_p95_is_slow():
+    stats = run_rounds([(True, 20.0)] * 18 + [(True, 900.0)] * 2, slow_p95_ms=500)
+
+    assert stats.p95_ms == 900.0
+    assert stats.status == STATUS_SLOW
+
+
+def test_classify_some_loss_is_slow():
+    stats = run_rounds([(True, 20.0)] * 4 + [(False, None)] + [(True, 20.0)] * 5, slow_loss_pct=5)
+
+    assert stats.loss_pct == 10.0
+    assert stats.status == STATUS_SLOW
+
+
+def test_classify_consecutive_failures_is_broken_despite_low_loss():
+    stats = run_rounds([(True, 20.0)] * 17 + [(False, None)] * 3, broken_after_failures=3)
+
+    assert stats.loss_pct == 15.0
+    assert stats.consecutive_failures == 3
+    assert stats.status == STATUS_BROKEN
+
+
+def test_classify_heavy_loss_is_broken_even_after_a_success():
+    stats = run_rounds([(False, None), (True, 20.0)] * 5, broken_loss_pct=50)
+
+    assert stats.consecutive_failures == 0
+    assert stats.status == STATUS_BROKEN
+
+
+class FakeHttpProbe:
+    """Records check and close calls; each check takes ``delay`` seconds."""
+
+    timeout_sec = 1.0
+
+    def __init__(self, ok=True, delay=0.0):
+        self.ok = ok
+        self.delay = delay
+        self.events = []
+        self.checking = threading.Event()
+
+    def check(self, url):
+        self.events.append("check")
+        self.checking.set()
+        threading.Event().wait(self.delay)
+        self.events.append("checked")
+        return HttpTiming(url=url, ok=self.ok, ttfb_ms=30.0 if self.ok else None)
+
+    def close(self):
+        self.events.append("close")
+
+
+def test_overall_status_is_the_best_target():
+    monitor = ConnectivityMonitor(
+        targets={"dns": "192.0.2.1"},
+        probe_engine=ScriptedEngine([(False, None)] * 3),
+        http_targets={"web": "http://192.0.2.2/"},
+        http_probe=FakeHttpProbe(ok=True)
+    )
+    for _ in range(3):
+        monitor.sample()
+
+    assert monitor.stats("dns").status == STATUS_BROKEN
+    assert monitor.stats("web").status == STATUS_OK
+    assert monitor.status() == STATUS_OK
+
+
+def test_stop_closes_http_probe_after_the_running_check():
+    # Longer than the probe engine's timeout, well within one HTTP check's
+    http_probe = FakeHttpProbe(delay=1.5)
+    monitor = ConnectivityMonitor(
+        targets={"dns": "192.0.2.1"},
+        probe_engine=ScriptedEngine([(True, 1.0)] * 10),
+        interval_sec=60,
+        http_targets={"web": "http://192.0.2.2/"},
+        http_probe=http_probe
+    )
+    monitor.start()
+    assert http_probe.checking.wait(5)
+    monitor.stop()
+
+    assert http_probe.events == ["check", "checked", "close"]
+    assert not monitor.is_running
+
+
+def test_stop_without_start_closes_http_probe():
+    http_probe = FakeHttpProbe()
+    ConnectivityMonitor(targets={}, http_probe=http_probe).stop()
+
+    assert http_probe.events == ["close"]
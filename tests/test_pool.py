@@ -0,0 +1,66 @@
+from networkfixer.core import pool
+from networkfixer.core.adapters import AdapterBackend, AdapterManager
+from networkfixer.models.result import AdapterInfo
+from tests.test_connectivity import FakeTester
+
+
+class StaticBackend(AdapterBackend):
+    name = "static"
+
+    def list_adapters(self):
+        return [AdapterInfo(name="Ethernet")]
+
+
+class CountingBackend(StaticBackend):
+    def __init__(self):
+        self.calls = 0
+
+    def list_adapters(self):
+        self.calls += 1
+        return super().list_adapters()
+
+
+def test_task_pool_job_fans_out_to_single_worker(single_worker_pool):
+    tester = FakeTester({"required": True, "slow": True})
+    result = pool.submit_task(tester.test).result(timeout=3)
+
+    assert result.all_ok
+
+
+def test_worker_pool_job_does_not_wait_on_its_own_pool(single_worker_pool):
+    tester = FakeTester({"required": True, "slow": False})
+    result = pool.submit(tester.test).result(timeout=3)
+
+    assert result.results == {"required": True, "slow": False}
+
+
+def test_adapter_refresh_inside_worker_pool(single_worker_pool):
+    manager = AdapterManager(cache_ttl=60, backends=[StaticBackend()])
+    adapters = pool.submit(manager.refresh_info, True).result(timeout=3)
+
+    assert [a.name for a in adapters] == ["Ethernet"]
+
+
+def test_fanout_executor_runs_inline_on_worker_threads(single_worker_pool):
+    assert pool.get_fanout_executor() is pool.get_worker_pool()
+    executor = pool.submit(pool.get_fanout_executor).result(timeout=3)
+    assert executor is not pool.get_worker_pool()
+    assert executor.submit(lambda: 42).result(timeout=0) == 42
+
+
+def test_inline_refresh_keeps_queued_refresh_registered(single_worker_pool):
+    backend = CountingBackend()
+    manager = AdapterManager(cache_ttl=60, backends=[backend])
+
+    def job():
+        # The pool's only worker is busy here, so this refresh stays queued
+        queued = manager.revalidate(force=True)
+        manager.refresh_info()
+        return queued, manager.revalidate(force=True)
+
+    queued, joined = pool.submit(job).result(timeout=3)
+
+    assert joined is queued
+    assert [a.name for a in queued.result(timeout=3)] == ["Ethernet"]
+    assert backend.calls == 2
+    assert manager._inflight is None
@@ -0,0 +1,151 @@
+import socket
+import time
+
+from networkfixer.core.probe import ProbeEngine
+
+
+def _listener():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    return server
+
+
+def _closed_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_tcp_probe_open_port():
+    server = _listener()
+    port = server.getsockname()[1]
+    try:
+        engine = ProbeEngine(timeout_sec=1.0, tcp_ports=(port,), use_icmp=False)
+        result = engine.probe(["127.0.0.1"])["127.0.0.1"]
+    finally:
+        server.close()
+
+    assert result.ok
+    assert result.method == "tcp"
+    assert result.port == port
+    assert result.rtt_ms is not None and 0 <= result.rtt_ms < 1000
+
+
+def test_tcp_probe_closed_port_fails():
+    port = _closed_port()
+    engine = ProbeEngine(
+        timeout_sec=0.5, tcp_ports=(port,), use_icmp=False, refused_is_reachable=False
+    )
+    result = engine.probe(["127.0.0.1"])["127.0.0.1"]
+
+    assert not result.ok
+    assert result.rtt_ms is None
+    assert result.port is None
+
+
+def test_tcp_probe_refused_counts_as_reachable_by_default():
+    port = _closed_port()
+    engine = ProbeEngine(timeout_sec=0.5, tcp_ports=(port,), use_icmp=False)
+    result = engine.probe(["127.0.0.1"])["127.0.0.1"]
+
+    assert result.ok
+    assert result.port == port
+
+
+def test_tcp_probe_first_answering_port_wins():
+    server = _listener()
+    port = server.getsockname()[1]
+    try:
+        engine = ProbeEngine(
+            timeout_sec=1.0,
+            tcp_ports=(_closed_port(), port),
+            use_icmp=False,
+            refused_is_reachable=False
+        )
+        result = engine.probe(["127.0.0.1"])["127.0.0.1"]
+    finally:
+        server.close()
+
+    assert result.ok
+    assert result.port == port
+
+
+def test_unresolvable_target_fails():
+    engine = ProbeEngine(timeout_sec=0.5, tcp_ports=(80,), use_icmp=False)
+    result = engine.probe(["host.invalid"])["host.invalid"]
+
+    assert not result.ok
+
+
+def test_slow_resolution_counts_against_timeout(monkeypatch):
+    real_getaddrinfo = socket.getaddrinfo
+
+    def slow_getaddrinfo(host, *args, flags=0, **kwargs):
+        if host == "slow.example" and not flags & socket.AI_NUMERICHOST:
+            time.sleep(5)
+        return real_getaddrinfo(host, *args, flags=flags, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    server = _listener()
+    port = server.getsockname()[1]
+    try:
+        engine = ProbeEngine(timeout_sec=0.5, tcp_ports=(port,), use_icmp=False)
+        started = time.monotonic()
+        results = engine.probe(["slow.example", "127.0.0.1"])
+        elapsed = time.monotonic() - started
+    finally:
+        server.close()
+
+    assert elapsed < 1.5
+    assert not results["slow.example"].ok
+    assert results["127.0.0.1"].ok
+
+
+def test_each_host_is_resolved_once(monkeypatch):
+    real_getaddrinfo = socket.getaddrinfo
+    lookups = []
+
+    def counting_getaddrinfo(host, *args, **kwargs):
+        lookups.append(host)
+        return real_getaddrinfo(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+    engine = ProbeEngine(
+        timeout_sec=0.5,
+        tcp_ports=(_closed_port(), _closed_port(), _closed_port()),
+        use_icmp=False,
+        refused_is_reachable=False
+    )
+    engine.probe(["127.0.0.1"])
+
+    assert lookups == ["127.0.0.1"]
+
+
+class FilteredIcmpSocket(socket.socket):
+    """Opens like an ICMP socket, but every echo request is silently dropped."""
+
+    def sendto(self, data, address):
+        return len(data)
+
+
+def test_targets_without_icmp_reply_fall_back_to_tcp():
+    server = _listener()
+    port = server.getsockname()[1]
+    icmp = FilteredIcmpSocket(socket.AF_INET, socket.SOCK_DGRAM)
+    icmp.setblocking(False)
+    try:
+        engine = ProbeEngine(timeout_sec=1.0, tcp_ports=(port,))
+        engine._open_icmp_socket = lambda: icmp
+        started = time.monotonic()
+        result = engine.probe(["127.0.0.1"])["127.0.0.1"]
+        elapsed = time.monotonic() - started
+    finally:
+        server.close()
+
+    assert result.ok
+    assert result.method == "tcp"
+    assert result.port == port
+    assert 0.4 <= elapsed < 1.0
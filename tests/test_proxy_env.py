@@ -0,0 +1,267 @@
+import os
+import socket
+import time
+
+import pytest
+
+from networkfixer.core import registry as registry_module
+from networkfixer.core.operations import NetworkOperations
+from networkfixer.core.proxy_env import (
+    ProxyEnvScanner,
+    ProxyGhostKiller,
+    ProxyHealthCache,
+    ProxyHealthChecker,
+)
+from networkfixer.core.registry import HKCU, HKLM, InMemoryRegistry, ProxyRegistry
+
+
+def _listener():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    return server
+
+
+def test_check_many_alive_and_dead():
+    server = _listener()
+    alive_port = server.getsockname()[1]
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    dead_port = closed.getsockname()[1]
+    closed.close()
+    try:
+        verdicts = ProxyHealthChecker(timeout=1.0).check_many([
+            f"http://127.0.0.1:{alive_port}",
+            f"127.0.0.1:{alive_port}",
+            f"http://127.0.0.1:{dead_port}",
+        ])
+    finally:
+        server.close()
+
+    assert verdicts == {
+        f"http://127.0.0.1:{alive_port}": True,
+        f"127.0.0.1:{alive_port}": True,
+        f"http://127.0.0.1:{dead_port}": False,
+    }
+
+
+def test_slow_resolver_does_not_stretch_the_scan(monkeypatch):
+    real_getaddrinfo = socket.getaddrinfo
+
+    def slow_getaddrinfo(host, *args, **kwargs):
+        # Numeric-only lookups never reach a resolver
+        if host == "slow.proxy.test" and not kwargs.get("flags", 0) & socket.AI_NUMERICHOST:
+            time.sleep(5)
+        return real_getaddrinfo(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    server = _listener()
+    port = server.getsockname()[1]
+    try:
+        started = time.monotonic()
+        verdicts = ProxyHealthChecker(timeout=0.5).check_many([
+            "http://slow.proxy.test:8080",
+            f"http://127.0.0.1:{port}",
+        ])
+        elapsed = time.monotonic() - started
+    finally:
+        server.close()
+
+    assert verdicts == {"http://slow.proxy.test:8080": False, f"http://127.0.0.1:{port}": True}
+    # Lookups and connects share a single timeout
+    assert elapsed < 0.9
+
+
+def test_name_resolved_within_timeout_is_connected(monkeypatch):
+    real_getaddrinfo = socket.getaddrinfo
+
+    def slow_getaddrinfo(host, *args, **kwargs):
+        if host == "proxy.test":
+            if kwargs.get("flags", 0) & socket.AI_NUMERICHOST:
+                raise socket.gaierror(socket.EAI_NONAME, "not numeric")
+            time.sleep(0.3)
+            host = "127.0.0.1"
+        return real_getaddrinfo(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    server = _listener()
+    port = server.getsockname()[1]
+    try:
+        started = time.monotonic()
+        verdicts = ProxyHealthChecker(timeout=1.0).check_many([f"http://proxy.test:{port}"])
+        elapsed = time.monotonic() - started
+    finally:
+        server.close()
+
+    assert verdicts == {f"http://proxy.test:{port}": True}
+    assert elapsed < 0.9
+
+
+def _scanner_registry(user_values, machine_values=None):
+    registry = InMemoryRegistry()
+    registry.add_key(HKCU, ProxyEnvScanner.REGISTRY_USER_PATH, user_values)
+    if machine_values is None:
+        registry.add_key(HKLM, ProxyEnvScanner.REGISTRY_MACHINE_PATH)
+        registry.deny(HKLM, ProxyEnvScanner.REGISTRY_MACHINE_PATH)
+    else:
+        registry.add_key(HKLM, ProxyEnvScanner.REGISTRY_MACHINE_PATH, machine_values)
+    return registry
+
+
+@pytest.fixture
+def clean_process_env(monkeypatch):
+    for name in list(os.environ):
+        if name.lower() in ProxyEnvScanner._TRACKED_NAMES_LOWER:
+            monkeypatch.delenv(name)
+
+
+def test_scanner_matches_mixed_case_names(clean_process_env, monkeypatch):
+    monkeypatch.setenv("Https_Proxy", "http://127.0.0.1:3")
+    registry = _scanner_registry(
+        {"Http_Proxy": "http://127.0.0.1:1", "Path": r"C:\\Windows", "ALL_proxy": ""},
+        {"FTP_PROXY": "http://127.0.0.1:2"},
+    )
+
+    found = {(p.scope, p.name, p.value) for p in ProxyEnvScanner(registry).scan_all()}
+    assert found == {
+        ("Process", "Https_Proxy", "http://127.0.0.1:3"),
+        ("User", "Http_Proxy", "http://127.0.0.1:1"),
+        ("Machine", "FTP_PROXY", "http://127.0.0.1:2"),
+    }
+
+
+def test_scanner_tolerates_denied_machine_key(clean_process_env):
+    registry = _scanner_registry({"HTTP_PROXY": "http://127.0.0.1:1"})
+
+    found = [(p.scope, p.name) for p in ProxyEnvScanner(registry).scan_all()]
+    assert found == [("User", "HTTP_PROXY")]
+
+
+def test_no_proxy_is_reported_but_never_checked_or_cleared(clean_process_env):
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    dead = f"http://127.0.0.1:{closed.getsockname()[1]}"
+    closed.close()
+    registry = _scanner_registry({"Http_Proxy": dead, "No_Proxy": "localhost,127.0.0.1"})
+    killer = ProxyGhostKiller(health_check_timeout=0.5, registry=registry)
+
+    scanned = {p.name for p in killer.scanner.scan_all()}
+    assert scanned == {"Http_Proxy", "No_Proxy"}
+
+    healthy, dead_proxies = killer.scan_and_test()
+    assert healthy == []
+    assert [(p.name, p.is_alive) for p in dead_proxies] == [("Http_Proxy", False)]
+
+    assert killer.clear_user_env().ok
+    assert registry.read_values(HKCU, ProxyEnvScanner.REGISTRY_USER_PATH) == {
+        "No_Proxy": "localhost,127.0.0.1"
+    }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_health_cache_alive_and_dead_verdicts_expire_separately():
+    clock = FakeClock()
+    cache = ProxyHealthCache(positive_ttl=30, negative_ttl=10, clock=clock)
+    cache.put(("alive", 1), True)
+    cache.put(("dead", 1), False)
+
+    clock.now += 9.9
+    assert cache.get(("alive", 1)) is True
+    assert cache.get(("dead", 1)) is False
+
+    clock.now += 0.1
+    assert cache.get(("dead", 1)) is None
+    assert cache.get(("alive", 1)) is True
+
+    clock.now += 20
+    assert cache.get(("alive", 1)) is None
+    assert cache.stats() == {"hits": 3, "misses": 2, "size": 0}
+
+
+def test_health_cache_zero_ttl_disables_caching():
+    cache = ProxyHealthCache(positive_ttl=30, negative_ttl=0, clock=FakeClock())
+    cache.put(("dead", 1), False)
+
+    assert cache.get(("dead", 1)) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_health_cache_evicts_least_recently_used():
+    cache = ProxyHealthCache(max_entries=2, clock=FakeClock())
+    cache.put(("a", 1), True)
+    cache.put(("b", 1), True)
+    assert cache.get(("a", 1)) is True  # "b" is now the oldest
+
+    cache.put(("c", 1), True)
+    assert cache.get(("b", 1)) is None
+    assert cache.get(("a", 1)) is True
+    assert cache.get(("c", 1)) is True
+
+
+def test_health_cache_invalidate_one_or_all():
+    cache = ProxyHealthCache(clock=FakeClock())
+    cache.put(("a", 1), True)
+    cache.put(("b", 1), False)
+
+    cache.invalidate(("a", 1))
+    assert cache.get(("a", 1)) is None
+    assert cache.get(("b", 1)) is False
+
+    cache.invalidate()
+    assert cache.stats()["size"] == 0
+
+
+def test_check_many_serves_cached_verdicts_without_probing():
+    clock = FakeClock()
+    cache = ProxyHealthCache(clock=clock)
+    checker = ProxyHealthChecker(timeout=0.5, cache=cache)
+    cache.put(("127.0.0.1", 9), True)
+
+    probed = []
+    checker._tcp_ping_many = lambda endpoints: probed.append(endpoints) or {e: False for e in endpoints}
+    assert checker.check_many(["127.0.0.1:9", "http://127.0.0.1:10"]) == {
+        "127.0.0.1:9": True,
+        "http://127.0.0.1:10": False,
+    }
+    assert probed == [{("127.0.0.1", 10)}]
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 2}
+
+
+def test_auto_fix_invalidates_health_cache(clean_process_env):
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    dead = f"http://127.0.0.1:{closed.getsockname()[1]}"
+    closed.close()
+    registry = _scanner_registry({"HTTP_PROXY": dead})
+    cache = ProxyHealthCache(clock=FakeClock())
+    killer = ProxyGhostKiller(health_check_timeout=0.5, health_cache=cache, registry=registry)
+
+    results = killer.auto_fix()
+
+    assert results["user"].ok
+    assert cache.stats()["size"] == 0
+
+
+def test_operations_invalidate_health_cache_on_proxy_changes(clean_process_env, monkeypatch):
+    backend = InMemoryRegistry()
+    backend.add_key(HKCU, ProxyRegistry.REGISTRY_PATH, {"ProxyEnable": 1, "ProxyServer": "127.0.0.1:7890"})
+    monkeypatch.setattr(registry_module, "_backend", backend)
+    ops = NetworkOperations()
+    cache = ops.proxy_ghost_killer.health_checker.cache
+
+    cache.put(("127.0.0.1", 7890), True)
+    assert ops.disable_proxy().ok
+    assert cache.stats()["size"] == 0
+
+    ops.proxy_watcher.refresh()
+    cache.put(("127.0.0.1", 7890), True)
+    backend.add_key(HKCU, ProxyEnvScanner.REGISTRY_USER_PATH, {"HTTP_PROXY": "http://127.0.0.1:1"})
+    assert ops.proxy_watcher.refresh()
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,59 @@
+import pytest
+
+from networkfixer.core.registry import HKCU, InMemoryRegistry, ProxyRegistry, RegistryBackend
+
+PATH = ProxyRegistry.REGISTRY_PATH
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RegistryBackend()
+
+
+def test_in_memory_registry_is_case_insensitive():
+    registry = InMemoryRegistry()
+    registry.add_key(HKCU, "Environment", {"Http_Proxy": "http://127.0.0.1:1"})
+
+    registry.set_values(HKCU, "ENVIRONMENT", {"HTTP_PROXY": ("REG_SZ", "http://127.0.0.1:2")})
+    assert registry.read_values(HKCU, "environment") == {"HTTP_PROXY": "http://127.0.0.1:2"}
+
+    assert registry.delete_values(HKCU, "Environment", ["http_proxy", "https_proxy"]) == ["http_proxy"]
+    assert registry.read_values(HKCU, "Environment") == {}
+
+
+def test_in_memory_registry_errors():
+    registry = InMemoryRegistry()
+    with pytest.raises(FileNotFoundError):
+        registry.read_values(HKCU, "Missing")
+
+    registry.add_key(HKCU, "Locked")
+    registry.deny(HKCU, "Locked")
+    with pytest.raises(PermissionError):
+        registry.read_values(HKCU, "Locked")
+
+
+def test_proxy_registry_status_and_disable():
+    registry = InMemoryRegistry()
+    registry.add_key(HKCU, PATH, {"ProxyEnable": 1, "ProxyServer": "127.0.0.1:7890"})
+    proxy = ProxyRegistry(registry)
+
+    assert proxy.get_status() == (True, "127.0.0.1:7890")
+
+    result = proxy.disable()
+    assert result.ok
+    assert proxy.get_status() == (False, "")
+
+
+def test_proxy_registry_missing_key_reads_as_disabled():
+    assert ProxyRegistry(InMemoryRegistry()).get_status() == (False, "")
+
+
+def test_proxy_registry_disable_permission_denied():
+    registry = InMemoryRegistry()
+    registry.add_key(HKCU, PATH, {"ProxyEnable": 1})
+    registry.deny(HKCU, PATH)
+
+    result = ProxyRegistry(registry).disable()
+    assert not result.ok
+    assert result.output == "Permission denied"
+    assert isinstance(result.error, PermissionError)
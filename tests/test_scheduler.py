@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+
+from networkfixer.core.operations import Step
+from networkfixer.core.scheduler import StepScheduler
+from networkfixer.models.result import StepResult
+
+
+class Recorder:
+    """Builds fake steps that record when they start and finish."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+
+    def step(self, name, duration=0.1, ok=True, **kwargs):
+        def func():
+            with self.lock:
+                self.events.append(("start", name))
+            time.sleep(duration)
+            with self.lock:
+                self.events.append(("end", name))
+            return StepResult(ok=ok, title=name)
+        return Step(f"step.{name}", func, **kwargs)
+
+    def order(self, kind):
+        return [name for event, name in self.events if event == kind]
+
+    def running_together(self):
+        """Sets of step names that were running at the same time."""
+        running, overlaps = set(), []
+        for event, name in self.events:
+            if event == "start":
+                running.add(name)
+                if len(running) > 1:
+                    overlaps.append(set(running))
+            else:
+                running.discard(name)
+        return overlaps
+
+    def finished_before(self, first, second):
+        return self.events.index(("end", first)) < self.events.index(("start", second))
+
+
+def test_dependencies_finish_before_dependents_start():
+    rec = Recorder()
+    steps = [
+        rec.step("c", depends_on=("a", "b")),
+        rec.step("a"),
+        rec.step("b", depends_on=("a",)),
+    ]
+    results = StepScheduler(max_workers=3).run(steps)
+
+    assert rec.finished_before("a", "b")
+    assert rec.finished_before("b", "c")
+    # Results come back in plan order, not completion order
+    assert [r.title for r in results] == ["c", "a", "b"]
+
+
+def test_independent_steps_run_in_parallel():
+    rec = Recorder()
+    StepScheduler(max_workers=3).run([rec.step("a"), rec.step("b"), rec.step("c")])
+
+    assert {"a", "b", "c"} in rec.running_together()
+
+
+def test_conflicting_steps_never_run_together():
+    rec = Recorder()
+    steps = [
+        rec.step("dns", conflicts=("ip",)),
+        rec.step("ip"),
+        rec.step("proxy"),
+    ]
+    StepScheduler(max_workers=3).run(steps)
+
+    assert len(rec.order("end")) == 3
+    assert not any({"dns", "ip"} <= overlap for overlap in rec.running_together())
+    assert {"dns", "proxy"} in rec.running_together()
+
+
+def test_exclusive_step_runs_alone():
+    rec = Recorder()
+    steps = [
+        rec.step("a"),
+        rec.step("adapter", exclusive=True),
+        rec.step("b"),
+        rec.step("c"),
+    ]
+    StepScheduler(max_workers=3).run(steps)
+
+    assert len(rec.order("end")) == 4
+    assert not any("adapter" in overlap for overlap in rec.running_together())
+
+
+def test_cancel_stops_dispatching_but_lets_running_steps_finish():
+    rec = Recorder()
+    cancelled = threading.Event()
+    steps = [rec.step("a"), rec.step("b", depends_on=("a",)), rec.step("c", depends_on=("b",))]
+
+    results = StepScheduler(max_workers=3).run(
+        steps,
+        cancel_check=cancelled.is_set,
+        result_callback=lambda step, result: cancelled.set()
+    )
+
+    assert rec.order("start") == ["a"]
+    assert rec.order("end") == ["a"]
+    assert [r.title for r in results] == ["a"]
+
+
+def test_callbacks_report_progress_and_results():
+    rec = Recorder()
+    progress, finished = [], []
+    StepScheduler(max_workers=1).run(
+        [rec.step("a"), rec.step("b", ok=False)],
+        progress_callback=lambda current, total, key: progress.append((current, total, key)),
+        result_callback=lambda step, result: finished.append((step.name, result.ok))
+    )
+
+    assert progress == [(1, 2, "step.a"), (2, 2, "step.b")]
+    assert finished == [("a", True), ("b", False)]
+
+
+def test_raising_step_becomes_failed_result():
+    def boom():
+        raise RuntimeError("boom")
+
+    result, = StepScheduler().run([Step("step.boom", boom)])
+
+    assert not result.ok
+    assert result.title == "boom"
+    assert isinstance(result.error, RuntimeError)
+
+
+def test_dependency_cycle_is_rejected_before_anything_runs():
+    rec = Recorder()
+    steps = [
+        rec.step("a", depends_on=("c",)),
+        rec.step("b", depends_on=("a",)),
+        rec.step("c", depends_on=("b",)),
+        rec.step("free"),
+    ]
+
+    with pytest.raises(ValueError, match="a, b, c"):
+        StepScheduler().run(steps)
+    assert rec.events == []
+
+
+def test_unknown_and_self_dependencies_are_ignored():
+    rec = Recorder()
+    steps = [
+        rec.step("a", depends_on=("not_in_plan",)),
+        rec.step("b", depends_on=("b", "a")),
+    ]
+    results = StepScheduler().run(steps)
+
+    assert [r.title for r in results] == ["a", "b"]
+    assert rec.finished_before("a", "b")
@@ -0,0 +1,126 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from networkfixer.core.singleflight import SingleFlight
+
+
+class GatedCall:
+    """Counts calls and blocks each one until the test opens the gate."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.entered.set()
+        assert self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class JoinCounter(logging.Handler):
+    """Counts followers that joined an in-flight call (SingleFlight logs each one)."""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.joined = threading.Semaphore(0)
+
+    def emit(self, record):
+        if record.getMessage().startswith("Joining in-flight call"):
+            self.joined.release()
+
+
+def _join_while_in_flight(flights, key, call, callers=4):
+    """Start a leader, then more callers for the same key, then release them all."""
+    logger = logging.getLogger("networkfixer.core.singleflight")
+    counter = JoinCounter()
+    level = logger.level
+    logger.addHandler(counter)
+    logger.setLevel(logging.DEBUG)
+    try:
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            leader = pool.submit(flights.do, key, call)
+            assert call.entered.wait(5)
+            followers = [pool.submit(flights.do, key, call) for _ in range(callers - 1)]
+            for _ in followers:
+                assert counter.joined.acquire(timeout=5)
+            call.gate.set()
+            return [leader] + followers
+    finally:
+        logger.removeHandler(counter)
+        logger.setLevel(level)
+
+
+def test_concurrent_callers_share_one_run_and_result():
+    flights = SingleFlight()
+    result = object()
+    call = GatedCall(result=result)
+
+    futures = _join_while_in_flight(flights, "key", call)
+
+    assert [f.result(timeout=5) for f in futures] == [result] * 4
+    assert call.calls == 1
+
+
+def test_concurrent_callers_share_the_exception():
+    flights = SingleFlight()
+    error = RuntimeError("boom")
+    call = GatedCall(error=error)
+
+    futures = _join_while_in_flight(flights, "key", call)
+
+    for future in futures:
+        with pytest.raises(RuntimeError) as raised:
+            future.result(timeout=5)
+        assert raised.value is error
+    assert call.calls == 1
+    assert not flights.in_flight("key")
+
+
+def test_different_keys_do_not_block_each_other():
+    flights = SingleFlight()
+    blocked = GatedCall(result="a")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(flights.do, "a", blocked)
+        assert blocked.entered.wait(5)
+
+        assert flights.do("b", lambda: "b") == "b"
+        assert flights.in_flight("a")
+        assert not flights.in_flight("b")
+
+        blocked.gate.set()
+        assert first.result(timeout=5) == "a"
+
+
+def test_calls_after_completion_run_afresh():
+    flights = SingleFlight()
+    calls = []
+
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 1
+    assert flights.do("key", lambda: calls.append(1) or len(calls)) == 2
+    assert not flights.in_flight("key")
+
+
+def test_in_flight_is_cleared_after_an_error():
+    flights = SingleFlight()
+
+    def fail():
+        assert flights.in_flight("key")
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        flights.do("key", fail)
+    assert not flights.in_flight("key")
+    assert flights.do("key", lambda: "ok") == "ok"
+
+
+def test_arguments_are_passed_through():
+    assert SingleFlight().do("key", lambda a, b=0: a + b, 1, b=2) == 3
@@ -0,0 +1,130 @@
+import threading
+
+from networkfixer.utils.thread import UISafeCaller
+
+
+class FakeRoot:
+    """Records after() calls; the test fires them by hand."""
+
+    def __init__(self):
+        self.pending = {}
+        self.delays = {}
+        self._ids = 0
+
+    def after(self, ms, func):
+        self._ids += 1
+        after_id = f"after#{self._ids}"
+        self.pending[after_id] = func
+        self.delays[after_id] = ms
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def pending_delays(self):
+        return sorted(self.delays[after_id] for after_id in self.pending)
+
+    def fire(self):
+        callbacks, self.pending = list(self.pending.values()), {}
+        for func in callbacks:
+            func()
+
+    def fire_soonest(self):
+        """Fire only the callbacks with the shortest delay, like Tk would first."""
+        soonest = min(self.delays[after_id] for after_id in self.pending)
+        for after_id in [a for a in self.pending if self.delays[a] == soonest]:
+            self.pending.pop(after_id)()
+
+
+def idle(root, ticks=5):
+    for _ in range(ticks):
+        root.fire()
+
+
+def test_reentrant_posts_keep_a_single_poll_chain():
+    root = FakeRoot()
+    caller = UISafeCaller(root)
+    idle(root)  # back off so posts from the Tk thread would wake the dispatcher
+    seen = []
+
+    def reposting(n):
+        seen.append(n)
+        if n < 5:
+            caller.call(reposting, n + 1)
+
+    # Posted from a worker: a wake is scheduled next to the backed-off tick,
+    # and whichever runs first must not leave two chains behind
+    thread = threading.Thread(target=caller.call, args=(reposting, 0))
+    thread.start()
+    thread.join()
+    assert len(root.pending) == 2
+
+    for _ in range(10):
+        root.fire()
+        assert len(root.pending) == 1
+
+    assert seen == [0, 1, 2, 3, 4, 5]
+
+
+def test_post_from_tk_thread_wakes_idle_dispatcher():
+    root = FakeRoot()
+    caller = UISafeCaller(root)
+    idle(root)
+    assert caller._interval == caller.max_poll_interval_ms
+
+    caller.call(lambda: None)
+    assert len(root.pending) == 1
+    assert caller._interval == caller.poll_interval_ms
+
+
+def test_post_from_worker_wakes_idle_dispatcher_once():
+    root = FakeRoot()
+    caller = UISafeCaller(root)
+    idle(root)
+    assert root.pending_delays() == [caller.max_poll_interval_ms]
+    seen = []
+
+    def worker():
+        for i in range(3):
+            caller.call(seen.append, i)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    # One wake for the burst, not one per post
+    assert root.pending_delays() == [0, caller.max_poll_interval_ms]
+
+    root.fire_soonest()  # the wake replaces the backed-off tick with an immediate one
+    assert seen == []
+    assert root.pending_delays() == [0]
+    root.fire_soonest()
+    assert seen == [0, 1, 2]
+    assert root.pending_delays() == [caller.poll_interval_ms]
+
+
+def test_call_latest_coalesces_worker_updates():
+    root = FakeRoot()
+    caller = UISafeCaller(root)
+    applied = []
+
+    def worker():
+        for i in range(100):
+            caller.call_latest("progress", applied.append, i)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    root.fire()
+
+    assert applied == [99]
+    assert len(root.pending) == 1
+
+
+def test_stop_cancels_pending_poll():
+    root = FakeRoot()
+    caller = UISafeCaller(root)
+    caller.stop()
+
+    assert root.pending == {}
+    caller.call(lambda: None)
+    assert root.pending == {}
@@ -0,0 +1,184 @@
+from types import SimpleNamespace
+
+from networkfixer.core.operations import NetworkOperations
+from networkfixer.core.watchdog import RepairWatchdog
+from networkfixer.models.result import StepResult
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubOperations:
+    """Offline until the step named ``fixed_by`` runs; records every step."""
+
+    build_steps = NetworkOperations.build_steps
+
+    def __init__(self, fixed_by=None, dead_vars=()):
+        self.online = False
+        self.fixed_by = fixed_by
+        self.dead_vars = list(dead_vars)
+        self.ran = []
+        self.proxy_ghost_killer = SimpleNamespace(
+            health_checker=SimpleNamespace(check_proxy=lambda server: True)
+        )
+
+    def test_connectivity(self, fast=False):
+        return SimpleNamespace(all_ok=self.online)
+
+    def scan_proxy_env(self):
+        return [], [SimpleNamespace(scope="Process", name=name) for name in self.dead_vars]
+
+    def get_proxy_status(self):
+        return False, ""
+
+    def execute_steps(self, steps, cancel_check=None):
+        return [step.func() for step in steps]
+
+    def _step(self, name):
+        self.ran.append(name)
+        if name == self.fixed_by:
+            self.online = True
+        return StepResult(ok=True, title=name)
+
+    def clear_process_proxy_env(self, var_names):
+        self.cleared = list(var_names)
+        return self._step("clear_proxy_env")
+
+    def disable_proxy(self):
+        return self._step("disable_proxy")
+
+    def flush_dns(self):
+        return self._step("flush_dns")
+
+    def reset_winsock(self):
+        return self._step("reset_winsock")
+
+    def reset_ip(self):
+        return self._step("reset_ip")
+
+    def reset_tcpip(self):
+        return self._step("reset_tcpip")
+
+
+def make_watchdog(ops, clock, **kwargs):
+    options = dict(
+        failures_before_repair=1,
+        min_repair_interval_sec=30,
+        max_repairs_per_hour=100,
+        backoff_initial_sec=60,
+        backoff_max_sec=200,
+        verify_delay_sec=0,
+    )
+    options.update(kwargs)
+    return RepairWatchdog(ops, clock=clock, **options)
+
+
+def plan_of(attempt):
+    return attempt.plan if attempt is not None else None
+
+
+def test_repairs_only_after_consecutive_failed_checks():
+    ops = StubOperations(fixed_by="flush_dns")
+    watchdog = make_watchdog(ops, FakeClock(), failures_before_repair=2)
+
+    assert watchdog.check_once() is None
+    assert ops.ran == []
+
+    attempt = watchdog.check_once()
+    assert attempt.plan == "dns"
+    assert attempt.recovered
+    assert ops.ran == ["flush_dns"]
+
+
+def test_unrecovered_plans_escalate_up_the_ladder():
+    ops = StubOperations()
+    clock = FakeClock()
+    watchdog = make_watchdog(ops, clock)
+
+    plans = []
+    for _ in range(3):
+        plans.append(plan_of(watchdog.check_once()))
+        clock.now += 30
+
+    # No dead proxy, so the ladder starts at dns
+    assert plans == ["dns", "winsock", "tcpip"]
+    assert ops.ran == ["flush_dns", "reset_winsock", "reset_ip", "reset_tcpip"]
+
+
+def test_repair_interval_and_hourly_limit():
+    ops = StubOperations()
+    clock = FakeClock()
+    watchdog = make_watchdog(ops, clock, min_repair_interval_sec=30, max_repairs_per_hour=2)
+
+    assert plan_of(watchdog.check_once()) == "dns"
+    clock.now += 29
+    assert watchdog.check_once() is None
+    clock.now += 1
+    assert plan_of(watchdog.check_once()) == "winsock"
+
+    # Two repairs in the last hour: wait until the first one ages out
+    clock.now += 1000
+    assert watchdog.check_once() is None
+    clock.now = 1000.0 + 3600
+    assert plan_of(watchdog.check_once()) == "tcpip"
+
+
+def test_exhausted_ladder_backs_off_with_doubling_pause():
+    ops = StubOperations()
+    clock = FakeClock()
+    watchdog = make_watchdog(ops, clock, min_repair_interval_sec=0)
+
+    def run_ladder():
+        assert [plan_of(watchdog.check_once()) for _ in range(3)] == ["dns", "winsock", "tcpip"]
+        # Every plan failed: pause, restarting from the cheapest afterwards
+        assert watchdog.check_once() is None
+
+    run_ladder()
+    clock.now += 59
+    assert watchdog.check_once() is None
+    clock.now += 1
+    run_ladder()
+
+    # The pause doubled to 120s, then is capped at backoff_max_sec
+    clock.now += 119
+    assert watchdog.check_once() is None
+    clock.now += 1
+    run_ladder()
+    assert watchdog._backoff == 200
+
+
+def test_recovery_resets_level_and_backoff():
+    ops = StubOperations()
+    clock = FakeClock()
+    watchdog = make_watchdog(ops, clock, min_repair_interval_sec=0)
+
+    for _ in range(4):
+        watchdog.check_once()
+    assert watchdog._backoff == 120
+
+    ops.online = True
+    assert watchdog.check_once() is None
+    assert watchdog._level == 0
+    assert watchdog._failed_checks == 0
+    assert watchdog._backoff == 60
+
+    # No pause left over: the next failure starts at the cheapest plan
+    ops.online = False
+    assert plan_of(watchdog.check_once()) == "dns"
+
+
+def test_dead_process_proxy_is_cleared_first():
+    ops = StubOperations(fixed_by="clear_proxy_env", dead_vars=["HTTP_PROXY"])
+    watchdog = make_watchdog(ops, FakeClock())
+
+    attempt = watchdog.check_once()
+
+    assert attempt.plan == "proxy"
+    assert attempt.steps == ["clear_proxy_env"]
+    assert attempt.recovered
+    assert ops.cleared == ["HTTP_PROXY"]
@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from networkfixer.core import registry as registry_module
+from networkfixer.core.operations import NetworkOperations
+from networkfixer.core.registry import HKCU, InMemoryRegistry, ProxyRegistry
+from networkfixer.core.watcher import ChangeSource, ProxyWatcher
+from networkfixer.models.config import get_config, reset_config
+
+
+class ManualChangeSource(ChangeSource):
+    """Never fires on its own; tests call refresh() explicitly."""
+
+    def wait(self, stop_event: threading.Event) -> None:
+        stop_event.wait()
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    backend = InMemoryRegistry()
+    backend.add_key(HKCU, ProxyRegistry.REGISTRY_PATH, {"ProxyEnable": 1, "ProxyServer": "127.0.0.1:7890"})
+    monkeypatch.setattr(registry_module, "_backend", backend)
+    yield backend
+    reset_config()
+
+
+def test_change_source_is_abstract():
+    with pytest.raises(TypeError):
+        ChangeSource()
+
+
+def test_refresh_reports_changes_to_subscribers(registry):
+    watcher = ProxyWatcher(registry=registry, source=ManualChangeSource())
+    changes = []
+    watcher.subscribe(changes.append)
+    watcher.start()
+    try:
+        assert watcher.state.system_enabled
+        assert not watcher.refresh()
+
+        ProxyRegistry(registry).disable()
+        assert watcher.refresh()
+    finally:
+        watcher.stop()
+
+    assert len(changes) == 1
+    assert changes[0].system_changed
+    assert not changes[0].new.system_enabled
+
+
+def test_disable_proxy_refreshes_running_watcher(registry):
+    get_config().proxy_watch_min_interval_sec = 60
+    get_config().proxy_watch_max_interval_sec = 60
+    ops = NetworkOperations()
+    ops.proxy_watcher.start()
+    try:
+        assert ops.get_proxy_status() == (True, "127.0.0.1:7890")
+
+        assert ops.disable_proxy().ok
+        assert ops.get_proxy_status() == (False, "")
+    finally:
+        ops.proxy_watcher.stop()
+
+
+def test_clearing_process_proxy_refreshes_running_watcher(registry, monkeypatch):
+    monkeypatch.setenv("HTTP_PROXY", "http://127.0.0.1:9")
+    get_config().proxy_watch_min_interval_sec = 60
+    get_config().proxy_watch_max_interval_sec = 60
+    ops = NetworkOperations()
+    ops.proxy_watcher.start()
+    try:
+        assert ("Process", "HTTP_PROXY", "http://127.0.0.1:9") in ops.proxy_watcher.state.env
+
+        assert ops.clear_process_proxy_env(["HTTP_PROXY"]).ok
+        assert all(name != "HTTP_PROXY" for _, name, _ in ops.proxy_watcher.state.env)
+    finally:
+        ops.proxy_watcher.stop()
+
+
+class StalledReadWatcher(ProxyWatcher):
+    """The next read after stall() blocks, once, until release is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stalled = threading.Event()
+        self.release = threading.Event()
+        self._stall_next = False
+
+    def stall(self):
+        self._stall_next = True
+
+    def _read_state(self):
+        state = super()._read_state()
+        if self._stall_next:
+            self._stall_next = False
+            self.stalled.set()
+            assert self.release.wait(5)
+        return state
+
+
+def test_concurrent_refreshes_never_go_backwards(registry):
+    watcher = StalledReadWatcher(registry=registry, source=ManualChangeSource())
+    watcher.refresh()
+    changes = []
+    watcher.subscribe(changes.append)
+
+    # The first refresh reads the old (enabled) state, then stalls
+    watcher.stall()
+    older = threading.Thread(target=watcher.refresh)
+    older.start()
+    assert watcher.stalled.wait(5)
+
+    # A newer refresh starts after the proxy was disabled
+    ProxyRegistry(registry).disable()
+    newer = threading.Thread(target=watcher.refresh)
+    newer.start()
+    newer.join(0.2)
+    watcher.release.set()
+    older.join(5)
+    newer.join(5)
+
+    assert not watcher.state.system_enabled
+    assert [change.new.system_enabled for change in changes] == [False]